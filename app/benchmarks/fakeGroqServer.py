@@ -0,0 +1,150 @@
+"""
+Local stand-in for the Groq chat completions endpoint.
+
+Serves `POST /openai/v1/chat/completions` (plain and streamed) with a fixed
+reply, enforces its own requests-per-minute limit with 429 + Retry-After, and
+can inject random 429s. Connections are kept alive (HTTP/1.1, streams sent
+chunked) like the real endpoint, so clients reuse pooled connections. Point
+the app at it with GROQ_API_BASE.
+
+Run from the `app/` directory:
+    python -m benchmarks.fakeGroqServer --port 8765 --rpm 60
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, rpm: float = 60, error_rate: float = 0.0, latency: float = 0.05,
+                 reply: str = "That is correct. Can you explain how you would test it?", keep_alive: bool = True):
+        super().__init__(address, _Handler)
+        self.protocol_version = "HTTP/1.1" if keep_alive else "HTTP/1.0"
+        self.rpm = rpm
+        self.error_rate = error_rate
+        self.latency = latency
+        self.reply = reply
+        self.served = 0
+        self.rejected = 0
+        self.connections = 0
+        self._recent: list[float] = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def admit(self):
+        """Return None to serve the request, or the Retry-After seconds to send with a 429."""
+        now = time.monotonic()
+        with self._lock:
+            self._recent = [t for t in self._recent if now - t < 60]
+            if len(self._recent) >= self.rpm:
+                self.rejected += 1
+                return max(0.1, 60 - (now - self._recent[0]))
+            if random.random() < self.error_rate:
+                self.rejected += 1
+                return 0.5
+            self._recent.append(now)
+            self.served += 1
+            return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeGroqServer
+
+    @property
+    def protocol_version(self) -> str:
+        return self.server.protocol_version
+
+    def setup(self):
+        super().setup()
+        with self.server._lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _chunk(self, data: bytes) -> None:
+        if self.protocol_version == "HTTP/1.1":
+            data = b"%x\r\n%s\r\n" % (len(data), data)
+        self.wfile.write(data)
+
+    def _json(self, status: int, body: dict, headers: dict | None = None) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.endswith("/chat/completions"):
+            return self._json(404, {"error": {"message": "not found"}})
+
+        retry_after = self.server.admit()
+        if retry_after is not None:
+            return self._json(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                              {"retry-after": f"{retry_after:.2f}"})
+
+        time.sleep(self.server.latency)
+        model = request.get("model", "fake")
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", []))
+        words = self.server.reply.split(" ")
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(words),
+                 "total_tokens": prompt_tokens + len(words)}
+        base = {"id": f"chatcmpl-{self.server.served}", "created": int(time.time()), "model": model}
+
+        if not request.get("stream"):
+            return self._json(200, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": self.server.reply},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        if self.protocol_version == "HTTP/1.1":
+            self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, word in enumerate(words):
+            delta = {"role": "assistant", "content": word + " "} if i == 0 else {"content": word + " "}
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        final = {**base, "object": "chat.completion.chunk",
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "x_groq": {"usage": usage}}
+        self._chunk(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+        self._chunk(b"")
+
+
+def start(port: int = 0, **options) -> FakeGroqServer:
+    """Start the fake endpoint on a background thread and return it."""
+    server = FakeGroqServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, name="fake-groq", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=float, default=60)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--http10", action="store_true", help="close every connection after one response")
+    args = parser.parse_args()
+    server = FakeGroqServer(("127.0.0.1", args.port), rpm=args.rpm, error_rate=args.error_rate, latency=args.latency,
+                            keep_alive=not args.http10)
+    print(f"Fake Groq endpoint on {server.url} (set GROQ_API_BASE to this)")
+    server.serve_forever()
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+from utils.tokenCounter import count_message_tokens
+
+# Deterministic padding for `reply_words`, so replies fill the history like real feedback does
+_FILLER = "the candidate explained the trade-offs clearly and could go deeper on failure modes".split()
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic offline chat model that records every prompt it receives:
+    - `latency` seconds pass before the first token (provider queueing and prompt processing)
+    - each streamed word then takes `token_delay` seconds, or 1 / `tokens_per_second` when that is set
+    - `reply_words` pads every reply to at least that many words
+    - usage (prompt tokens counted locally, one completion token per word) is reported like a provider does
+    Set `record_calls=False` for long load runs, so stored prompts do not skew memory figures.
+    """
+
+    reply: str = "Good answer. Next question {n}: how would you approach this in production?"
+    latency: float = 0.0
+    token_delay: float = 0.0
+    tokens_per_second: float = 0.0
+    reply_words: int = 0
+    record_calls: bool = True
+    calls: list[list[BaseMessage]] = Field(default_factory=list)
+    call_count: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-interview"
+
+    @property
+    def _word_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second else self.token_delay
+
+    def _next_reply(self, messages: list[BaseMessage]) -> list[str]:
+        self.call_count += 1
+        if self.record_calls:
+            self.calls.append(list(messages))
+        words = self.reply.format(n=self.call_count).split(" ")
+        padding = max(0, self.reply_words - len(words))
+        return words + [_FILLER[i % len(_FILLER)] for i in range(padding)]
+
+    @staticmethod
+    def _usage(messages: list[BaseMessage], words: list[str]) -> dict:
+        prompt_tokens = count_message_tokens(messages)
+        return {"input_tokens": prompt_tokens, "output_tokens": len(words), "total_tokens": prompt_tokens + len(words)}
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        words = self._next_reply(messages)
+        time.sleep(self.latency + self._word_delay * len(words))
+        message = AIMessage(" ".join(words), usage_metadata=self._usage(messages, words))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        words = self._next_reply(messages)
+        await asyncio.sleep(self.latency + self._word_delay * len(words))
+        message = AIMessage(" ".join(words), usage_metadata=self._usage(messages, words))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunk(self, messages: list[BaseMessage], words: list[str], i: int) -> ChatGenerationChunk:
+        # Usage rides on the last chunk, as streaming providers send it
+        usage = self._usage(messages, words) if i == len(words) - 1 else None
+        return ChatGenerationChunk(message=AIMessageChunk(content=words[i] + " ", usage_metadata=usage))
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        words = self._next_reply(messages)
+        time.sleep(self.latency)
+        for i in range(len(words)):
+            time.sleep(self._word_delay)
+            chunk = self._chunk(messages, words, i)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        words = self._next_reply(messages)
+        await asyncio.sleep(self.latency)
+        for i in range(len(words)):
+            await asyncio.sleep(self._word_delay)
+            chunk = self._chunk(messages, words, i)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
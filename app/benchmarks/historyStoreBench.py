@@ -0,0 +1,96 @@
+"""
+Load benchmark for the persistent SQLite history backend.
+
+Many concurrent sessions each append interview turns and read their history
+back, once through the group-committing `SQLiteHistoryWriter` and once with a
+commit (and fsync) per turn for comparison.
+
+Run from the `app/` directory:
+    python -m benchmarks.historyStoreBench --sessions 200 --turns 20
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+from memory.sqliteHistory import SQLiteChatMessageHistory, SQLiteHistoryWriter, _SCHEMA
+
+
+def _turn(session: int, turn: int):
+    return [
+        HumanMessage(f"[{session}] answer {turn}: " + "generators yield lazily " * 8),
+        AIMessage(f"[{session}] question {turn}: how would you test this? " * 3),
+    ]
+
+
+def _run_threads(sessions: int, worker) -> float:
+    threads = [threading.Thread(target=worker, args=(s,)) for s in range(sessions)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def bench_group_commit(path: str, sessions: int, turns: int) -> float:
+    writer = SQLiteHistoryWriter(path)
+
+    def worker(session: int) -> None:
+        history = SQLiteChatMessageHistory(f"s{session}", writer)
+        for turn in range(turns):
+            history.messages
+            history.add_messages(_turn(session, turn))
+
+    start = time.perf_counter()
+    _run_threads(sessions, worker)
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    print(f"  commits: {writer.commits}, rows: {writer.rows_written}")
+    writer.close()
+    return elapsed
+
+
+def bench_commit_per_turn(path: str, sessions: int, turns: int) -> float:
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_SCHEMA)
+    lock = threading.Lock()
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA synchronous=FULL")
+
+    def worker(session: int) -> None:
+        for turn in range(turns):
+            rows = [(f"s{session}", json.dumps(message_to_dict(m))) for m in _turn(session, turn)]
+            with lock, conn:
+                conn.execute("SELECT message FROM messages WHERE session_id = ?", (f"s{session}",)).fetchall()
+                conn.executemany("INSERT INTO messages (session_id, message) VALUES (?, ?)", rows)
+
+    elapsed = _run_threads(sessions, worker)
+    conn.close()
+    return elapsed
+
+
+def run(sessions: int, turns: int) -> None:
+    messages = sessions * turns * 2
+    with tempfile.TemporaryDirectory() as tmp:
+        print("group commit (WAL, background writer):")
+        elapsed = bench_group_commit(os.path.join(tmp, "grouped.db"), sessions, turns)
+        print(f"  {elapsed:.2f}s, {messages / elapsed:,.0f} messages/s")
+
+        print("commit per turn (rollback journal, synchronous=FULL):")
+        elapsed = bench_commit_per_turn(os.path.join(tmp, "per_turn.db"), sessions, turns)
+        print(f"  {elapsed:.2f}s, {messages / elapsed:,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sessions, args.turns)
@@ -0,0 +1,99 @@
+"""
+Per-turn logging overhead on the request thread, before and after utils.structuredLogging.
+
+- before: what ui.py did, a console handler and a synchronous FileHandler added
+  on every Streamlit rerun, so each turn adds two handlers and every line is
+  written once per rerun so far
+- after: `setup_logging` (installed once, JSON formatted and written by a
+  background thread, sampling and truncation on)
+
+Each turn logs what ui.py logs for a normal interview turn, including the
+candidate's answer and a full LLM reply.
+
+Run from the `app/` directory:
+    python -m benchmarks.loggingBench --turns 30 --reply-chars 2000
+"""
+import argparse
+import contextlib
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from utils.structuredLogging import setup_logging, stop_logging
+
+
+def _log_turn(logger: logging.Logger, turn: int, answer: str, reply: str) -> None:
+    logger.info("Custom CSS injected.", extra={"event": "render"})
+    logger.info("Rendered chat history with %d messages.", 2 * turn, extra={"event": "render"})
+    logger.info("User input received: %s", answer, extra={"event": "user_input", "session_id": "candidate_bench"})
+    logger.info("Phase: %s | Topic: %s | Lane: %s", "interview", "Python", "followup",
+                extra={"event": "llm_request", "session_id": "candidate_bench"})
+    logger.info("LLM response: %s", reply, extra={"event": "llm_reply", "session_id": "candidate_bench"})
+
+
+def run_before(path: str, turns: int, answer: str, reply: str) -> list[float]:
+    logger = logging.getLogger("bench.before")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    log_format = "%(asctime)s [%(levelname)s] %(message)s"
+    timings = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        # ui.py ran this block on every rerun
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(log_format))
+        file_handler = logging.FileHandler(path, mode='a')
+        file_handler.setFormatter(logging.Formatter(log_format))
+        logger.addHandler(console_handler)
+        logger.addHandler(file_handler)
+        _log_turn(logger, turn, answer, reply)
+        timings.append(time.perf_counter() - start)
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+    return timings
+
+
+def run_after(path: str, turns: int, answer: str, reply: str) -> tuple[list[float], float]:
+    timings = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        logger = setup_logging("bench.after", path=path)
+        _log_turn(logger, turn, answer, reply)
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    stop_logging("bench.after")
+    return timings, time.perf_counter() - start
+
+
+def _lines(path: str) -> int:
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in f)
+
+
+def run(turns: int, reply_chars: int) -> None:
+    answer = "A generator yields values lazily, so memory stays flat even for large inputs. " * 3
+    reply = ("Good answer. " * (reply_chars // 13 + 1))[:reply_chars]
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        before_path, after_path = os.path.join(tmp, "before.log"), os.path.join(tmp, "after.log")
+        before = run_before(before_path, turns, answer, reply)
+        after, drain = run_after(after_path, turns, answer, reply)
+        sizes = (os.path.getsize(before_path), os.path.getsize(after_path))
+        lines = (_lines(before_path), _lines(after_path))
+
+    print(f"{turns} turns, {reply_chars}-char replies")
+    print(f"{'':>7}  {'per turn':>10}  {'last turn':>10}  {'lines':>6}  {'bytes':>9}")
+    print(f"{'before':>7}  {sum(before) / turns * 1e6:>8.0f}µs  {before[-1] * 1e6:>8.0f}µs  {lines[0]:>6}  {sizes[0]:>9,}")
+    print(f"{'after':>7}  {sum(after) / turns * 1e6:>8.0f}µs  {after[-1] * 1e6:>8.0f}µs  {lines[1]:>6}  {sizes[1]:>9,}")
+    print(f"(background writer drained the rest in {drain * 1000:.1f}ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--reply-chars", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.turns, args.reply_chars)
@@ -0,0 +1,212 @@
+"""
+Load generator for the whole interview pipeline, offline, with the fake chat model.
+
+Simulated candidates run in threads through the path ui.py takes for every
+message: `InterviewSession` -> ChatChain (executor, trimmer, session history,
+response cache, topic compaction) -> fake LLM. Each one gives its profile,
+answers the topic questions through the topic switches, and either reaches
+the final summary or (every `--exit-every`th candidate) types "exit" midway.
+
+Reported:
+- throughput: turns/s, LLM calls/s and generated tokens/s
+- latency percentiles per turn (message in -> turn done, compaction included) and time to first token
+- tokens sent per LLM call, overall and by the candidate's turn number, which shows whether trimming
+  and compaction keep the prompt flat
+- growth of the in-process history store (`_store`) and peak RSS at checkpoints; sessions are not
+  released, as in the Streamlit app, so this shows the store's bounds at work
+
+`--max-p99-ms` and `--max-prompt-tokens` make it a regression gate: the exit code is 1 when the p99
+turn latency or the p95 prompt size exceeds the budget.
+
+Run from the `app/` directory:
+    python -m benchmarks.pipelineBench --candidates 200 --concurrency 16 --latency 0.2 --tokens-per-second 200
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+os.environ.setdefault("LOG_CONSOLE", "0")
+
+import config.settings as settings
+from benchmarks.fakeLLM import FakeChatModel
+from memory.transcript import Transcript
+
+PROFILE_INPUTS = [
+    "Jane Doe, jane@example.com, 9876543210, 4 years",
+    "Backend Engineer",
+    "Pune",
+]
+# Bank topics (opening questions without the LLM) mixed with one that is generated and prefetched
+TECH_STACKS = ["Python, SQL, Go", "Python, Elixir", "React, Node.js, Docker", "Java, Kubernetes"]
+ANSWER = (
+    "I would start with the simplest thing that works, measure it under realistic load, "
+    "and only then optimise the part that actually dominates, keeping the change easy to roll back."
+)
+
+
+def _candidate_inputs(index: int, exit_every: int) -> list[str]:
+    rng = random.Random(index)
+    answers = [f"{ANSWER} ({i})" for i in range(12)]
+    if exit_every and index % exit_every == exit_every - 1:
+        answers = answers[:rng.randint(1, 5)] + ["exit"]
+    return PROFILE_INPUTS + [TECH_STACKS[index % len(TECH_STACKS)]] + answers
+
+
+class Pipeline:
+    """One candidate message at a time through the same `TurnDriver` as ui.py, without Streamlit or an export."""
+
+    def __init__(self):
+        # Imported here so the fake model is already in config.settings
+        from chains.ChatChain import tracer
+        from chains.InterviewSession import InterviewSession
+        from chains.QuestionPrefetcher import prefetcher
+        from chains.TurnDriver import TurnDriver
+
+        self.tracer = tracer
+        self.driver = TurnDriver(InterviewSession(prefetched=prefetcher.get), exporter=None)
+        self.interview = self.driver.interview
+
+    def prompt_tokens(self, session_id: str) -> int:
+        return self.tracer.session(session_id).get("prompt_tokens", 0)
+
+    def answer(self, state, user_input: str, transcript):
+        """Returns the new state, or None when the LLM request was refused."""
+        new_state, served = self.driver.answer(state, user_input, transcript)
+        return new_state if served else None
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(candidates: int, concurrency: int, latency: float, tokens_per_second: float, reply_words: int,
+        think: float, exit_every: int, checkpoints: int, trace_memory: bool,
+        max_p99_ms: float | None, max_prompt_tokens: float | None) -> int:
+    fake = FakeChatModel(latency=latency, tokens_per_second=tokens_per_second, reply_words=reply_words, record_calls=False)
+    settings.llm = fake
+    pipeline = Pipeline()
+    from memory.sessionMemory import _store
+    from utils.metrics import Histogram, counters, histogram
+
+    turn_latency = Histogram(window=candidates * 20)
+    prompt_tokens = Histogram(window=candidates * 20, buckets=histogram("prompt_tokens").buckets)
+    by_turn: dict[int, list[int]] = defaultdict(list)
+    counts = {"turns": 0, "retries": 0, "finished": 0, "exited": 0}
+    rss_start = _peak_rss_mb()
+    checkpoint_every = max(1, candidates // max(1, checkpoints))
+    growth = []
+    lock = threading.Lock()
+    next_index = iter(range(candidates))
+
+    def candidate(index: int) -> None:
+        session_id = f"bench_candidate_{index}"
+        state, _ = pipeline.interview.start(session_id, seed=index)
+        transcript = Transcript()
+        last_input = None
+        for user_input in _candidate_inputs(index, exit_every):
+            if state.phase == "finished":
+                break
+            time.sleep(think)
+            while True:
+                before = pipeline.prompt_tokens(session_id)
+                start = time.perf_counter()
+                new_state = pipeline.answer(state, user_input, transcript)
+                if new_state is not None:
+                    break
+                # Refused while the executor is full; the candidate sends the answer again
+                with lock:
+                    counts["retries"] += 1
+                time.sleep(0.05)
+            turn_latency.observe(time.perf_counter() - start)
+            sent = pipeline.prompt_tokens(session_id) - before
+            with lock:
+                counts["turns"] += 1
+                if sent:
+                    prompt_tokens.observe(sent)
+                    by_turn[new_state.turn].append(sent)
+            state, last_input = new_state, user_input
+        with lock:
+            counts["exited" if last_input == "exit" else "finished"] += 1
+            done = counts["exited"] + counts["finished"]
+            if done % checkpoint_every == 0 or done == candidates:
+                stats = _store.stats()
+                traced = tracemalloc.get_traced_memory()[0] / 2 ** 20 if trace_memory else None
+                growth.append((done, stats["sessions"], stats["tokens"], stats["evictions"], _peak_rss_mb(), traced))
+
+    def worker() -> None:
+        while True:
+            with lock:
+                index = next(next_index, None)
+            if index is None:
+                return
+            candidate(index)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if trace_memory:
+        tracemalloc.stop()
+
+    totals = counters()
+    ttft = histogram("time_to_first_token_seconds")
+    llm_calls = fake.call_count
+    print(f"{candidates} candidates ({counts['finished']} finished, {counts['exited']} exited early), "
+          f"{concurrency} at a time, fake LLM {latency * 1000:.0f}ms to first token, "
+          f"{tokens_per_second:.0f} tokens/s, {reply_words}-word replies")
+    print(f"throughput: {counts['turns'] / elapsed:,.1f} turns/s, {llm_calls / elapsed:,.1f} LLM calls/s, "
+          f"{totals.get('completion_tokens_total', 0) / elapsed:,.0f} generated tokens/s "
+          f"({counts['turns']} turns, {llm_calls} LLM calls in {elapsed:.1f}s, {counts['retries']} refused and resent)")
+    print(f"turn latency: p50 {turn_latency.percentile(50) * 1000:.1f}ms, p95 {turn_latency.percentile(95) * 1000:.1f}ms, "
+          f"p99 {turn_latency.percentile(99) * 1000:.1f}ms")
+    print(f"time to first token: p50 {ttft.percentile(50) * 1000:.1f}ms, p99 {ttft.percentile(99) * 1000:.1f}ms "
+          f"(cache hits count as 0)")
+    print(f"prompt tokens per LLM turn: mean {prompt_tokens.total / max(1, prompt_tokens.count):.0f}, "
+          f"p95 {prompt_tokens.percentile(95):.0f}, max {max((max(v) for v in by_turn.values()), default=0)}")
+    print("  by turn:  " + "  ".join(f"{turn}:{sum(v) / len(v):.0f}" for turn, v in sorted(by_turn.items())))
+    print(f"history store (peak RSS {rss_start:.0f}MB at start):")
+    print(f"  {'done':>6}  {'sessions':>8}  {'tokens':>9}  {'evicted':>7}  {'peak RSS':>9}" + ("  {:>8}".format("traced") if trace_memory else ""))
+    for done, sessions, tokens, evictions, rss, traced in growth:
+        line = f"  {done:>6}  {sessions:>8}  {tokens:>9,}  {evictions:>7}  {rss:>7.0f}MB"
+        print(line + (f"  {traced:>6.1f}MB" if traced is not None else ""))
+
+    failed = []
+    if max_p99_ms is not None and turn_latency.percentile(99) * 1000 > max_p99_ms:
+        failed.append(f"p99 turn latency over {max_p99_ms:.0f}ms")
+    if max_prompt_tokens is not None and prompt_tokens.percentile(95) > max_prompt_tokens:
+        failed.append(f"p95 prompt tokens over {max_prompt_tokens:.0f}")
+    if failed:
+        print("regression: " + ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake LLM seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="fake LLM streaming speed")
+    parser.add_argument("--reply-words", type=int, default=60, help="minimum words per fake reply")
+    parser.add_argument("--think", type=float, default=0.0, help="seconds between a candidate's answers")
+    parser.add_argument("--exit-every", type=int, default=4, help="every Nth candidate types exit midway (0: never)")
+    parser.add_argument("--checkpoints", type=int, default=4)
+    parser.add_argument("--trace-memory", action="store_true", help="also report tracemalloc'd bytes (slower)")
+    parser.add_argument("--max-p99-ms", type=float)
+    parser.add_argument("--max-prompt-tokens", type=float)
+    args = parser.parse_args()
+    sys.exit(run(args.candidates, args.concurrency, args.latency, args.tokens_per_second, args.reply_words,
+                 args.think, args.exit_every, args.checkpoints, args.trace_memory,
+                 args.max_p99_ms, args.max_prompt_tokens))
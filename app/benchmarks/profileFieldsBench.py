@@ -0,0 +1,41 @@
+"""
+Micro-benchmark for profile field handling.
+
+Compares the old per-call regex email check with the compiled one and times a
+full multi-detail onboarding message through the engine. The randomized
+property checks for the validators live in tests/test_profileFields.py.
+
+Run from the `app/` directory:
+    python -m benchmarks.profileFieldsBench --cases 2000
+"""
+import argparse
+import re
+import timeit
+
+from utils.detailsValidation import validate_email
+from utils.profileFields import profile_engine
+
+def _legacy_validate_email(email: str) -> bool:
+    email_pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
+    return bool(re.match(email_pattern, email))
+
+
+def run(number: int) -> None:
+    email = "jane.doe@example.com"
+    legacy = timeit.timeit(lambda: _legacy_validate_email(email), number=number)
+    compiled = timeit.timeit(lambda: validate_email(email), number=number)
+    print(f"validate_email, per-call pattern: {legacy / number * 1e6:.2f} µs")
+    print(f"validate_email, compiled:         {compiled / number * 1e6:.2f} µs")
+
+    empty = {name: None for name in profile_engine.field_names}
+    message = "Jane Doe, jane.doe@example.com, +91 98765-43210, 4 years, Backend Engineer, Pune, Python, React, SQL"
+    elapsed = timeit.timeit(lambda: profile_engine.consume(empty, message), number=number)
+    print(f"full profile in one message:      {elapsed / number * 1e6:.2f} µs "
+          f"({len(profile_engine.field_names)} fields, 1 round trip instead of {len(profile_engine.field_names)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.number)
@@ -0,0 +1,111 @@
+"""
+Prompt payload regression check for the chat chain.
+
+Drives a simulated interview through the chain with a fake LLM the way the
+front-ends do: the opening question is posted without a human turn before it,
+and every `--switch-every` answers a topic switch posts the next topic's
+question after the feedback reply. Asserts the exact messages sent on every
+turn (system prompt, stored history ending on the question being answered,
+this turn's answer, turn instruction) and compares prompt tokens with the
+previous input contract, which re-sent the whole UI transcript on top of the
+stored history.
+
+Run from the `app/` directory:
+    python -m benchmarks.promptPayloadBench --turns 12
+"""
+import argparse
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from operator import itemgetter
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables.history import RunnableWithMessageHistory
+from benchmarks.fakeLLM import FakeChatModel
+from chains.ChatChain import build_chat, turn_input
+from memory.sessionMemory import SessionStore
+from prompts.interviewPrompt import make_prompt_template
+from utils.tokenCounter import count_message_tokens
+from utils.trimmer import trimmer
+
+CONFIG = {"configurable": {"session_id": "bench"}}
+OPENING_QUESTION = "What is the difference between a list and a tuple in Python?"
+
+
+def _legacy_chat(model, store: SessionStore):
+    """The previous contract: full transcript under "messages", instruction under an unused "prompt" key."""
+    system_msg = make_prompt_template().messages[0]
+    legacy_prompt = ChatPromptTemplate.from_messages([system_msg, MessagesPlaceholder(variable_name="messages")])
+    chain = RunnablePassthrough.assign(messages=itemgetter("messages") | trimmer) | legacy_prompt | model
+    return RunnableWithMessageHistory(chain, store.get, input_messages_key="messages")
+
+
+def simulate(turns: int, switch_every: int = 4) -> dict:
+    """Run the interview, asserting every prompt; returns token totals and stored history sizes."""
+    model, legacy_model = FakeChatModel(), FakeChatModel()
+    store, legacy_store = SessionStore(), SessionStore()
+    chat = build_chat(model, store.get)
+    legacy_chat = _legacy_chat(legacy_model, legacy_store)
+
+    # Posted from the question bank, like `record_turn` with no input: an assistant message only
+    store.get("bench").add_messages([AIMessage(OPENING_QUESTION)])
+    transcript = [{"role": "assistant", "content": OPENING_QUESTION}]
+    expected_history = [AIMessage(OPENING_QUESTION)]
+    new_tokens = legacy_tokens = 0
+
+    for turn in range(turns):
+        answer = f"Answer {turn}: list comprehensions build lists eagerly, generators are lazy."
+        instruction = f"Instruction {turn}: evaluate the answer and ask a follow-up question."
+        transcript.append({"role": "user", "content": answer})
+
+        reply = chat.invoke(turn_input(instruction, answer), config=CONFIG)
+        legacy_chat.invoke({"prompt": instruction, "messages": transcript}, config=CONFIG)
+        transcript.append({"role": "assistant", "content": reply.content})
+
+        sent = model.calls[-1]
+        assert isinstance(sent[0], SystemMessage)
+        assert [(type(m), m.content) for m in sent[1:]] == [
+            *((type(m), m.content) for m in expected_history),
+            (HumanMessage, answer),
+            (SystemMessage, instruction),
+        ], f"unexpected prompt on turn {turn}"
+        # The question being answered always comes right before the answer
+        assert isinstance(sent[-3], AIMessage), f"question missing on turn {turn}"
+        expected_history += [HumanMessage(answer), AIMessage(reply.content)]
+
+        if switch_every and turn % switch_every == switch_every - 1:
+            # Topic switch: the reply was the feedback, the next topic's question is posted after it
+            question = f"Topic {turn // switch_every + 2}: how does the garbage collector find cycles?"
+            store.get("bench").add_messages([AIMessage(question)])
+            transcript.append({"role": "assistant", "content": question})
+            expected_history.append(AIMessage(question))
+
+        new_tokens += count_message_tokens(sent)
+        legacy_tokens += count_message_tokens(legacy_model.calls[-1])
+
+    return {
+        "new_tokens": new_tokens,
+        "legacy_tokens": legacy_tokens,
+        "stored": len(store.get("bench").messages),
+        "legacy_stored": len(legacy_store.get("bench").messages),
+    }
+
+
+def run(turns: int, switch_every: int) -> None:
+    result = simulate(turns, switch_every)
+    new_tokens, legacy_tokens = result["new_tokens"], result["legacy_tokens"]
+    print(f"turns:                 {turns}")
+    print(f"legacy prompt tokens:  {legacy_tokens} ({legacy_tokens / turns:.0f}/turn)")
+    print(f"current prompt tokens: {new_tokens} ({new_tokens / turns:.0f}/turn)")
+    print(f"reduction:             {100 * (1 - new_tokens / legacy_tokens):.1f}%")
+    print(f"stored history:        {result['stored']} messages (legacy: {result['legacy_stored']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--switch-every", type=int, default=4)
+    args = parser.parse_args()
+    run(args.turns, args.switch_every)
@@ -0,0 +1,72 @@
+"""
+Drives the rate-limited `llm` from config.settings against the local fake
+Groq endpoint and reports per-lane latency, retries and provider 429s.
+
+A burst of follow-up questions is queued first and a few final-summary calls
+arrive behind them; with priority lanes the summaries should finish first.
+Calls go through a `ChatExecutor` with `--max-in-flight` slots, as in the app,
+so lane order is checked at executor admission as well as in the rate-limit
+scheduler (`--max-in-flight 0` calls the model directly).
+
+Run from the `app/` directory:
+    python -m benchmarks.rateLimitBench --requests 70 --rpm 60
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks import fakeGroqServer
+
+
+def run(requests: int, summaries: int, rpm: float, server_rpm: float, error_rate: float, max_in_flight: int) -> None:
+    server = fakeGroqServer.start(rpm=server_rpm, error_rate=error_rate)
+    os.environ["GROQ_API_BASE"] = server.url
+    os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+    os.environ["GROQ_REQUESTS_PER_MINUTE"] = str(rpm)
+
+    from chains.ChatExecutor import ChatExecutor, ExecutorPool
+    from config.settings import llm
+    from utils.metrics import snapshot
+
+    model = llm
+    if max_in_flight:
+        model = ChatExecutor(llm, pool=ExecutorPool(max_in_flight=max_in_flight, max_queue=requests + summaries))
+
+    finished: dict[str, list[float]] = {"followup": [], "summary": []}
+    start = time.perf_counter()
+
+    def call(lane: str, i: int) -> None:
+        model.invoke(f"Question {i}: explain Python generators.", config={"metadata": {"priority": lane}})
+        finished[lane].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=call, args=("followup", i)) for i in range(requests)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    late = [threading.Thread(target=call, args=("summary", i)) for i in range(summaries)]
+    for t in late:
+        t.start()
+    for t in threads + late:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"{requests + summaries} calls in {elapsed:.2f}s ({(requests + summaries) / elapsed:.1f}/s)")
+    print(f"provider: {server.served} served, {server.rejected} rejected with 429")
+    for lane, times in finished.items():
+        print(f"{lane:9s} mean completion {sum(times) / len(times):.2f}s, last {max(times):.2f}s")
+    retries = snapshot().get("llm_retries", {}).get("count", 0)
+    print(f"client retries: {retries}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=70)
+    parser.add_argument("--summaries", type=int, default=4)
+    parser.add_argument("--rpm", type=float, default=60, help="client-side requests/min budget")
+    parser.add_argument("--server-rpm", type=float, default=600, help="fake provider requests/min limit")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="fraction of random 429s")
+    parser.add_argument("--max-in-flight", type=int, default=8, help="executor slots (0: call the model directly)")
+    args = parser.parse_args()
+    run(args.requests, args.summaries, args.rpm, args.server_rpm, args.error_rate, args.max_in_flight)
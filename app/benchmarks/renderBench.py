@@ -0,0 +1,78 @@
+"""
+Rerun-time benchmark for transcript rendering in Streamlit.
+
+Times a full script rerun (via streamlit's AppTest) for growing transcripts,
+once with one `st.markdown` call per message (the previous ui.py loop) and
+once with `utils.transcriptRenderer` (cached HTML, windowed, one element).
+
+Run from the `app/` directory:
+    python -m benchmarks.renderBench --sizes 10 100 500 1000
+"""
+import argparse
+import os
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def per_message_app():
+    import streamlit as st
+    for msg in st.session_state.messages:
+        if msg["role"] == "assistant":
+            st.markdown(f'<div class="bot-wrapper"><div class="bot-message">{msg["content"]}</div></div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="user-wrapper"><div class="user-message">{msg["content"]}</div></div>', unsafe_allow_html=True)
+
+
+def windowed_app():
+    import sys
+    import streamlit as st
+    sys.path.insert(0, st.session_state.app_dir)
+    from memory.transcript import Role, Transcript
+    from utils.transcriptRenderer import render_transcript
+    if "rendered_messages" not in st.session_state:
+        st.session_state.rendered_messages = {}
+        st.session_state.transcript = Transcript()
+        for msg in st.session_state.messages:
+            st.session_state.transcript.append(Role(msg["role"]), msg["content"])
+    transcript_html, hidden = render_transcript(st.session_state.transcript, st.session_state.rendered_messages, 30)
+    if hidden:
+        st.button(f"Show earlier messages ({hidden})")
+    st.markdown(transcript_html, unsafe_allow_html=True)
+
+
+def _messages(count: int) -> list[dict]:
+    return [
+        {"role": "assistant" if i % 2 == 0 else "user",
+         "content": f"Message {i}: <b>explain</b> how closures capture variables " * 4}
+        for i in range(count)
+    ]
+
+
+def time_reruns(app, count: int, reruns: int) -> float:
+    at = AppTest.from_function(app, default_timeout=60)
+    at.session_state["messages"] = _messages(count)
+    at.session_state["app_dir"] = APP_DIR
+    at.run()  # first run fills any caches
+    start = time.perf_counter()
+    for _ in range(reruns):
+        at.run()
+    return (time.perf_counter() - start) / reruns
+
+
+def run(sizes: list[int], reruns: int) -> None:
+    print(f"{'messages':>8}  {'per-message':>12}  {'windowed':>10}")
+    for count in sizes:
+        naive = time_reruns(per_message_app, count, reruns)
+        windowed = time_reruns(windowed_app, count, reruns)
+        print(f"{count:>8}  {naive * 1000:>10.1f}ms  {windowed * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 1000])
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.reruns)
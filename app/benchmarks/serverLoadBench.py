@@ -0,0 +1,158 @@
+"""
+Load test of the WebSocket front-end against the Streamlit path, with a fake LLM.
+
+- WebSocket: `server.py` runs in a uvicorn subprocess (one worker = one core) and
+  `--sessions` simulated candidates run a full interview concurrently, waiting
+  `--think` seconds between answers
+- Streamlit: the same interview is replayed through `ui.py` with streamlit's AppTest,
+  one session at a time (AppTest cannot drive concurrent sessions)
+
+Reported per path: p50/p99 turn latency (answer sent -> bot ready for the next
+answer), server CPU per turn, and the concurrent sessions one core can sustain
+at the given think time (think time / CPU per turn).
+
+Run from the `app/` directory:
+    python -m benchmarks.serverLoadBench --sessions 50 --think 1.0 --token-delay 0.005
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import signal
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import websockets
+
+from benchmarks.sessionBench import CANDIDATE_INPUTS
+from utils.metrics import Histogram
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Starts server.py with the fake model in place of the Groq client
+_SERVER_SCRIPT = """
+import sys
+import config.settings as settings
+from benchmarks.fakeLLM import FakeChatModel
+settings.llm = FakeChatModel(token_delay=float(sys.argv[2]))
+import uvicorn
+import server
+uvicorn.run(server.app, port=int(sys.argv[1]), log_level="warning", ws_max_queue=1024)
+"""
+
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def _candidate(port: int, think: float, latencies: Histogram, counts: dict) -> None:
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws", max_size=None) as ws:
+        async def until_ready() -> None:
+            while True:
+                message = json.loads(await ws.recv())
+                if message["type"] == "ready":
+                    return
+                if message["type"] == "busy":
+                    counts["busy"] += 1
+
+        await until_ready()
+        for text in CANDIDATE_INPUTS:
+            await asyncio.sleep(think)
+            start = time.perf_counter()
+            await ws.send(text)
+            await until_ready()
+            latencies.observe(time.perf_counter() - start)
+            counts["turns"] += 1
+
+
+async def _wait_for_server(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{port}/ws"):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+def run_websocket(sessions: int, think: float, token_delay: float, port: int) -> dict:
+    env = {**os.environ, "LLM_MAX_IN_FLIGHT": str(sessions), "LLM_MAX_QUEUE": str(sessions)}
+    cpu_before = _children_cpu()
+    proc = subprocess.Popen([sys.executable, "-c", _SERVER_SCRIPT, str(port), str(token_delay)], cwd=APP_DIR, env=env)
+    latencies = Histogram(window=sessions * len(CANDIDATE_INPUTS))
+    counts = {"turns": 0, "busy": 0}
+    try:
+        asyncio.run(_wait_for_server(port))
+        # Everything until now (imports, startup) is excluded from the CPU figure
+        with open(f"/proc/{proc.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        startup_cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+        async def load() -> None:
+            await asyncio.gather(*(_candidate(port, think, latencies, counts) for _ in range(sessions)))
+
+        start = time.perf_counter()
+        asyncio.run(load())
+        elapsed = time.perf_counter() - start
+    finally:
+        proc.send_signal(signal.SIGINT)
+        proc.wait()
+    cpu = _children_cpu() - cpu_before - startup_cpu
+    return {"turns": counts["turns"], "busy": counts["busy"], "elapsed": elapsed, "cpu": cpu, "latencies": latencies}
+
+
+def run_streamlit(sessions: int, token_delay: float) -> dict:
+    import config.settings as settings
+    from benchmarks.fakeLLM import FakeChatModel
+    settings.llm = FakeChatModel(token_delay=token_delay)
+    from streamlit.testing.v1 import AppTest
+
+    latencies = Histogram(window=sessions * len(CANDIDATE_INPUTS))
+    turns, cpu = 0, 0.0
+    start = time.perf_counter()
+    for _ in range(sessions):
+        at = AppTest.from_file(os.path.join(APP_DIR, "ui.py"), default_timeout=60).run()
+        for text in CANDIDATE_INPUTS:
+            cpu_start, turn_start = time.process_time(), time.perf_counter()
+            at.chat_input[0].set_value(text).run()
+            latencies.observe(time.perf_counter() - turn_start)
+            cpu += time.process_time() - cpu_start
+            turns += 1
+    return {"turns": turns, "busy": 0, "elapsed": time.perf_counter() - start, "cpu": cpu, "latencies": latencies}
+
+
+def _report(name: str, result: dict, think: float) -> None:
+    latencies = result["latencies"]
+    cpu_per_turn = result["cpu"] / max(1, result["turns"])
+    print(
+        f"{name:>10}  {result['turns']:>6}  {latencies.percentile(50) * 1000:>8.1f}ms  {latencies.percentile(99) * 1000:>8.1f}ms"
+        f"  {cpu_per_turn * 1000:>9.2f}ms  {think / cpu_per_turn if cpu_per_turn else 0:>12,.0f}  {result['busy']:>5}"
+    )
+
+
+def run(sessions: int, streamlit_sessions: int, think: float, token_delay: float, port: int) -> None:
+    websocket = run_websocket(sessions, think, token_delay, port)
+    streamlit = run_streamlit(streamlit_sessions, token_delay)
+    print(f"{'path':>10}  {'turns':>6}  {'p50':>10}  {'p99':>10}  {'cpu/turn':>11}  {'sessions/core':>12}  {'busy':>5}")
+    _report("websocket", websocket, think)
+    _report("streamlit", streamlit, think)
+    print(f"({sessions} concurrent WebSocket sessions, {streamlit_sessions} sequential Streamlit sessions, "
+          f"{think}s think time, {token_delay * 1000:.0f}ms per token)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--streamlit-sessions", type=int, default=5)
+    parser.add_argument("--think", type=float, default=1.0, help="seconds between a candidate's answers")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="fake LLM seconds per streamed word")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    run(args.sessions, args.streamlit_sessions, args.think, args.token_delay, args.port)
@@ -0,0 +1,68 @@
+"""
+Throughput and footprint of the headless interview engine.
+
+Drives many simulated candidates through `chains.InterviewSession` with no
+UI and no LLM (replies are canned), checks that replaying a session with the
+same seed gives the same interview, and reports transitions per second and
+the serialized size of one session state.
+
+Run from the `app/` directory:
+    python -m benchmarks.sessionBench --sessions 2000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from chains.InterviewSession import FINISHED, interview
+
+CANDIDATE_INPUTS = [
+    "Jane Doe, jane@example.com, 9876543210, 4 years",
+    "Backend Engineer",
+    "Pune",
+    "Python, SQL, Go",
+] + [f"answer {i}" for i in range(12)]
+
+
+def run_candidate(session_id: str, seed: int) -> tuple[list, int]:
+    state, _ = interview.start(session_id, seed=seed)
+    instructions = []
+    for text in CANDIDATE_INPUTS:
+        state, turn = interview.advance(state, text)
+        reply = None
+        if turn.request is not None:
+            instructions.append(turn.request.instruction)
+            reply = f"Canned reply {state.turn}?"
+        state = interview.on_reply(state, turn, reply)
+        if state.phase == FINISHED:
+            break
+    return instructions, state
+
+
+def run(sessions: int) -> None:
+    first, state = run_candidate("candidate_0", seed=0)
+    again, _ = run_candidate("candidate_0", seed=0)
+    assert first == again, "same seed and inputs must give the same interview"
+    assert state.phase == FINISHED, state.to_dict()
+
+    transitions = 0
+    start = time.perf_counter()
+    for i in range(sessions):
+        _, state = run_candidate(f"candidate_{i}", seed=i)
+        transitions += state.turn
+    elapsed = time.perf_counter() - start
+
+    encoded = json.dumps(state.to_dict())
+    print(f"{sessions} interviews, {transitions} transitions in {elapsed:.2f}s "
+          f"({transitions / elapsed:,.0f} transitions/s)")
+    print(f"state: {sys.getsizeof(state)} bytes in memory (slots), {len(encoded)} bytes as JSON")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sessions)
@@ -0,0 +1,91 @@
+"""
+Cold-start cost of the app's entry modules, measured like `python -X importtime`.
+
+Each run imports the target in a fresh interpreter with `-X importtime` and
+parses its report; the median over `--runs` is printed with the target's
+slowest direct imports. A second measurement times the first use of
+the lazily built resources (model client, HTTP pool, tokenizer) that the
+import no longer pays for.
+
+`--max-ms` turns it into a CI check: the exit code is 1 when a target's
+median import time exceeds the budget.
+
+Run from the `app/` directory:
+    python -m benchmarks.startupBench --runs 5 --targets server chains.ChatChain --max-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+_FIRST_USE = """
+import time
+from utils.resources import registry
+from config.settings import MODEL_RESOURCES
+for name in ("tokenizer", "groq_http_client", *MODEL_RESOURCES.values()):
+    start = time.perf_counter()
+    registry.get(name)
+    print(name, time.perf_counter() - start)
+"""
+
+
+def import_times(target: str) -> dict[str, tuple[int, int, int]]:
+    """Import `target` in a fresh interpreter; returns {module: (self µs, cumulative µs, nesting depth)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, env={**os.environ, "LOG_CONSOLE": "0"}, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        # The report indents each module by two spaces per level below the import that pulled it in
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        times[module.strip()] = (int(self_us), int(cumulative_us), depth)
+    return times
+
+
+def first_use_times() -> dict[str, float]:
+    result = subprocess.run([sys.executable, "-c", _FIRST_USE], capture_output=True, text=True, check=True)
+    return {name: float(seconds) for name, seconds in (line.split() for line in result.stdout.splitlines())}
+
+
+def run(targets: list[str], runs: int, top: int, max_ms: float | None) -> int:
+    failed = []
+    for target in targets:
+        samples = [import_times(target) for _ in range(runs)]
+        totals = [sample[target][1] / 1000 for sample in samples]
+        median = statistics.median(totals)
+        print(f"{target}: median {median:.0f}ms, min {min(totals):.0f}ms, max {max(totals):.0f}ms over {runs} runs")
+        # Direct imports of the target, slowest first
+        direct = sorted(
+            ((module, cumulative) for module, (_, cumulative, depth) in samples[-1].items() if depth == 1),
+            key=lambda item: -item[1]
+        )[:top]
+        for module, cumulative in direct:
+            print(f"  {cumulative / 1000:>8.1f}ms  {module}")
+        if max_ms is not None and median > max_ms:
+            failed.append(target)
+
+    print("first use (not paid at import):")
+    for name, seconds in first_use_times().items():
+        print(f"  {seconds * 1000:>8.1f}ms  {name}")
+
+    if failed:
+        print(f"over the {max_ms:.0f}ms budget: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--targets", nargs="+", default=["server", "chains.ChatChain"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--max-ms", type=float)
+    args = parser.parse_args()
+    sys.exit(run(args.targets, args.runs, args.top, args.max_ms))
@@ -0,0 +1,141 @@
+"""
+Memory and export benchmark for interview transcripts.
+
+Builds many interview transcripts together with their LLM session histories
+and the HTML ui.py keeps for redrawing them, once the previous way (a dict per
+displayed message, history messages holding their own copy of each text, the
+HTML of every message cached) and once with `memory.transcript` (slotted
+records, texts shared with the history, HTML cached for the visible window
+only), and compares the traced memory.
+Then exports the compact transcripts through `memory.transcriptExport` as
+plain, gzip and zstd JSON lines and reports size and throughput.
+
+Run from the `app/` directory:
+    python -m benchmarks.transcriptBench --sessions 500 --turns 30 --window 30
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage
+from memory.transcript import Role, Transcript, interview_record
+from memory.transcriptExport import TranscriptExporter, read_export, zstandard
+from utils.transcriptRenderer import message_html, render_transcript
+
+
+def _texts(session: int, turn: int) -> tuple[str, list[str]]:
+    answer = f"[{session}] answer {turn}: generators yield values lazily and keep their frame alive " * 3
+    # Replies arrive as streamed chunks; the full text is joined once for display and once for the history
+    chunks = [f"question {turn} part {i}: how would you test a generator pipeline? " for i in range(6)]
+    return answer, chunks
+
+
+def build_dicts(sessions: int, turns: int, window: int) -> list:
+    built = []
+    for s in range(sessions):
+        messages, history, rendered = [], [], []
+        for t in range(turns):
+            answer, chunks = _texts(s, t)
+            messages.append({"role": "user", "content": answer})
+            messages.append({"role": "assistant", "content": "".join(chunks)})
+            history.append(HumanMessage(content="".join(answer)))
+            history.append(AIMessage(content="".join(chunks)))
+            # The page is redrawn after every turn from HTML cached for every message
+            rendered.extend(message_html(m["role"], m["content"]) for m in messages[len(rendered):])
+        built.append((messages, history, rendered))
+    return built
+
+
+def build_compact(sessions: int, turns: int, window: int) -> list:
+    built = []
+    for s in range(sessions):
+        transcript, history, rendered = Transcript(), [], {}
+        for t in range(turns):
+            answer, chunks = _texts(s, t)
+            # The reply is joined once; transcript and history hold the same strings
+            reply = "".join(chunks)
+            history.append(HumanMessage(content=answer))
+            history.append(AIMessage(content=reply))
+            transcript.append(Role.USER, answer)
+            transcript.append(Role.ASSISTANT, reply)
+            render_transcript(transcript, rendered, window)
+        built.append((transcript, history, rendered))
+    return built
+
+
+def traced(build, sessions: int, turns: int, window: int) -> tuple[object, int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build(sessions, turns, window)
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return built, size, seconds
+
+
+class _State:
+    def __init__(self, session: int):
+        self.session_id = f"candidate_{session}"
+        self.profile = {"Full Name": f"Candidate {session}", "Tech Stack": ["Python", "Go"]}
+        self.tech_stack = ["Python", "Go"]
+
+
+def write_plain(records: list[dict], path: str) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return os.path.getsize(path), time.perf_counter() - start, 0.0
+
+
+def export(records: list[dict], path: str) -> tuple[int, float, float]:
+    exporter = TranscriptExporter(path)
+    start = time.perf_counter()
+    for record in records:
+        exporter.export(record)
+    exporter.close()
+    write_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    count = sum(1 for _ in read_export(path))
+    read_seconds = time.perf_counter() - start
+    assert count == len(records), (count, len(records))
+    return os.path.getsize(path), write_seconds, read_seconds
+
+
+def run(sessions: int, turns: int, window: int) -> None:
+    print(f"{sessions} sessions x {turns} turns, {window} messages shown")
+    _, dict_bytes, dict_seconds = traced(build_dicts, sessions, turns, window)
+    compact, compact_bytes, compact_seconds = traced(build_compact, sessions, turns, window)
+    print(f"{'storage':>8}  {'memory':>10}  {'per session':>11}  {'build':>8}")
+    for name, size, seconds in (("dicts", dict_bytes, dict_seconds), ("compact", compact_bytes, compact_seconds)):
+        print(f"{name:>8}  {size / 2**20:>8.1f}MB  {size / sessions / 1024:>9.1f}KB  {seconds * 1000:>6.0f}ms")
+    print(f"compact transcripts use {1 - compact_bytes / dict_bytes:.0%} less memory")
+
+    records = [interview_record(_State(s), transcript, {}) for s, (transcript, _, _) in enumerate(compact)]
+    formats = [("gzip", ".jsonl.gz")] + ([("zstd", ".jsonl.zst")] if zstandard else [])
+    print(f"\n{'export':>8}  {'size':>10}  {'ratio':>6}  {'write':>12}  {'read':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        plain_bytes = None
+        for name, suffix in [("plain", ".jsonl"), *formats]:
+            path = os.path.join(tmp, f"interviews{suffix}")
+            size, write_seconds, read_seconds = (write_plain if name == "plain" else export)(records, path)
+            plain_bytes = plain_bytes or size
+            print(f"{name:>8}  {size / 2**20:>8.2f}MB  {plain_bytes / size:>5.1f}x"
+                  f"  {len(records) / write_seconds:>7.0f} rec/s  "
+                  f"{(f'{len(records) / read_seconds:>7.0f} rec/s' if read_seconds else '-'):>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--window", type=int, default=30, help="messages drawn per rerun (ui.py TRANSCRIPT_WINDOW)")
+    args = parser.parse_args()
+    run(args.sessions, args.turns, args.window)
@@ -0,0 +1,71 @@
+"""
+Offline benchmark for history trimming.
+
+Compares re-tokenizing the whole history on every turn (the previous
+`trim_messages(token_counter=...)` behaviour) with the cached per-message
+counts used by `utils.trimmer`.
+
+Run from the `app/` directory:
+    python -m benchmarks.trimmerBench --turns 200
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, trim_messages
+from config.settings import MAX_HISTORY_TOKENS
+from memory.sessionMemory import TokenCountingHistory
+from utils.tokenCounter import count_text_tokens, MESSAGE_OVERHEAD_TOKENS
+from utils.trimmer import trim_history
+
+
+def _recount(messages) -> int:
+    return sum(count_text_tokens(m.content) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def _turn_messages(turn: int):
+    answer = f"Answer {turn}: " + "closures capture variables from the enclosing scope " * 6
+    question = f"Question {turn}: can you explain how the event loop schedules callbacks? " * 3
+    return [HumanMessage(answer), AIMessage(question)]
+
+
+def run(turns: int) -> None:
+    baseline = trim_messages(
+        max_tokens=MAX_HISTORY_TOKENS,
+        strategy="last",
+        token_counter=_recount,
+        include_system=True,
+        allow_partial=False,
+        start_on="human",
+    )
+
+    history = TokenCountingHistory()
+    history.add_message(SystemMessage("Interview history"))
+    baseline_time = cached_time = 0.0
+
+    for turn in range(turns):
+        history.add_messages(_turn_messages(turn))
+        messages = history.messages
+
+        start = time.perf_counter()
+        expected = baseline.invoke(messages)
+        baseline_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        kept = trim_history(messages)
+        cached_time += time.perf_counter() - start
+
+        assert len(kept) == len(expected), (turn, len(kept), len(expected))
+
+    print(f"turns:            {turns}")
+    print(f"history tokens:   {history.total_tokens}")
+    print(f"recount trimmer:  {baseline_time * 1000:.1f} ms total, {baseline_time / turns * 1000:.3f} ms/turn")
+    print(f"cached trimmer:   {cached_time * 1000:.1f} ms total, {cached_time / turns * 1000:.3f} ms/turn")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200)
+    run(parser.parse_args().turns)
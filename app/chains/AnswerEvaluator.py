@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, wait
+
+from langchain_core.output_parsers import JsonOutputParser
+from chains.ChatChain import tracer
+from chains.ChatExecutor import ChatExecutor, ExecutorBusy
+from config.settings import EVALUATION_MAX_IN_FLIGHT, LLM_TIMEOUT_SECONDS, MAX_SESSIONS, llm
+from prompts.interviewPrompt import make_answer_evaluation_template
+from utils.metrics import increment, observe
+
+SCORES = ("relevance", "correctness", "completeness")
+
+answer_evaluation_chain = (make_answer_evaluation_template() | llm | JsonOutputParser()).with_config(callbacks=[tracer])
+
+
+def _record(topic: str, question: str | None, parsed) -> dict | None:
+    """Validate the model's JSON into a score record; scores are clamped to 1..5."""
+    if not isinstance(parsed, dict):
+        return None
+    try:
+        scores = {name: min(5, max(1, int(parsed[name]))) for name in SCORES}
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {"topic": topic, "question": question, **scores, "note": str(parsed.get("note", ""))}
+
+
+class AnswerEvaluator:
+    """
+    Structured scores for every interview answer, produced beside the follow-up question:
+    - `submit` starts one scoring call per answer and returns at once; the front-end calls it
+      before streaming the follow-up, so the two requests run concurrently
+    - Calls run in their own executor and the "scoring" rate-limit lane, behind the follow-up
+    - `records` returns a session's scores grouped by topic, waiting (up to `timeout`) only when asked to
+    - `report` formats them for the final summary, which then does not have to re-judge the history
+    - `discard` drops a finished session's scores (chains.TurnDriver calls it once the interview is exported)
+    Scores are kept for the `max_sessions` most recent sessions.
+    """
+
+    def __init__(self, chain=answer_evaluation_chain, max_in_flight: int = EVALUATION_MAX_IN_FLIGHT,
+                 max_sessions: int = MAX_SESSIONS, timeout: float = LLM_TIMEOUT_SECONDS):
+        self.executor = ChatExecutor(chain, max_in_flight=max_in_flight, timeout=timeout)
+        self.max_sessions = max_sessions
+        self.timeout = timeout
+        # session id -> [[topic, question, future or finished record]], in answer order
+        self._sessions: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, session_id: str, topic: str, question: str | None, answer: str) -> None:
+        inputs = {"topic": topic, "question": question or "(not recorded)", "answer": answer}
+        config = {"metadata": {"priority": "scoring", "session_id": session_id}}
+        try:
+            future = self.executor.submit(inputs, config)
+        except ExecutorBusy:
+            increment("evaluation_skipped_total")
+            return
+        with self._lock:
+            entries = self._sessions.pop(session_id, [])
+            if entries and entries[-1][:2] == [topic, question]:
+                # The same question answered again after a refused turn: the new answer replaces the earlier
+                # scoring, pending or already settled (a scored summary waits for it before being refused)
+                previous = entries.pop()[2]
+                if isinstance(previous, Future):
+                    previous.cancel()
+            entries.append([topic, question, future])
+            self._sessions[session_id] = entries
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def records(self, session_id: str, wait_pending: bool = False) -> dict[str, list[dict]]:
+        with self._lock:
+            entries = list(self._sessions.get(session_id, []))
+        if wait_pending:
+            wait([entry[2] for entry in entries if isinstance(entry[2], Future)], timeout=self.timeout)
+        by_topic: dict[str, list[dict]] = {}
+        for entry in entries:
+            result = entry[2]
+            if isinstance(result, Future):
+                if not result.done():
+                    continue
+                result = self._settle(entry, result)
+            if result is not None:
+                by_topic.setdefault(entry[0], []).append(result)
+        return by_topic
+
+    def _settle(self, entry: list, future: Future) -> dict | None:
+        """Replace a finished future by its record (None if scoring failed), so it is parsed and counted once."""
+        record = None if future.cancelled() or future.exception() else _record(entry[0], entry[1], future.result())
+        with self._lock:
+            if entry[2] is not future:
+                return entry[2]
+            entry[2] = record
+        if record is None:
+            increment("evaluation_errors_total")
+        else:
+            for name in SCORES:
+                observe(f"answer_{name}", record[name])
+        return record
+
+    def report(self, session_id: str) -> str:
+        """The session's scores as text for `make_scored_instruction`, after waiting for pending ones."""
+        lines = []
+        for topic, records in self.records(session_id, wait_pending=True).items():
+            lines.append(f"{topic}:")
+            for record in records:
+                scores = ", ".join(f"{name} {record[name]}" for name in SCORES)
+                lines.append(f"- {record['question']} -> {scores}. {record['note']}")
+        return "\n".join(lines)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            for entry in self._sessions.pop(session_id, []):
+                if isinstance(entry[2], Future):
+                    entry[2].cancel()
+
+
+evaluator = AnswerEvaluator()
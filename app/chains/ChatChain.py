@@ -1,23 +1,220 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from operator import itemgetter
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.runnables.history import RunnableWithMessageHistory
-from config.settings import llm
-from prompts.interviewPrompt import make_prompt_template
-from memory.sessionMemory import get_session_history
+from chains.ChatExecutor import ChatExecutor, ExecutorBusy
+from chains.ResponseCache import make_response_cache
+from config.settings import LLM_MAX_IN_FLIGHT, METRICS_DUMP_INTERVAL, METRICS_DUMP_PATH, METRICS_PORT, llm
+from prompts.interviewPrompt import make_prompt_template, make_topic_summary_template
+from memory.sessionMemory import compact_history, get_session_history
+from utils.metrics import increment, observe, start_metrics_dump, start_metrics_server
+from utils.rateLimiter import retryable
+from utils.tracing import TurnTracer
 from utils.trimmer import trimmer
 
 prompt = make_prompt_template()
 
-trimmed_chain = (
-    RunnablePassthrough.assign(
-        messages=itemgetter("messages") | trimmer
+
+def build_trimmed_chain(model):
+    """Trim the stored history, format the prompt and call `model`."""
+    return (
+        RunnablePassthrough.assign(
+            history=itemgetter("history") | trimmer
+        )
+        | prompt
+        | model
+    )
+
+
+def build_chat(model, history_factory=get_session_history):
+    """
+    Wrap the trimmed chain with session history.
+    Input contract: {"input": [new messages this turn], "instruction": str}
+    - The session history is the only source of earlier turns
+    - `input` and the reply are appended to the history after the call
+    """
+    return RunnableWithMessageHistory(
+        build_trimmed_chain(model),
+        history_factory,
+        input_messages_key="input",
+        history_messages_key="history"
     )
-    | prompt
-    | llm
-)
-
-chat = RunnableWithMessageHistory(
-    trimmed_chain,
-    get_session_history,
-    input_messages_key="messages"
-)
+
+
+def turn_input(instruction: str, user_input: str | None = None) -> dict:
+    """Build the chain input for one turn from the instruction and the candidate's new message."""
+    return {
+        "input": [HumanMessage(user_input)] if user_input else [],
+        "instruction": instruction
+    }
+
+
+# Per-stage timings, token counts and per-session totals for every call below
+tracer = TurnTracer()
+
+trimmed_chain = build_trimmed_chain(llm).with_config(callbacks=[tracer])
+
+chat = build_chat(llm).with_config(callbacks=[tracer])
+
+# Shared, bounded execution of `chat` calls for every session in the process
+executor = ChatExecutor(chat)
+
+response_cache = make_response_cache()
+
+topic_summary_chain = (make_topic_summary_template() | llm | StrOutputParser()).with_config(callbacks=[tracer])
+
+# Topic summaries draw from the same process-wide budget as chat calls, ahead of them by lane
+summary_executor = ChatExecutor(topic_summary_chain)
+
+# Compactions started by front-ends that must not wait for them (see `start_compaction`)
+_compactions = ThreadPoolExecutor(max_workers=LLM_MAX_IN_FLIGHT, thread_name_prefix="topic-compaction")
+
+
+def summarize_topic(messages: list, topic: str, session_id: str | None = None) -> str:
+    """Summarize one finished interview topic with a single LLM call in the "summary" lane."""
+    return summary_executor.invoke(
+        {"messages": messages, "topic": topic},
+        config={"metadata": {"priority": "summary", "session_id": session_id}}
+    )
+
+
+def compact_topic(session_id: str, topic: str) -> bool:
+    """
+    Fold a finished topic's turns in the session history into a running summary.
+    A refused, timed-out or rate-limited summary call leaves the history as it is; the trimmer still bounds it.
+    """
+    summarize = lambda messages, name: summarize_topic(messages, name, session_id)
+    try:
+        return compact_history(get_session_history(session_id), topic, summarize)
+    except Exception as exc:
+        if not (isinstance(exc, (ExecutorBusy, TimeoutError)) or retryable(exc)):
+            raise
+        increment("compaction_skipped_total")
+        return False
+
+
+def start_compaction(session_id: str, topic: str) -> Future:
+    """`compact_topic` on a background thread; wait for the future before the session's next LLM call."""
+    return _compactions.submit(compact_topic, session_id, topic)
+
+
+def _traced(config: dict) -> dict:
+    """Copy the session id into the run metadata, where `tracer` reads it."""
+    session_id = config.get("configurable", {}).get("session_id")
+    return {**config, "metadata": {**config.get("metadata", {}), "session_id": session_id}}
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def start_metrics_exporters(serve: bool = True) -> None:
+    """
+    Start the exporters configured in settings, once per process:
+    - `serve`: the Prometheus endpoint on METRICS_PORT (front-ends with their own /metrics route pass False)
+    - the periodic JSON dump to METRICS_DUMP_PATH, including per-session totals
+    """
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+    if serve and METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    if METRICS_DUMP_PATH:
+        path = METRICS_DUMP_PATH.replace("{pid}", str(os.getpid()))
+        start_metrics_dump(path, METRICS_DUMP_INTERVAL, extra=lambda: {"sessions": tracer.sessions()})
+
+
+def _stored_reply(config: dict, text: str) -> str:
+    # The history keeps its own copy of a streamed reply; hand that one to the transcript instead of a second
+    messages = get_session_history(config["configurable"]["session_id"]).messages
+    if messages and messages[-1].content == text:
+        return messages[-1].content
+    return text
+
+
+def stream_reply(inputs: dict, config: dict, on_token=None) -> str:
+    """
+    Stream a reply from `chat` through the shared executor and return the full text:
+    - `on_token` is called with the text received so far after every chunk
+    - History is committed once by `chat` when the stream completes; the returned text is the history's string
+    - Raises `ExecutorBusy` when the queue is full and `TimeoutError` on timeout
+    """
+    start = time.perf_counter()
+    text = ""
+    for chunk in executor.stream(inputs, config=_traced(config)):
+        if not text and chunk.content:
+            observe("time_to_first_token_seconds", time.perf_counter() - start)
+        text += chunk.content
+        if on_token is not None:
+            on_token(text)
+    observe("turn_latency_seconds", time.perf_counter() - start)
+    return _stored_reply(config, text)
+
+
+def record_turn(session_id: str, reply: str, input_messages: list | None = None) -> None:
+    """Append a turn that did not go through `chat` (cached or pre-generated reply) to the session history."""
+    get_session_history(session_id).add_messages(list(input_messages or []) + [AIMessage(reply)])
+
+
+def cached_stream_reply(inputs: dict, config: dict, topic: str, template: str, on_token=None) -> str:
+    """
+    `stream_reply` for answer-independent prompts, served from `response_cache` when possible.
+    On a hit the turn is written to the session history directly, since `chat` is skipped.
+    """
+    text = response_cache.get(topic, template)
+    tracer.record_cache(config["configurable"]["session_id"], text is not None)
+    if text is None:
+        text = stream_reply(inputs, config, on_token)
+        response_cache.put(topic, template, text)
+        return text
+
+    observe("time_to_first_token_seconds", 0.0)
+    record_turn(config["configurable"]["session_id"], text, inputs["input"])
+    if on_token is not None:
+        on_token(text)
+    return text
+
+
+async def astream_reply(inputs: dict, config: dict, on_token=None) -> str:
+    """Async version of `stream_reply` through the same executor limits; `on_token` may be a coroutine function."""
+    start = time.perf_counter()
+    text = ""
+    async for chunk in executor.astream(inputs, config=_traced(config)):
+        if not text and chunk.content:
+            observe("time_to_first_token_seconds", time.perf_counter() - start)
+        text += chunk.content
+        if on_token is not None:
+            result = on_token(text)
+            if hasattr(result, "__await__"):
+                await result
+    observe("turn_latency_seconds", time.perf_counter() - start)
+    return _stored_reply(config, text)
+
+
+async def acached_stream_reply(inputs: dict, config: dict, topic: str, template: str, on_token=None) -> str:
+    """
+    Async version of `cached_stream_reply`. The cache (embeddings) and the history write
+    (SQLite backend) block, so they run on threads instead of the event loop.
+    """
+    text = await asyncio.to_thread(response_cache.get, topic, template)
+    tracer.record_cache(config["configurable"]["session_id"], text is not None)
+    if text is None:
+        text = await astream_reply(inputs, config, on_token)
+        await asyncio.to_thread(response_cache.put, topic, template, text)
+        return text
+
+    observe("time_to_first_token_seconds", 0.0)
+    await asyncio.to_thread(record_turn, config["configurable"]["session_id"], text, inputs["input"])
+    if on_token is not None:
+        result = on_token(text)
+        if hasattr(result, "__await__"):
+            await result
+    return text
@@ -0,0 +1,210 @@
+import asyncio
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from config.settings import LLM_MAX_IN_FLIGHT, LLM_MAX_QUEUE, LLM_TIMEOUT_SECONDS
+from utils.metrics import observe
+from utils.rateLimiter import DEFAULT_LANE, PRIORITY_LANES
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when the request queue is full and a new LLM call is refused."""
+
+
+_DONE = object()
+
+
+class ExecutorPool:
+    """
+    The event loop and the LLM call budget shared by every `ChatExecutor` in the process:
+    - At most `max_in_flight` calls run against the provider at once, whichever executor queued them
+    - Up to `max_queue` more wait their turn; beyond that `ExecutorBusy` is raised
+    - A freed slot goes to the most urgent waiting call by rate-limit lane (`metadata["priority"]`,
+      see utils.rateLimiter.PRIORITY_LANES), then arrival order; calls whose executor is at its own
+      `max_in_flight` are passed over until it frees one
+    - One loop for every call also keeps pooled async HTTP connections on the loop that opened them
+    """
+
+    def __init__(self, max_in_flight: int = LLM_MAX_IN_FLIGHT, max_queue: int = LLM_MAX_QUEUE):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.queued = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        # Only touched on the pool loop
+        self._waiters: list[tuple[int, int, asyncio.Future, "ChatExecutor"]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="chat-executor", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def admit(self, executor: "ChatExecutor") -> float:
+        with self._lock:
+            if self.queued + self.in_flight >= self.max_in_flight + self.max_queue:
+                raise ExecutorBusy(f"LLM request queue is full ({self.max_queue} waiting)")
+            self.queued += 1
+            executor.queued += 1
+            observe("llm_queue_depth", self.queued)
+        return time.perf_counter()
+
+    @staticmethod
+    def _priority(config) -> int:
+        lane = ((config or {}).get("metadata") or {}).get("priority", DEFAULT_LANE)
+        return PRIORITY_LANES.get(lane, PRIORITY_LANES[DEFAULT_LANE])
+
+    def _dispatch(self) -> None:
+        """Start the most urgent waiters that fit in the budget and under their executor's limit."""
+        passed_over = []
+        while self._waiters and self.in_flight < self.max_in_flight:
+            entry = heapq.heappop(self._waiters)
+            waiter, executor = entry[2], entry[3]
+            if waiter.done():
+                continue
+            if executor.in_flight >= executor.max_in_flight:
+                passed_over.append(entry)
+                continue
+            with self._lock:
+                self.queued -= 1
+                self.in_flight += 1
+                executor.queued -= 1
+                executor.in_flight += 1
+            waiter.set_result(None)
+        for entry in passed_over:
+            heapq.heappush(self._waiters, entry)
+
+    async def acquire(self, executor: "ChatExecutor", config, enqueued_at: float) -> None:
+        """Wait on the pool loop for a slot; the call is counted as queued until it gets one."""
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (self._priority(config), next(self._sequence), waiter, executor))
+        self._dispatch()
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Cancelled after the slot was handed over: pass it on
+                self.release(executor)
+            else:
+                waiter.cancel()
+                with self._lock:
+                    self.queued -= 1
+                    executor.queued -= 1
+            raise
+        observe("llm_queue_wait_seconds", time.perf_counter() - enqueued_at)
+
+    def release(self, executor: "ChatExecutor") -> None:
+        with self._lock:
+            self.in_flight -= 1
+            executor.in_flight -= 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": self.in_flight, "queued": self.queued}
+
+
+# Every executor in the process draws from this budget unless given its own pool
+pool = ExecutorPool()
+
+
+class ChatExecutor:
+    """
+    Runs calls of one runnable on the shared `ExecutorPool` loop instead of the caller's thread:
+    - `max_in_flight` optionally caps this executor below the pool's budget (e.g. background prefetch)
+    - Each call fails with `TimeoutError` `timeout` seconds after it was queued, waiting time included
+    - Queue depth and wait time are recorded as metrics
+    """
+
+    def __init__(self, runnable, max_in_flight: int | None = None, timeout: float = LLM_TIMEOUT_SECONDS,
+                 pool: ExecutorPool = pool):
+        self.runnable = runnable
+        self.pool = pool
+        self.max_in_flight = max_in_flight or pool.max_in_flight
+        self.timeout = timeout
+        # Updated by the pool under its lock
+        self.in_flight = 0
+        self.queued = 0
+
+    def _deadline(self, enqueued_at: float):
+        """`asyncio.timeout_at` for a call queued at `enqueued_at` (a `time.perf_counter()` reading)."""
+        remaining = self.timeout - (time.perf_counter() - enqueued_at)
+        return asyncio.timeout_at(asyncio.get_running_loop().time() + remaining)
+
+    async def _ainvoke(self, inputs, config, enqueued_at: float):
+        async with self._deadline(enqueued_at):
+            await self.pool.acquire(self, config, enqueued_at)
+            try:
+                return await self.runnable.ainvoke(inputs, config=config)
+            finally:
+                self.pool.release(self)
+
+    def submit(self, inputs, config=None) -> Future:
+        """Queue a call and return a future for its result."""
+        enqueued_at = self.pool.admit(self)
+        return asyncio.run_coroutine_threadsafe(self._ainvoke(inputs, config, enqueued_at), self.pool.loop)
+
+    def invoke(self, inputs, config=None):
+        """Queue a call and block until its result is ready."""
+        return self.submit(inputs, config).result()
+
+    async def _produce(self, inputs, config, enqueued_at: float, put) -> None:
+        """Stream the call on the pool loop, handing each chunk (then an error or `_DONE`) to `put`."""
+        try:
+            async with self._deadline(enqueued_at):
+                await self.pool.acquire(self, config, enqueued_at)
+                try:
+                    async for chunk in self.runnable.astream(inputs, config=config):
+                        put(chunk)
+                finally:
+                    self.pool.release(self)
+        except BaseException as exc:
+            put(exc)
+            raise
+        finally:
+            put(_DONE)
+
+    def stream(self, inputs, config=None):
+        """Queue a streaming call and yield its chunks on the caller's thread."""
+        chunks: queue.Queue = queue.Queue()
+        enqueued_at = self.pool.admit(self)
+        future = asyncio.run_coroutine_threadsafe(self._produce(inputs, config, enqueued_at, chunks.put), self.pool.loop)
+        try:
+            while (item := chunks.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # The consumer stopped early: stop generating on the loop too
+            future.cancel()
+
+    async def astream(self, inputs, config=None):
+        """`stream` for callers running their own event loop (e.g. the ASGI server); same limits apply."""
+        caller = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        enqueued_at = self.pool.admit(self)
+
+        def put(item) -> None:
+            caller.call_soon_threadsafe(chunks.put_nowait, item)
+
+        future = asyncio.run_coroutine_threadsafe(self._produce(inputs, config, enqueued_at, put), self.pool.loop)
+        try:
+            while (item := await chunks.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def stats(self) -> dict:
+        with self.pool._lock:
+            return {"in_flight": self.in_flight, "queued": self.queued}
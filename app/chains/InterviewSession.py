@@ -0,0 +1,231 @@
+import random
+
+from prompts.interviewPrompt import (
+    EXIT_PROMPT, FINAL_SUMMARY_PROMPT, OPENING_QUESTION_PROMPT, TOPIC_FEEDBACK_PROMPT, TOPIC_SWITCH_PROMPT,
+    make_follow_up_prompt
+)
+from prompts.questionBank import question_bank
+from utils.profileFields import profile_engine
+
+COLLECTING, INTERVIEW, FINISHED = "collecting", "interview", "finished"
+
+EXIT_WORDS = ("exit", "quit")
+GREETING = "Great! Preparing your interview based on your selected tech stack..."
+CLOSED_MESSAGE = "The interview has concluded. Thank you for your time!"
+
+
+class InterviewState:
+    """Everything needed to resume an interview; plain values only, so it serializes with `to_dict`."""
+
+    __slots__ = (
+        "session_id", "seed", "turn", "phase", "profile",
+        "topic_index", "question_count", "threshold", "asked_questions", "last_question"
+    )
+
+    def __init__(self, session_id: str, seed: int, turn: int = 0, phase: str = COLLECTING,
+                 profile: dict | None = None, topic_index: int = 0, question_count: int = 0,
+                 threshold: int = 0, asked_questions: list | None = None, last_question: str | None = None):
+        self.session_id = session_id
+        self.seed = seed
+        self.turn = turn
+        self.phase = phase
+        self.profile = profile if profile is not None else {name: None for name in profile_engine.field_names}
+        self.topic_index = topic_index
+        self.question_count = question_count
+        self.threshold = threshold
+        self.asked_questions = asked_questions if asked_questions is not None else []
+        self.last_question = last_question
+
+    def copy(self) -> "InterviewState":
+        state = InterviewState(**self.to_dict())
+        state.profile = dict(self.profile)
+        state.asked_questions = list(self.asked_questions)
+        return state
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "InterviewState":
+        return cls(**data)
+
+    @property
+    def tech_stack(self) -> list:
+        return self.profile.get("Tech Stack") or []
+
+    @property
+    def topic(self) -> str:
+        stack = self.tech_stack
+        return stack[self.topic_index] if isinstance(stack, list) and self.topic_index < len(stack) else "general topics"
+
+
+class LLMRequest:
+    """
+    One LLM call for the front-end to make:
+    - `instruction` and `user_input` feed `chains.ChatChain.turn_input`
+    - `lane` is the rate-limit priority lane (see utils.rateLimiter.PRIORITY_LANES)
+    - `cache_key` = (topic, template) marks an answer-independent prompt whose reply may be cached
+    - `scored` marks a summary whose instruction gets the recorded answer scores appended
+      (`prompts.interviewPrompt.make_scored_instruction`)
+    """
+
+    __slots__ = ("instruction", "user_input", "lane", "cache_key", "scored")
+
+    def __init__(self, instruction: str, user_input: str | None = None, lane: str = "followup",
+                 cache_key: tuple[str, str] | None = None, scored: bool = False):
+        self.instruction = instruction
+        self.user_input = user_input
+        self.lane = lane
+        self.cache_key = cache_key
+        self.scored = scored
+
+
+class Turn:
+    """
+    What the front-end does for one candidate message, in this order:
+    - show `errors` and `messages` (display only, not part of the LLM history)
+    - start scoring the answer in the background when `evaluate` = (topic, question, answer) is set
+    - make `request`, if any, and show the reply
+    - post `posts` (pre-generated bot messages that are recorded in the session history)
+    - compact the history of `compact_topic` when it is set and summary memory is on
+    - start generating the questions of the `prefetch` topics in the background
+    Afterwards `InterviewSession.on_reply` folds the reply into the new state.
+    """
+
+    __slots__ = ("errors", "messages", "evaluate", "request", "posts", "compact_topic", "prefetch", "asks", "suggested")
+
+    def __init__(self, errors=(), messages=(), evaluate: tuple[str, str | None, str] | None = None,
+                 request: LLMRequest | None = None, posts=(), compact_topic: str | None = None, prefetch=(),
+                 asks: bool = False, suggested: str | None = None):
+        self.errors = list(errors)
+        self.evaluate = evaluate
+        self.messages = list(messages)
+        self.request = request
+        self.posts = list(posts)
+        self.compact_topic = compact_topic
+        self.prefetch = list(prefetch)
+        # The turn asks a new question (opening or topic switch) that must not be repeated
+        self.asks = asks
+        # Bank question the reply may use; remembered as asked when it does
+        self.suggested = suggested
+
+
+class InterviewSession:
+    """
+    Interview control flow with no UI or LLM dependency:
+    - `start` creates the state and the first message
+    - `advance(state, user input)` returns (new state, Turn) without modifying `state`
+    - `on_reply(state, turn, reply)` records the LLM reply once it was received
+    Front-ends keep the old state when a request fails, so the candidate can simply resend.
+    `prefetched(session_id, topic)` returns an already generated question for later topics
+    missing from the bank, or None (see chains.QuestionPrefetcher).
+    """
+
+    def __init__(self, bank=question_bank, engine=profile_engine, prefetched=None):
+        self.bank = bank
+        self.engine = engine
+        self.prefetched = prefetched
+
+    def start(self, session_id: str, seed: int | None = None) -> tuple[InterviewState, Turn]:
+        state = InterviewState(session_id, random.randrange(2 ** 32) if seed is None else seed)
+        first_field = self.engine.field_names[0]
+        first_q = (
+            f"Hey there! Let’s get you set up. What’s your {first_field}? "
+            "(You can also share several details at once, e.g. “John Doe, john@example.com, 9876543210”.)"
+        )
+        return state, Turn(messages=[first_q])
+
+    def _rng(self, state: InterviewState) -> random.Random:
+        # Seeded per turn so replaying the same inputs gives the same interview
+        return random.Random(f"{state.seed}:{state.turn}")
+
+    def _threshold(self, state: InterviewState) -> int:
+        return random.Random(f"{state.seed}:topic:{state.topic_index}").randint(2, 3)
+
+    def advance(self, state: InterviewState, user_input: str) -> tuple[InterviewState, Turn]:
+        state = state.copy()
+        state.turn += 1
+        if state.phase == FINISHED:
+            return state, Turn(messages=[CLOSED_MESSAGE])
+        if user_input.lower().strip() in EXIT_WORDS:
+            state.phase = FINISHED
+            return state, Turn(request=LLMRequest(EXIT_PROMPT, user_input, lane="summary", scored=True))
+        if state.phase == COLLECTING:
+            return self._collect(state, user_input)
+        return self._interview(state, user_input)
+
+    def _collect(self, state: InterviewState, user_input: str) -> tuple[InterviewState, Turn]:
+        # Every detail in the message is parsed and validated together
+        accepted, errors = self.engine.consume(state.profile, user_input)
+        state.profile.update(accepted)
+        error_messages = [message for _, message in errors]
+        if not accepted:
+            return state, Turn(errors=error_messages)
+
+        next_field = self.engine.next_field(state.profile)
+        if next_field is not None:
+            return state, Turn(errors=error_messages, messages=[f"Cool, now enter your {next_field}:"])
+
+        state.phase = INTERVIEW
+        state.topic_index = 0
+        state.question_count = 0
+        state.threshold = self._threshold(state)
+        topic = state.topic
+        # Upcoming topics the bank cannot serve get their opening question generated ahead of time
+        prefetch = [t for t in state.tech_stack[1:] if t not in self.bank] if self.prefetched else []
+        # Opening question from the pre-generated bank; generated live (and cached) only for unknown topics
+        question = self.bank.opening_question(topic, rng=self._rng(state))
+        if question:
+            return state, Turn(errors=error_messages, messages=[GREETING], posts=[question], prefetch=prefetch, asks=True)
+        request = LLMRequest(
+            OPENING_QUESTION_PROMPT.format(topic=topic), lane="topic_switch", cache_key=(topic, OPENING_QUESTION_PROMPT)
+        )
+        return state, Turn(errors=error_messages, messages=[GREETING], request=request, prefetch=prefetch, asks=True)
+
+    def _interview(self, state: InterviewState, user_input: str) -> tuple[InterviewState, Turn]:
+        topic = state.topic
+        # Every answer is scored beside whatever the turn asks of the LLM
+        evaluate = (topic, state.last_question, user_input)
+        state.question_count += 1
+        if state.question_count < state.threshold:
+            simplified = self.bank.simplified_question(topic, exclude=state.asked_questions, rng=self._rng(state))
+            request = LLMRequest(make_follow_up_prompt(simplified), user_input)
+            return state, Turn(evaluate=evaluate, request=request, suggested=simplified)
+
+        if state.topic_index >= len(state.tech_stack) - 1:
+            state.phase = FINISHED
+            request = LLMRequest(FINAL_SUMMARY_PROMPT, user_input, lane="summary", scored=True)
+            return state, Turn(evaluate=evaluate, request=request)
+
+        next_topic = state.tech_stack[state.topic_index + 1]
+        next_question = self.bank.opening_question(next_topic, exclude=state.asked_questions, rng=self._rng(state))
+        if not next_question and self.prefetched:
+            next_question = self.prefetched(state.session_id, next_topic)
+        state.topic_index += 1
+        state.question_count = 0
+        state.threshold = self._threshold(state)
+        if next_question:
+            # The LLM only writes the feedback; the next topic's question is already there
+            instruction = TOPIC_FEEDBACK_PROMPT.format(topic=topic, next_topic=next_topic)
+            posts = [next_question]
+        else:
+            instruction = TOPIC_SWITCH_PROMPT.format(topic=topic, next_topic=next_topic)
+            posts = []
+        request = LLMRequest(instruction, user_input, lane="topic_switch")
+        return state, Turn(evaluate=evaluate, request=request, posts=posts, compact_topic=topic, asks=True)
+
+    def on_reply(self, state: InterviewState, turn: Turn, reply: str | None) -> InterviewState:
+        """Record the question the candidate now has to answer; `state` is the one `advance` returned."""
+        if turn.request is None and not turn.posts:
+            return state
+        state = state.copy()
+        question = turn.posts[-1] if turn.posts else reply
+        state.last_question = question
+        if turn.asks:
+            state.asked_questions.append(question)
+        elif turn.suggested and reply and turn.suggested in reply:
+            state.asked_questions.append(turn.suggested)
+        return state
+
+
+interview = InterviewSession()
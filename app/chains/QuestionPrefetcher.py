@@ -0,0 +1,79 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from langchain_core.output_parsers import StrOutputParser
+from chains.ChatChain import prompt, response_cache, tracer
+from chains.ChatExecutor import ChatExecutor, ExecutorBusy
+from config.settings import MAX_SESSIONS, PREFETCH_MAX_IN_FLIGHT, llm
+from prompts.interviewPrompt import NEXT_TOPIC_QUESTION_PROMPT
+from utils.metrics import increment
+
+# Next-topic questions do not depend on the conversation, so they are generated without history
+next_question_chain = (prompt | llm | StrOutputParser()).with_config(callbacks=[tracer])
+
+
+class QuestionPrefetcher:
+    """
+    Questions for a session's later topics, generated in the background and posted after the topic-switch feedback:
+    - `start` is called once the tech stack is known and queues one call per topic
+    - `get` never waits: it returns the question only if it is already generated
+    - Replies are shared through `response_cache`, so other sessions with the same topic reuse them
+    - Prefetch calls run in their own small executor and the lowest rate-limit lane,
+      so they never hold up a candidate who is waiting for a reply
+    """
+
+    def __init__(self, chain=next_question_chain, max_in_flight: int = PREFETCH_MAX_IN_FLIGHT,
+                 max_sessions: int = MAX_SESSIONS, cache=response_cache):
+        self.executor = ChatExecutor(chain, max_in_flight=max_in_flight)
+        self.max_sessions = max_sessions
+        self.cache = cache
+        self._pending: OrderedDict[str, dict[str, Future]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, session_id: str, topics: list[str]) -> None:
+        futures = {}
+        for topic in dict.fromkeys(topics):
+            # Peek: a prefetch check is not a candidate's lookup and must not count in the hit rate
+            if self.cache.peek(topic, NEXT_TOPIC_QUESTION_PROMPT) is not None:
+                continue
+            inputs = {"history": [], "input": [], "instruction": NEXT_TOPIC_QUESTION_PROMPT.format(topic=topic)}
+            config = {"metadata": {"priority": "prefetch", "session_id": session_id}}
+            try:
+                future = self.executor.submit(inputs, config)
+            except ExecutorBusy:
+                increment("prefetch_skipped_total")
+                continue
+            future.add_done_callback(lambda f, topic=topic: self._store(topic, f))
+            futures[topic] = future
+        with self._lock:
+            self._pending[session_id] = futures
+            while len(self._pending) > self.max_sessions:
+                self._pending.popitem(last=False)
+
+    def _store(self, topic: str, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(topic, NEXT_TOPIC_QUESTION_PROMPT, future.result())
+
+    def get(self, session_id: str, topic: str) -> str | None:
+        """The prefetched question for `topic`, or None if it is not ready (the caller generates it live)."""
+        with self._lock:
+            future = self._pending.get(session_id, {}).pop(topic, None)
+        if future is None:
+            # Not queued for this session: it may have been generated for another one
+            question = self.cache.get(topic, NEXT_TOPIC_QUESTION_PROMPT)
+        elif not future.done():
+            increment("prefetch_not_ready_total")
+            return None
+        else:
+            question = None if future.cancelled() or future.exception() else future.result()
+        increment("prefetch_hits_total" if question else "prefetch_misses_total")
+        return question
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            for future in self._pending.pop(session_id, {}).values():
+                future.cancel()
+
+
+prefetcher = QuestionPrefetcher()
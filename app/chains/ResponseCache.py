@@ -0,0 +1,131 @@
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import (
+    RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS, SEMANTIC_CACHE_MODEL, SEMANTIC_CACHE_THRESHOLD
+)
+from utils.metrics import increment
+
+
+def normalize(text: str) -> str:
+    """Lower-case and collapse whitespace/punctuation so trivial variants share a key."""
+    return re.sub(r"[\W_]+", " ", text.lower()).strip()
+
+
+def _load_embedder(model_name: str | None):
+    """Return an `embed(text) -> list[float]` callable, or None if no local model is available."""
+    if not model_name:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    model = SentenceTransformer(model_name)
+    return lambda text: model.encode(text, normalize_embeddings=True).tolist()
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ResponseCache:
+    """
+    Cache of LLM replies for prompts that do not depend on the candidate's answers:
+    - Exact tier keyed on the normalized (topic, instruction template) pair
+    - Optional similarity tier over local embeddings of the topic alone, so "ReactJS" can reuse "React";
+      the template still has to match exactly (embedding it too would let its long fixed text
+      outweigh the topic words, and "python" would pass for "java")
+    - Bounded LRU with a TTL; lookups and hits per tier are kept in `stats()` and exported as
+      `response_cache_lookups_total` and `response_cache_{exact,semantic}_hits_total`
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+                 embed=None, threshold: float = SEMANTIC_CACHE_THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embed = embed
+        self.threshold = threshold
+        self._entries: OrderedDict[str, tuple[str, float, list[float] | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = {"exact": 0, "semantic": 0}
+
+    @staticmethod
+    def key(topic: str, template: str) -> str:
+        return f"{normalize(topic)}|{normalize(template)}"
+
+    def _find(self, topic: str, template: str) -> tuple[str, str] | None:
+        """(entry key, tier) of a live entry answering (topic, template), or None."""
+        key = self.key(topic, template)
+        with self._lock:
+            self._expire(time.monotonic())
+            if key in self._entries:
+                return key, "exact"
+            if self.embed is None or not self._entries:
+                return None
+        vector = self.embed(normalize(topic))
+        with self._lock:
+            best_key, best_score = None, self.threshold
+            for candidate, (_, _, candidate_vector) in self._entries.items():
+                # Only answers to the same instruction template are interchangeable
+                if candidate_vector is None or candidate.split("|", 1)[1] != key.split("|", 1)[1]:
+                    continue
+                score = _cosine(vector, candidate_vector)
+                if score >= best_score:
+                    best_key, best_score = candidate, score
+        return None if best_key is None else (best_key, "semantic")
+
+    def get(self, topic: str, template: str) -> str | None:
+        """A cached reply for a request being served; counted in the per-tier hit rates."""
+        found = self._find(topic, template)
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(found[0]) if found else None
+            if entry is not None:
+                self._entries.move_to_end(found[0])
+                self.hits[found[1]] += 1
+        increment("response_cache_lookups_total")
+        if entry is None:
+            return None
+        increment(f"response_cache_{found[1]}_hits_total")
+        return entry[0]
+
+    def peek(self, topic: str, template: str) -> str | None:
+        """`get` for background checks (e.g. prefetch): not counted and the entry's LRU position is kept."""
+        found = self._find(topic, template)
+        with self._lock:
+            entry = self._entries.get(found[0]) if found else None
+        return None if entry is None else entry[0]
+
+    def put(self, topic: str, template: str, text: str) -> None:
+        key = self.key(topic, template)
+        vector = self.embed(normalize(topic)) if self.embed is not None else None
+        with self._lock:
+            self._entries[key] = (text, time.monotonic() + self.ttl_seconds, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.lookups or 1
+            return {
+                "entries": len(self._entries),
+                "lookups": self.lookups,
+                **{f"{tier}_hits": hits for tier, hits in self.hits.items()},
+                **{f"{tier}_hit_rate": hits / lookups for tier, hits in self.hits.items()},
+            }
+
+    def _expire(self, now: float) -> None:
+        expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+
+def make_response_cache() -> ResponseCache:
+    return ResponseCache(embed=_load_embedder(SEMANTIC_CACHE_MODEL))
@@ -0,0 +1,229 @@
+import asyncio
+import concurrent.futures
+import logging
+
+from chains.AnswerEvaluator import evaluator as default_evaluator
+from chains.ChatChain import (
+    acached_stream_reply, astream_reply, cached_stream_reply, record_turn, start_compaction, stream_reply, turn_input
+)
+from chains.ChatExecutor import ExecutorBusy
+from chains.InterviewSession import FINISHED, InterviewSession, InterviewState, LLMRequest, Turn
+from chains.QuestionPrefetcher import prefetcher as default_prefetcher
+from config.settings import MEMORY_MODE
+from memory.transcript import Role, Transcript, interview_record
+from memory.transcriptExport import exporter as default_exporter
+from prompts.interviewPrompt import make_scored_instruction
+from utils.rateLimiter import retryable
+
+logger = logging.getLogger("talentscout.turns")
+
+
+def not_served(exc: BaseException) -> bool:
+    """
+    The LLM request was not served and the candidate should resend the answer: a full executor,
+    a timeout, or a rate limit / provider error still failing after `RateLimitedChatModel` retried it.
+    """
+    return isinstance(exc, (ExecutorBusy, TimeoutError)) or retryable(exc)
+
+
+class TurnView:
+    """
+    What a front-end shows during a turn; this default shows nothing (benchmarks).
+    Views passed to `TurnDriver.aanswer` implement the same methods as coroutines.
+    - `error(text)`: a validation error
+    - `message(text)`: a bot message that needs no LLM call
+    - `token(text)`: the reply received so far, while it streams
+    - `reply(text)`: the finished reply
+    - `refused()`: the request was not served; the candidate should send the answer again
+    """
+
+    def error(self, text: str) -> None:
+        pass
+
+    def message(self, text: str) -> None:
+        pass
+
+    def token(self, text: str) -> None:
+        pass
+
+    def reply(self, text: str) -> None:
+        pass
+
+    def refused(self) -> None:
+        pass
+
+
+class TurnDriver:
+    """
+    One candidate message through the whole turn, the same way for every front-end:
+    - waits for the session's pending topic compaction, then `InterviewSession.advance`
+    - makes the LLM request and starts scoring the answer once the reply starts (scored summaries
+      score first and wait for the scores)
+    - records posted questions in the session history, then `InterviewSession.on_reply`
+    - exports a finished interview, starts prefetching, and compacts a finished topic in the background
+    Every message shown is appended to the caller's `Transcript`. A refused request leaves the
+    state and the transcript as they were, so the candidate can resend the answer.
+    `answer` runs on the caller's thread (Streamlit, benchmarks), `aanswer` on an event loop (ASGI server).
+    """
+
+    def __init__(self, interview: InterviewSession, evaluator=default_evaluator, prefetcher=default_prefetcher,
+                 exporter=default_exporter, memory_mode: str = MEMORY_MODE):
+        self.interview = interview
+        self.evaluator = evaluator
+        self.prefetcher = prefetcher
+        self.exporter = exporter
+        self.memory_mode = memory_mode
+        # session id -> compaction started after its last topic switch
+        self._compactions: dict[str, concurrent.futures.Future] = {}
+
+    def _begin(self, state: InterviewState, user_input: str, transcript: Transcript) -> tuple[InterviewState, Turn]:
+        transcript.append(Role.USER, user_input)
+        new_state, turn = self.interview.advance(state, user_input)
+        for error in turn.errors:
+            logger.warning("Validation failed: %s", error, extra={"event": "validation_error", "session_id": state.session_id})
+        for text in turn.messages:
+            transcript.append(Role.ASSISTANT, text)
+        if turn.request is not None:
+            logger.info("Phase: %s | Topic: %s | Lane: %s", new_state.phase, new_state.topic, turn.request.lane,
+                        extra={"event": "llm_request", "session_id": state.session_id})
+        return new_state, turn
+
+    def _scoring(self, session_id: str, turn: Turn):
+        """
+        A callable that submits the turn's answer for scoring the first time it is called. Scoring
+        starts once the reply does, so a refused turn never spends a heavy-model call; the scored
+        summary is the exception, since it is written from the scores and has to wait for them.
+        """
+        pending = [turn.evaluate] if turn.evaluate else []
+
+        def score() -> None:
+            if pending:
+                self.evaluator.submit(session_id, *pending.pop())
+
+        if turn.request is None or turn.request.scored:
+            score()
+        return score
+
+    @staticmethod
+    def _call(session_id: str, request: LLMRequest, scores: str | None) -> tuple[dict, dict]:
+        # Summaries are built from the recorded scores instead of re-judging the history
+        instruction = request.instruction if scores is None else make_scored_instruction(request.instruction, scores)
+        config = {"configurable": {"session_id": session_id}, "metadata": {"priority": request.lane}}
+        return turn_input(instruction, request.user_input), config
+
+    def _refused(self, state: InterviewState, transcript: Transcript, mark: int, exc: BaseException) -> None:
+        transcript.truncate(mark)
+        logger.warning("LLM request not served: %r", exc, extra={"event": "llm_refused", "session_id": state.session_id})
+
+    def _finish(self, state: InterviewState, new_state: InterviewState, turn: Turn, reply: str | None,
+                transcript: Transcript) -> InterviewState:
+        """Everything after the reply; blocking I/O (history, export), so `aanswer` runs it on a thread."""
+        session_id = state.session_id
+        if reply is not None:
+            transcript.append(Role.ASSISTANT, reply)
+            logger.info("LLM response: %s", reply, extra={"event": "llm_reply", "session_id": session_id})
+        for text in turn.posts:
+            record_turn(session_id, text)
+            transcript.append(Role.ASSISTANT, text)
+        new_state = self.interview.on_reply(new_state, turn, reply)
+        if new_state.phase == FINISHED and state.phase != FINISHED:
+            if self.exporter is not None:
+                # Scores are complete here: the summary request already waited for them
+                self.exporter.export(interview_record(new_state, transcript, self.evaluator.records(session_id)))
+                logger.info("Exported interview", extra={"event": "export", "session_id": session_id})
+            # Nothing reads the scores of a finished interview again
+            self.evaluator.discard(session_id)
+        if turn.prefetch:
+            self.prefetcher.start(session_id, turn.prefetch)
+        if turn.compact_topic and self.memory_mode == "summary":
+            # The finished topic survives as a summary, written while the candidate reads the next question
+            future = self._compactions[session_id] = start_compaction(session_id, turn.compact_topic)
+            future.add_done_callback(lambda done: self._forget(session_id, done))
+            logger.info("Compacting history for topic: %s", turn.compact_topic, extra={"event": "compaction", "session_id": session_id})
+        return new_state
+
+    def answer(self, state: InterviewState, user_input: str, transcript: Transcript,
+               view: TurnView = TurnView()) -> tuple[InterviewState, bool]:
+        """Returns (state to keep, whether the turn was served)."""
+        if (pending := self._compactions.pop(state.session_id, None)) is not None:
+            # The summary rewrites the history; it has to land before this turn reads it
+            concurrent.futures.wait([pending])
+        mark = len(transcript)
+        new_state, turn = self._begin(state, user_input, transcript)
+        for error in turn.errors:
+            view.error(error)
+        for text in turn.messages:
+            view.message(text)
+
+        score = self._scoring(state.session_id, turn)
+
+        def on_token(text: str) -> None:
+            score()
+            view.token(text)
+
+        reply = None
+        if (request := turn.request) is not None:
+            scores = self.evaluator.report(state.session_id) if request.scored else None
+            inputs, config = self._call(state.session_id, request, scores)
+            try:
+                if request.cache_key is None:
+                    reply = stream_reply(inputs, config, on_token=on_token)
+                else:
+                    reply = cached_stream_reply(inputs, config, *request.cache_key, on_token=on_token)
+            except Exception as exc:
+                if not not_served(exc):
+                    raise
+                self._refused(state, transcript, mark, exc)
+                view.refused()
+                return state, False
+            score()
+            view.reply(reply)
+        new_state = self._finish(state, new_state, turn, reply, transcript)
+        for text in turn.posts:
+            view.message(text)
+        return new_state, True
+
+    async def aanswer(self, state: InterviewState, user_input: str, transcript: Transcript,
+                      view) -> tuple[InterviewState, bool]:
+        """`answer` for an event loop; `view` methods are coroutines and blocking steps run on threads."""
+        if (pending := self._compactions.pop(state.session_id, None)) is not None:
+            await asyncio.wait([asyncio.wrap_future(pending)])
+        mark = len(transcript)
+        new_state, turn = self._begin(state, user_input, transcript)
+        for error in turn.errors:
+            await view.error(error)
+        for text in turn.messages:
+            await view.message(text)
+
+        score = self._scoring(state.session_id, turn)
+
+        async def on_token(text: str) -> None:
+            score()
+            await view.token(text)
+
+        reply = None
+        if (request := turn.request) is not None:
+            scores = await asyncio.to_thread(self.evaluator.report, state.session_id) if request.scored else None
+            inputs, config = self._call(state.session_id, request, scores)
+            try:
+                if request.cache_key is None:
+                    reply = await astream_reply(inputs, config, on_token)
+                else:
+                    reply = await acached_stream_reply(inputs, config, *request.cache_key, on_token=on_token)
+            except Exception as exc:
+                if not not_served(exc):
+                    raise
+                self._refused(state, transcript, mark, exc)
+                await view.refused()
+                return state, False
+            score()
+            await view.reply(reply)
+        new_state = await asyncio.to_thread(self._finish, state, new_state, turn, reply, transcript)
+        for text in turn.posts:
+            await view.message(text)
+        return new_state, True
+
+    def _forget(self, session_id: str, future: concurrent.futures.Future) -> None:
+        # A session that never sends another answer must not keep its entry
+        if self._compactions.get(session_id) is future:
+            self._compactions.pop(session_id, None)
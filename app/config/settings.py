@@ -1,12 +1,161 @@
 import os
+from functools import partial
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+from utils.modelRouter import HealthTracker, ModelRouter, parse_backends, parse_routes
+from utils.rateLimiter import RateLimitedChatModel, RateLimitScheduler
+from utils.resources import registry
 
 load_dotenv()
 
 TOPICS = ["Full Stack Development", "Data Science"]
 
-llm = ChatGroq(
-    model="Gemma2-9b-It",
-    groq_api_key=os.getenv("GROQ_API_KEY")
+# Token budget for the conversation history sent with each request
+MAX_HISTORY_TOKENS = 4500
+
+# Bounds for the in-process session store
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "500"))
+MAX_STORE_TOKENS = int(os.getenv("MAX_STORE_TOKENS", "2000000"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+# Session history backend: "memory" (process-local) or "sqlite" (persistent, shared)
+HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "memory")
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "history.db")
+HISTORY_FLUSH_INTERVAL = float(os.getenv("HISTORY_FLUSH_INTERVAL", "0.02"))
+HISTORY_TAIL_MESSAGES = int(os.getenv("HISTORY_TAIL_MESSAGES", "200"))
+
+# Memory mode: "summary" compacts each finished topic into a running summary,
+# "window" relies on the token trimmer alone
+MEMORY_MODE = os.getenv("MEMORY_MODE", "summary")
+# Messages kept verbatim when a topic is compacted (last answer + topic switch reply); the kept
+# tail is extended back to the last answer when the next question was posted as its own message
+KEEP_RECENT_MESSAGES = 2
+
+# LLM execution limits for the whole process (chat, summaries, scoring and prefetch share them):
+# concurrent provider calls, waiting requests, per-call timeout counted from when the call was queued
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "64"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+
+# Reply cache for answer-independent prompts (e.g. a topic's opening question);
+# set SEMANTIC_CACHE_MODEL to a local sentence-transformers model to enable the similarity tier
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "86400"))
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+
+# Background generation of upcoming topics' opening questions (topics missing from the question bank)
+PREFETCH_MAX_IN_FLIGHT = int(os.getenv("PREFETCH_MAX_IN_FLIGHT", "2"))
+
+# Structured scoring of each answer, run beside the follow-up question; one call per answer like the
+# follow-up itself, so by default it may use the whole budget (follow-ups still go first by lane)
+EVALUATION_MAX_IN_FLIGHT = int(os.getenv("EVALUATION_MAX_IN_FLIGHT", str(LLM_MAX_IN_FLIGHT)))
+
+# Pre-generated question bank (built offline with tools/buildQuestionBank.py)
+QUESTION_BANK_DIR = os.getenv(
+    "QUESTION_BANK_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "questionBank")
+)
+
+# Provider quotas enforced client-side; GROQ_API_BASE points the client at another endpoint
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30"))
+GROQ_TOKENS_PER_MINUTE = float(os.getenv("GROQ_TOKENS_PER_MINUTE", "15000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+
+# Model backends ("name=provider:model"; provider "groq") and the backends tried per request lane,
+# in order: the small model on the conversational path, the large one where the evaluation quality matters
+LLM_BACKENDS = os.getenv("LLM_BACKENDS", "fast=groq:Gemma2-9b-It,heavy=groq:llama-3.3-70b-versatile")
+LLM_ROUTES = os.getenv(
+    "LLM_ROUTES",
+    "followup=fast|heavy,topic_switch=fast|heavy,prefetch=fast|heavy,"
+    "scoring=heavy|fast,evaluation=heavy|fast,summary=heavy|fast"
+)
+# Failover: a backend averaging over LLM_SLOW_SECONDS to the first token is used only when no faster one
+# is available; LLM_FAILURE_THRESHOLD consecutive errors take it out for LLM_FAILURE_COOLDOWN_SECONDS
+LLM_SLOW_SECONDS = float(os.getenv("LLM_SLOW_SECONDS", "8"))
+LLM_FAILURE_THRESHOLD = int(os.getenv("LLM_FAILURE_THRESHOLD", "3"))
+LLM_FAILURE_COOLDOWN_SECONDS = float(os.getenv("LLM_FAILURE_COOLDOWN_SECONDS", "30"))
+
+# Keep-alive connection pool shared by every Groq call in the process
+GROQ_HTTP_MAX_CONNECTIONS = int(os.getenv("GROQ_HTTP_MAX_CONNECTIONS", "16"))
+GROQ_HTTP_KEEPALIVE_SECONDS = float(os.getenv("GROQ_HTTP_KEEPALIVE_SECONDS", "60"))
+
+# Finished interviews (profile, answer scores, full transcript) appended as compressed JSON lines;
+# ".zst" uses the optional zstandard package (else gzip), empty disables it; "{pid}" is replaced per
+# process, so server workers never append compressed streams to the same file
+TRANSCRIPT_EXPORT_PATH = os.getenv("TRANSCRIPT_EXPORT_PATH", "interviews-{pid}.jsonl.zst")
+TRANSCRIPT_EXPORT_LEVEL = int(os.getenv("TRANSCRIPT_EXPORT_LEVEL", "9"))
+
+# Logging: JSON lines written by a background thread, rotated by size;
+# LOG_SAMPLE_RATES keeps a fraction of chatty events, e.g. "render=0.1,llm_reply=0.5"
+LOG_PATH = os.getenv("LOG_PATH", "app.log")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "3"))
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "500"))
+LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "render=0.1")
+LOG_CONSOLE = os.getenv("LOG_CONSOLE", "1") == "1"
+
+# Metrics export: Prometheus text on http://127.0.0.1:METRICS_PORT/metrics and/or a JSON
+# snapshot rewritten every METRICS_DUMP_INTERVAL seconds ("{pid}" in the path is replaced per process)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_DUMP_PATH = os.getenv("METRICS_DUMP_PATH")
+METRICS_DUMP_INTERVAL = float(os.getenv("METRICS_DUMP_INTERVAL", "30"))
+
+
+def _http_options() -> dict:
+    import httpx
+    return {
+        "limits": httpx.Limits(
+            max_connections=GROQ_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=GROQ_HTTP_MAX_CONNECTIONS,
+            keepalive_expiry=GROQ_HTTP_KEEPALIVE_SECONDS
+        ),
+        "timeout": httpx.Timeout(LLM_TIMEOUT_SECONDS, connect=10.0),
+    }
+
+
+@registry.register("groq_http_client", close=lambda client: client.close())
+def _groq_http_client():
+    import httpx
+    return httpx.Client(**_http_options())
+
+
+# Closed with the process; an AsyncClient cannot be closed outside its event loop, and its pooled
+# connections belong to the loop that opened them, so it is only used on the shared ExecutorPool loop
+@registry.register("groq_async_http_client")
+def _groq_async_http_client():
+    import httpx
+    return httpx.AsyncClient(**_http_options())
+
+
+def _chat_model(provider: str, model: str):
+    if provider == "groq":
+        # langchain_groq and the groq SDK take about a second to import, so they load on first use
+        from langchain_groq import ChatGroq
+        return ChatGroq(
+            model=model,
+            groq_api_key=os.getenv("GROQ_API_KEY"),
+            # Retries are handled by the scheduler so they respect the shared budget
+            max_retries=0,
+            http_client=registry.get("groq_http_client"),
+            http_async_client=registry.get("groq_async_http_client")
+        )
+    raise ValueError(f"Unknown provider {provider!r} in LLM_BACKENDS")
+
+
+# One lazily built client per backend, e.g. "chat_model:fast"
+MODEL_RESOURCES = {}
+for _name, (_provider, _model) in parse_backends(LLM_BACKENDS).items():
+    MODEL_RESOURCES[_name] = f"chat_model:{_name}"
+    registry.register(MODEL_RESOURCES[_name], partial(_chat_model, _provider, _model))
+
+router = ModelRouter(
+    backends=MODEL_RESOURCES,
+    routes=parse_routes(LLM_ROUTES),
+    health=HealthTracker(LLM_SLOW_SECONDS, LLM_FAILURE_THRESHOLD, LLM_FAILURE_COOLDOWN_SECONDS)
+)
+
+llm = RateLimitedChatModel(
+    model=router,
+    scheduler=RateLimitScheduler(GROQ_REQUESTS_PER_MINUTE, GROQ_TOKENS_PER_MINUTE),
+    max_retries=LLM_MAX_RETRIES
 )
@@ -1,9 +1,179 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
 from langchain_community.chat_message_histories import ChatMessageHistory
 from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, convert_to_messages
+from config.settings import (
+    HISTORY_BACKEND, HISTORY_DB_PATH, KEEP_RECENT_MESSAGES, MAX_SESSIONS, MAX_STORE_TOKENS, SESSION_TTL_SECONDS
+)
+from utils.tokenCounter import message_tokens
+
+
+class TokenCountingHistory(ChatMessageHistory):
+    """In-memory history that counts each message once and keeps a running total."""
+
+    total_tokens: int = 0
+
+    def add_message(self, message: BaseMessage) -> None:
+        # Callers may pass role/content dicts straight through the chain input
+        message = convert_to_messages([message])[0]
+        self.total_tokens += message_tokens(message)
+        super().add_message(message)
+
+    def clear(self) -> None:
+        super().clear()
+        self.total_tokens = 0
+
+
+_sqlite_writer = None
+
+def make_history(session_id: str) -> BaseChatMessageHistory:
+    """Create an empty or lazily loaded history for the configured backend."""
+    global _sqlite_writer
+    if HISTORY_BACKEND == "sqlite":
+        from memory.sqliteHistory import SQLiteChatMessageHistory, SQLiteHistoryWriter
+        if _sqlite_writer is None:
+            _sqlite_writer = SQLiteHistoryWriter(HISTORY_DB_PATH)
+        return SQLiteChatMessageHistory(session_id, _sqlite_writer)
+    return TokenCountingHistory()
+
+
+def new_session_id() -> str:
+    """Return a unique id for a new candidate session."""
+    return f"candidate_{uuid.uuid4().hex}"
+
+
+class SessionStore:
+    """
+    Bounded store of per-session histories:
+    - Least recently used sessions are evicted past `max_sessions` or `max_tokens`
+    - Sessions idle for longer than `ttl_seconds` are expired
+    - Hit/miss/eviction counters are exposed through `stats()`
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, max_tokens: int = MAX_STORE_TOKENS,
+                 ttl_seconds: float = SESSION_TTL_SECONDS, history_factory=make_history):
+        self.max_sessions = max_sessions
+        self.max_tokens = max_tokens
+        self.ttl_seconds = ttl_seconds
+        self.history_factory = history_factory
+        self._sessions: OrderedDict[str, tuple[BaseChatMessageHistory, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id: str) -> BaseChatMessageHistory:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                self.misses += 1
+                history = self.history_factory(session_id)
+            else:
+                self.hits += 1
+                history = entry[0]
+            self._sessions[session_id] = (history, now)
+            self._evict(keep=session_id)
+            return history
 
-_store: dict[str, ChatMessageHistory] = {}
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def total_tokens(self) -> int:
+        return sum(getattr(history, "total_tokens", 0) for history, _ in self._sessions.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "tokens": self.total_tokens(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def _expire(self, now: float) -> None:
+        # Entries are kept in access order, so idle sessions sit at the front
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+            self.expirations += 1
+
+    def _evict(self, keep: str) -> None:
+        tokens = self.total_tokens()
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions or tokens > self.max_tokens):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                break
+            history, _ = self._sessions.pop(session_id)
+            tokens -= getattr(history, "total_tokens", 0)
+            self.evictions += 1
+
+
+# Marks a system message as the compacted summary of one interview topic
+TOPIC_SUMMARY_KEY = "topic_summary"
+
+
+def compact_history(history: BaseChatMessageHistory, topic: str, summarize, keep_recent: int = KEEP_RECENT_MESSAGES) -> bool:
+    """
+    Replace the finished topic's turns with a one-message summary:
+    - Earlier topic summaries stay at the front, in interview order
+    - The last `keep_recent` messages stay verbatim, and always everything from the candidate's
+      last answer on (a topic switch that posts its next question adds feedback + question after it)
+    - `summarize(messages, topic)` is called once and returns the summary text
+    Returns False when there was nothing to compact.
+    """
+    messages = history.messages
+    head = 0
+    while head < len(messages) and TOPIC_SUMMARY_KEY in messages[head].additional_kwargs:
+        head += 1
+    tail = len(messages) - keep_recent
+    last_answer = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=tail)
+    tail = max(head, min(tail, last_answer))
+    finished = messages[head:tail]
+    if not finished:
+        return False
+
+    summary = SystemMessage(
+        f"Summary of the {topic} section of the interview:\n{summarize(finished, topic)}",
+        additional_kwargs={TOPIC_SUMMARY_KEY: topic}
+    )
+    history.clear()
+    history.add_messages(messages[:head] + [summary] + messages[tail:])
+    return True
+
+
+_store = SessionStore()
 
 def get_session_history(session_id: str) -> BaseChatMessageHistory:
-    if session_id not in _store:
-        _store[session_id] = ChatMessageHistory()
-    return _store[session_id]
+    return _store.get(session_id)
+
+
+def release_session_history(session_id: str) -> None:
+    """
+    Called when a candidate disconnects from a server worker:
+    - With the SQLite backend, pending writes are flushed and the cached tail is dropped,
+      so whichever worker the candidate reconnects to reads the full history
+    - In-memory histories are kept; such a session can only resume on the same worker
+    """
+    if HISTORY_BACKEND != "sqlite":
+        return
+    _store.discard(session_id)
+    if _sqlite_writer is not None:
+        _sqlite_writer.flush()
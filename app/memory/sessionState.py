@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from config.settings import HISTORY_BACKEND, HISTORY_DB_PATH, MAX_SESSIONS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interview_state (
+    session_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class MemoryStateStore:
+    """Interview states of this process, least recently used dropped past `max_sessions`."""
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._states: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> dict | None:
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None:
+                self._states.move_to_end(session_id)
+            return state
+
+    def put(self, session_id: str, state: dict) -> None:
+        with self._lock:
+            self._states[session_id] = state
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._states.pop(session_id, None)
+
+
+class SQLiteStateStore:
+    """
+    Interview states kept next to the SQLite message history:
+    - Every worker process reads and writes the same table, so a reconnecting
+      candidate can resume on any worker
+    - One small upsert per turn; readers use one connection per thread
+    """
+
+    def __init__(self, path: str = HISTORY_DB_PATH):
+        from memory.sqliteHistory import _connect
+        self.path = path
+        self._connect = _connect
+        self._local = threading.local()
+        with _connect(path) as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(self.path)
+        return conn
+
+    def get(self, session_id: str) -> dict | None:
+        row = self._conn().execute("SELECT state FROM interview_state WHERE session_id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, session_id: str, state: dict) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO interview_state (session_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at",
+                (session_id, json.dumps(state), time.time()),
+            )
+
+    def discard(self, session_id: str) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM interview_state WHERE session_id = ?", (session_id,))
+
+
+def make_state_store():
+    """Shared store when histories are persisted in SQLite, otherwise per process."""
+    if HISTORY_BACKEND == "sqlite":
+        return SQLiteStateStore()
+    return MemoryStateStore()
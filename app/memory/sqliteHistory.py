@@ -0,0 +1,194 @@
+import atexit
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from typing import Sequence
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import BaseMessage, convert_to_messages, message_to_dict, messages_from_dict
+from config.settings import HISTORY_FLUSH_INTERVAL, HISTORY_TAIL_MESSAGES
+from utils.metrics import increment
+from utils.tokenCounter import message_tokens
+
+logger = logging.getLogger("talentscout.history")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session ON messages (session_id, id);
+CREATE TABLE IF NOT EXISTS session_starts (
+    session_id TEXT PRIMARY KEY,
+    first_id INTEGER NOT NULL
+);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode NORMAL only syncs at checkpoints, not on every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class SQLiteHistoryWriter:
+    """
+    Append-only writer shared by all sessions of one database:
+    - Writes are queued and applied by a single background thread
+    - Rows are never deleted: `reset` moves a session's start past its existing rows
+      (a compacted history is re-added after it), and reads only see rows from the start on
+    - Everything queued within `flush_interval` is group-committed in one transaction
+    - A batch that fails (e.g. "database is locked" past the busy timeout) is retried
+      `max_attempts` times, then logged and dropped; the writer thread keeps running
+    """
+
+    def __init__(self, path: str, flush_interval: float = HISTORY_FLUSH_INTERVAL, max_batch: int = 512,
+                 max_attempts: int = 3, retry_delay: float = 0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.commits = 0
+        self.rows_written = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._readers = threading.local()
+        with _connect(path) as conn:
+            conn.executescript(_SCHEMA)
+        self._thread = threading.Thread(target=self._run, name="sqlite-history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def append(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        rows = [(session_id, json.dumps(message_to_dict(m))) for m in messages]
+        self._queue.put(("append", rows))
+
+    def reset(self, session_id: str) -> None:
+        self._queue.put(("reset", session_id))
+
+    def flush(self, timeout: float | None = 30.0) -> bool:
+        """Wait until every write queued so far is committed or dropped; False on timeout or a stopped writer."""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(("stop", None))
+            self._thread.join()
+
+    def read_tail(self, session_id: str, limit: int) -> list[BaseMessage]:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = self._readers.conn = _connect(self.path)
+        rows = conn.execute(
+            "SELECT message FROM (SELECT id, message FROM messages WHERE session_id = ? AND id >= "
+            "COALESCE((SELECT first_id FROM session_starts WHERE session_id = ?), 0) "
+            "ORDER BY id DESC LIMIT ?) ORDER BY id",
+            (session_id, session_id, limit),
+        ).fetchall()
+        return messages_from_dict([json.loads(row[0]) for row in rows])
+
+    def _run(self) -> None:
+        conn = _connect(self.path)
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Gather everything that arrives during the flush window into one commit
+            try:
+                while len(batch) < self.max_batch:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            stopping = any(op == "stop" for op, _ in batch)
+            try:
+                self._commit(conn, batch)
+            except Exception:
+                logger.exception("History batch dropped", extra={"event": "history_write_error"})
+                increment("history_write_errors_total")
+            finally:
+                # Waiters are released even when the batch was dropped
+                for op, payload in batch:
+                    if op == "flush":
+                        payload.set()
+        conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: list) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                rows = 0
+                with conn:
+                    for op, payload in batch:
+                        if op == "append":
+                            conn.executemany("INSERT INTO messages (session_id, message) VALUES (?, ?)", payload)
+                            rows += len(payload)
+                        elif op == "reset":
+                            # AUTOINCREMENT ids never go back, so every later row is past this start
+                            conn.execute(
+                                "INSERT INTO session_starts (session_id, first_id) "
+                                "SELECT ?, COALESCE(MAX(id), 0) + 1 FROM messages WHERE true "
+                                "ON CONFLICT (session_id) DO UPDATE SET first_id = excluded.first_id",
+                                (payload,),
+                            )
+            except sqlite3.Error as exc:
+                if attempt == self.max_attempts:
+                    raise
+                logger.warning("History batch failed (attempt %d): %r", attempt, exc, extra={"event": "history_write_retry"})
+                time.sleep(self.retry_delay * attempt)
+                continue
+            self.rows_written += rows
+            self.commits += 1
+            return
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """
+    Session history persisted through a shared `SQLiteHistoryWriter`:
+    - Only the last `tail_messages` messages are loaded, on first access
+    - New messages go to the in-memory tail and are written asynchronously
+    - `clear` (e.g. before a compacted history is re-added) hides the earlier rows instead of deleting them
+    """
+
+    def __init__(self, session_id: str, writer: SQLiteHistoryWriter, tail_messages: int = HISTORY_TAIL_MESSAGES):
+        self.session_id = session_id
+        self.writer = writer
+        self.tail_messages = tail_messages
+        self._tail: list[BaseMessage] | None = None
+        self.total_tokens = 0
+
+    def _load(self) -> list[BaseMessage]:
+        if self._tail is None:
+            self._tail = self.writer.read_tail(self.session_id, self.tail_messages)
+            self.total_tokens = sum(message_tokens(m) for m in self._tail)
+        return self._tail
+
+    @property
+    def messages(self) -> list[BaseMessage]:
+        return list(self._load())
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        messages = convert_to_messages(messages)
+        tail = self._load()
+        for message in messages:
+            self.total_tokens += message_tokens(message)
+            tail.append(message)
+        # Keep memory bounded; older messages stay on disk
+        overflow = len(tail) - self.tail_messages
+        if overflow > 0:
+            self.total_tokens -= sum(message_tokens(m) for m in tail[:overflow])
+            del tail[:overflow]
+        self.writer.append(self.session_id, messages)
+
+    def clear(self) -> None:
+        self._tail = []
+        self.total_tokens = 0
+        self.writer.reset(self.session_id)
@@ -0,0 +1,68 @@
+import enum
+import time
+
+
+class Role(enum.Enum):
+    """Message author; members are singletons, so every record shares one object per role."""
+
+    USER = "user"
+    ASSISTANT = "assistant"
+
+
+class TranscriptMessage:
+    """One displayed message; `content` is the same string object the LLM history holds, not a copy."""
+
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: Role, content: str):
+        self.role = role
+        self.content = content
+
+    def to_dict(self) -> dict:
+        return {"role": self.role.value, "content": self.content}
+
+
+class Transcript:
+    """
+    Everything a candidate saw, in order, as compact records:
+    - `append(role, content)` stores the content by reference; callers pass the text they gave the history
+    - `truncate(length)` drops the messages of a turn whose request was refused
+    - `to_records()` gives role/content dicts for exports
+    """
+
+    __slots__ = ("messages", "started_at")
+
+    def __init__(self):
+        self.messages: list[TranscriptMessage] = []
+        self.started_at = time.time()
+
+    def append(self, role: Role, content: str) -> None:
+        self.messages.append(TranscriptMessage(role, content))
+
+    def truncate(self, length: int) -> None:
+        del self.messages[length:]
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def __getitem__(self, index):
+        return self.messages[index]
+
+    def to_records(self) -> list[dict]:
+        return [message.to_dict() for message in self.messages]
+
+
+def interview_record(state, transcript: Transcript, scores: dict | None = None) -> dict:
+    """The export record of one finished interview: profile, per-topic scores and the full transcript."""
+    return {
+        "session_id": state.session_id,
+        "started_at": transcript.started_at,
+        "finished_at": time.time(),
+        "profile": state.profile,
+        "topics": state.tech_stack,
+        "scores": scores or {},
+        "transcript": transcript.to_records(),
+    }
@@ -0,0 +1,90 @@
+import atexit
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+from typing import Iterator
+
+from config.settings import TRANSCRIPT_EXPORT_LEVEL, TRANSCRIPT_EXPORT_PATH
+from utils.metrics import increment
+
+try:
+    import zstandard
+except ImportError:  # optional; exports fall back to gzip
+    zstandard = None
+
+logger = logging.getLogger("talentscout.export")
+
+
+def _open(path: str, level: int):
+    if path.endswith(".zst"):
+        # Appending starts a new frame; concatenated frames read back as one stream
+        return zstandard.ZstdCompressor(level=level).stream_writer(open(path, "ab"), closefd=True)
+    return gzip.open(path, "ab", compresslevel=min(9, max(1, level)))
+
+
+class TranscriptExporter:
+    """
+    Finished interviews appended to one compressed JSON-lines file, one record per line:
+    - The file is opened once and written as a single compressed stream, so records compress against each other
+    - Every record is flushed when written; readers get all flushed records even while the stream is open
+    - `.zst` paths need the optional `zstandard` package and fall back to `.gz` without it
+    """
+
+    def __init__(self, path: str, level: int = TRANSCRIPT_EXPORT_LEVEL):
+        if path.endswith(".zst") and zstandard is None:
+            path = f"{path[:-len('.zst')]}.gz"
+            logger.warning("zstandard is not installed; exporting to %s", path, extra={"event": "export"})
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.level = level
+        self._file = None
+        self._lock = threading.Lock()
+
+    def export(self, record: dict) -> None:
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                self._file = _open(self.path, self.level)
+            self._file.write(line)
+            self._file.flush()
+        increment("transcripts_exported_total")
+        increment("transcript_export_bytes_total", len(line))
+
+    def close(self) -> None:
+        """End the compressed stream; the next export opens a new one in the same file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_export(path: str) -> Iterator[dict]:
+    """Stream the records of an export file, including the flushed part of one still being written."""
+    if path.endswith(".zst"):
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), read_across_frames=True, closefd=True)
+        errors = (zstandard.ZstdError,)
+    else:
+        reader = gzip.open(path, "rb")
+        errors = (EOFError,)
+    with io.TextIOWrapper(reader, encoding="utf-8") as lines:
+        try:
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        except errors:
+            # A stream that is still open (or was cut off) ends without its end marker
+            return
+
+
+def make_exporter() -> TranscriptExporter | None:
+    """The exporter configured in settings, or None when TRANSCRIPT_EXPORT_PATH is empty."""
+    if not TRANSCRIPT_EXPORT_PATH:
+        return None
+    exporter = TranscriptExporter(TRANSCRIPT_EXPORT_PATH)
+    atexit.register(exporter.close)
+    return exporter
+
+
+exporter = make_exporter()
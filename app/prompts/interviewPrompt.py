@@ -1,6 +1,88 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from config.settings import TOPICS
 
+# Opening question for a topic; it does not depend on earlier answers, so replies can be cached
+OPENING_QUESTION_PROMPT = (
+    "The topic is: {topic}\n"
+    "Start the interview by asking an introductory question about this topic.\n"
+    "Do not wait for any previous answers. This is the first question of the interview.\n"
+    "Keep it relevant and conversational."
+)
+
+# Question for a later topic, posted after the topic-switch feedback; answer-independent, so replies can be cached
+NEXT_TOPIC_QUESTION_PROMPT = (
+    "The interview now moves on to the topic: {topic}\n"
+    "The candidate has already answered questions on earlier topics and has received feedback on them.\n"
+    "Ask one introductory question about {topic}. Do not greet the candidate, give feedback, or recap earlier topics.\n"
+    "Respond ONLY with the question."
+)
+
+# Topic switch when the next topic's opening question comes from the question bank: feedback only
+TOPIC_FEEDBACK_PROMPT = (
+    "Current topic '{topic}' is completed. Please wrap up by summarizing your feedback for the candidate’s last answer.\n"
+    "Then, tell the candidate that the interview now moves on to {next_topic}.\n"
+    "Do not ask any question; the next question will follow separately."
+)
+
+# Topic switch with a live opening question, for topics missing from the bank
+TOPIC_SWITCH_PROMPT = (
+    "Current topic '{topic}' is completed. Please wrap up by summarizing your feedback for the candidate’s last answer.\n"
+    "Then, switch the conversation to the next topic: {next_topic}.\n"
+    "Finally, ask the candidate an introductory question for {next_topic}."
+)
+
+
+def make_follow_up_prompt(simplified: str | None = None) -> str:
+    """
+    Instruction for a normal turn; `simplified` is a bank question to fall back on for a wrong answer.
+    The detailed scoring runs as a separate request (see make_answer_evaluation_template), so this one stays short.
+    """
+    simplified_step = (
+        f"   - Give the key correction in one sentence and then ask exactly this simplified question: \"{simplified}\"\n\n"
+        if simplified else
+        "   - Give the key correction in one sentence and ask a simplified follow-up question centered on the same topic.\n\n"
+    )
+    return (
+        "The candidate has just answered your last question.\n\n"
+        "You are required to strictly follow these instructions without any deviation or additional commentary:\n\n"
+        "1. React to the answer in one short sentence; a detailed evaluation is recorded separately.\n"
+        "2. If the answer is correct:\n   - Ask a follow-up question that dives deeper into the same topic.\n"
+        "3. If the answer is incorrect:\n" + simplified_step +
+        "IMPORTANT: Respond ONLY with the short reaction and the follow-up question. DO NOT include any extra context, apologies, or additional remarks."
+    )
+
+
+# End-of-interview evaluation; also used by tools.batchEvaluate to re-score stored transcripts
+FINAL_SUMMARY_PROMPT = (
+    "All topics have been covered.\n\n"
+    "You are required to strictly follow these instructions without any deviation or additional commentary:\n\n"
+    "1. Synthesize an objective evaluation summary of the entire interview process using the chat history.\n"
+    "2. Provide a brief, clear, and unambiguous summary that highlights the candidate's strengths and areas for improvement.\n"
+    "3. End the interview by thanking the candidate in a concise manner, explicitly stating that the interview is concluded.\n\n"
+    "IMPORTANT: Respond ONLY with the interview evaluation summary and the thank-you message. DO NOT include any extra context, apologies, or remarks."
+)
+
+EXIT_PROMPT = (
+    "The user has requested to end the interview.\n\n"
+    "You are required to strictly follow these instructions without any deviation or additional commentary:\n\n"
+    "1. Conclude the interview immediately.\n"
+    "2. Provide a concise, professional evaluation summary of the interview so far.\n"
+    "3. Thank the candidate for their time and bid them goodbye.\n\n"
+    "IMPORTANT: Respond ONLY with the evaluation summary and goodbye message. DO NOT include any extra context, apologies, or remarks."
+)
+
+
+def make_scored_instruction(instruction: str, records: str) -> str:
+    """Append the recorded answer scores to a summary instruction (final summary or exit)."""
+    if not records:
+        return instruction
+    return (
+        f"{instruction}\n\n"
+        "Base the evaluation on these recorded scores (1 = poor, 5 = excellent) of each answer, grouped by topic:\n"
+        f"{records}"
+    )
+
+
 def make_prompt_template():
     system_msg = f"""
 You are a 🔥 dynamic, conversational interview chatbot 🔥 who expertly guides the interview process.
@@ -13,5 +95,47 @@ Keep the conversation natural, friendly, and encouraging at all times.
 """
     return ChatPromptTemplate.from_messages([
         ("system", system_msg),
-        MessagesPlaceholder(variable_name="messages")
+        MessagesPlaceholder(variable_name="history"),
+        MessagesPlaceholder(variable_name="input"),
+        # Per-turn instruction (follow-up, topic switch, summary) goes last so it takes precedence
+        ("system", "{instruction}")
+    ])
+
+
+def make_topic_summary_template():
+    system_msg = """
+You are summarizing one finished section of a technical interview for the final evaluation.
+Write a compact summary of the questions asked and how the candidate answered each one:
+note what was correct, incorrect, or incomplete. Do not add advice or commentary.
+"""
+    return ChatPromptTemplate.from_messages([
+        ("system", system_msg),
+        MessagesPlaceholder(variable_name="messages"),
+        ("system", "Summarize the {topic} section above.")
+    ])
+
+
+def make_answer_evaluation_template():
+    system_msg = """
+You score one answer from a technical interview.
+Return ONLY a JSON object with these keys:
+- "relevance", "correctness", "completeness": integers from 1 (poor) to 5 (excellent)
+- "note": one short sentence on what was right or missing
+"""
+    return ChatPromptTemplate.from_messages([
+        ("system", system_msg),
+        ("human", "Topic: {topic}\nQuestion: {question}\nAnswer: {answer}")
+    ])
+
+
+def make_question_bank_template():
+    system_msg = """
+You write technical screening questions for interviews.
+Return ONLY a JSON object with the keys "beginner", "intermediate" and "advanced",
+each a list of {count} distinct, self-contained, conversational questions about the given technology.
+Do not include answers, numbering, or code blocks.
+"""
+    return ChatPromptTemplate.from_messages([
+        ("system", system_msg),
+        ("human", "Technology: {tech}")
     ])
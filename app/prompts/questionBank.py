@@ -0,0 +1,130 @@
+import json
+import os
+import random
+import re
+import threading
+
+from config.settings import QUESTION_BANK_DIR
+
+LEVELS = ("beginner", "intermediate", "advanced")
+
+# Spellings candidates commonly type for the same technology
+ALIASES = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "nodejs": "node",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "postgres": "postgresql",
+    "ml": "machine learning",
+}
+
+
+def normalize_tech(name: str) -> str:
+    """Map a free-text technology name to its question bank key."""
+    key = re.sub(r"[^a-z0-9+#]+", " ", name.lower()).strip()
+    if key.endswith(" js"):
+        # "React.js", "react js" and "ReactJS" share one key
+        key = key[:-3] + "js"
+    return ALIASES.get(key, key)
+
+
+class QuestionBank:
+    """
+    Pre-generated, graded questions per technology, stored as:
+    - `questions.jsonl`: one {"tech", "beginner", "intermediate", "advanced"} record per line
+    - `index.json`: {tech: [byte offset, length]} into the JSONL file
+    The index is read on first use and each record only when its technology is asked for.
+    """
+
+    def __init__(self, directory: str = QUESTION_BANK_DIR):
+        self.directory = directory
+        self._index: dict[str, list[int]] | None = None
+        self._records: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> dict[str, list[int]]:
+        if self._index is None:
+            try:
+                with open(os.path.join(self.directory, "index.json"), encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = {}
+        return self._index
+
+    def __contains__(self, tech: str) -> bool:
+        return normalize_tech(tech) in self.index
+
+    def questions(self, tech: str) -> dict | None:
+        key = normalize_tech(tech)
+        if key not in self.index:
+            return None
+        with self._lock:
+            if key not in self._records:
+                offset, length = self.index[key]
+                with open(os.path.join(self.directory, "questions.jsonl"), "rb") as f:
+                    f.seek(offset)
+                    self._records[key] = json.loads(f.read(length))
+            return self._records[key]
+
+    def pick(self, tech: str, levels=LEVELS, exclude=(), rng=random) -> str | None:
+        """Return a random unasked question for `tech` from the first level that has one."""
+        record = self.questions(tech)
+        if record is None:
+            return None
+        for level in levels:
+            options = [q for q in record.get(level, []) if q not in exclude]
+            if options:
+                return rng.choice(options)
+        return None
+
+    def opening_question(self, tech: str, exclude=(), rng=random) -> str | None:
+        return self.pick(tech, ("beginner", "intermediate"), exclude, rng)
+
+    def simplified_question(self, tech: str, exclude=(), rng=random) -> str | None:
+        return self.pick(tech, ("beginner",), exclude, rng)
+
+
+def write_bank(directory: str, records: list[dict]) -> None:
+    """Write records as JSONL plus the offset index that `QuestionBank` reads."""
+    os.makedirs(directory, exist_ok=True)
+    index = {}
+    with open(os.path.join(directory, "questions.jsonl"), "wb") as f:
+        for record in sorted(records, key=lambda r: r["tech"]):
+            line = json.dumps(record, ensure_ascii=False).encode("utf-8")
+            index[record["tech"]] = [f.tell(), len(line)]
+            f.write(line + b"\n")
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+
+def append_record(directory: str, record: dict) -> None:
+    """
+    Add (or replace) one technology in an existing bank:
+    - The record is appended to `questions.jsonl`, so offsets already in the index stay valid
+    - `index.json` is then swapped in atomically; an interrupted build leaves the previous bank readable
+    A replaced record's old line stays in the file until the next `write_bank`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    index_path = os.path.join(directory, "index.json")
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        index = {}
+    line = json.dumps(record, ensure_ascii=False).encode("utf-8")
+    with open(os.path.join(directory, "questions.jsonl"), "ab") as f:
+        index[record["tech"]] = [f.tell(), len(line)]
+        f.write(line + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(index_path + ".tmp", index_path)
+
+
+question_bank = QuestionBank()
@@ -0,0 +1,176 @@
+"""
+ASGI front-end serving the interview over WebSocket.
+
+Runs the same turn flow (`chains.TurnDriver`), chains and session memory as
+`ui.py`, without Streamlit's rerun-per-interaction model. Replies stream token
+by token.
+
+Protocol on `/ws` (optionally `/ws?session_id=...` to resume):
+- server -> client: {"type": "session", "session_id"}, then {"type": "message", "content"} for bot
+  messages, {"type": "error", "content"} for validation errors, {"type": "token", "content"} deltas
+  followed by {"type": "reply", "content"} for LLM replies, {"type": "busy", "content"} when a request
+  is refused (resend the answer), and {"type": "ready"} once the server waits for the next answer
+- client -> server: the answer as plain text, or {"type": "answer", "content"}
+
+Run from the `app/` directory:
+    uvicorn server:app --port 8000
+    HISTORY_BACKEND=sqlite uvicorn server:app --port 8000 --workers 4
+With more than one worker, use the SQLite backend so a reconnecting candidate can resume on any worker.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from chains.ChatChain import executor, start_metrics_exporters
+from chains.InterviewSession import InterviewSession, InterviewState
+from chains.QuestionPrefetcher import prefetcher
+from chains.TurnDriver import TurnDriver
+from config.settings import MODEL_RESOURCES, router
+from memory.sessionMemory import new_session_id, release_session_history
+from memory.sessionState import make_state_store
+from memory.transcript import Role, Transcript
+from utils.metrics import render_prometheus
+from utils.resources import registry
+from utils.structuredLogging import setup_logging
+
+setup_logging()
+logger = logging.getLogger("talentscout.server")
+# Metrics are served on /metrics below; only the optional JSON dump runs in the background
+start_metrics_exporters(serve=False)
+
+BUSY_MESSAGE = "We're handling a lot of interviews right now. Please send your answer again in a moment."
+
+state_store = make_state_store()
+# Topics missing from the question bank get their opening question generated in the background
+driver = TurnDriver(InterviewSession(prefetched=prefetcher.get))
+
+
+class SocketView:
+    """Sends a turn to the client: replies as token deltas followed by the full text."""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.sent = 0
+
+    async def error(self, text: str) -> None:
+        await self.websocket.send_json({"type": "error", "content": text})
+
+    async def message(self, text: str) -> None:
+        await self.websocket.send_json({"type": "message", "content": text})
+
+    async def token(self, text: str) -> None:
+        await self.websocket.send_json({"type": "token", "content": text[self.sent:]})
+        self.sent = len(text)
+
+    async def reply(self, text: str) -> None:
+        await self.websocket.send_json({"type": "reply", "content": text})
+        self.sent = 0
+
+    async def refused(self) -> None:
+        self.sent = 0
+        await self.websocket.send_json({"type": "busy", "content": BUSY_MESSAGE})
+
+
+async def interview_socket(websocket: WebSocket) -> None:
+    await websocket.accept()
+    session_id = websocket.query_params.get("session_id")
+    saved = await asyncio.to_thread(state_store.get, session_id) if session_id else None
+    # What this connection showed the candidate; a resumed session starts from its pending question
+    transcript = Transcript()
+    view = SocketView(websocket)
+    if saved is not None:
+        state = InterviewState.from_dict(saved)
+        await websocket.send_json({"type": "session", "session_id": state.session_id})
+        if state.last_question:
+            transcript.append(Role.ASSISTANT, state.last_question)
+            await websocket.send_json({"type": "message", "content": state.last_question})
+    else:
+        state, first_turn = driver.interview.start(new_session_id())
+        await websocket.send_json({"type": "session", "session_id": state.session_id})
+        for text in first_turn.messages:
+            transcript.append(Role.ASSISTANT, text)
+            await websocket.send_json({"type": "message", "content": text})
+    logger.info("Session connected: %s", state.session_id, extra={"event": "session_start"})
+
+    try:
+        while True:
+            await websocket.send_json({"type": "ready"})
+            raw = await websocket.receive_text()
+            try:
+                message = json.loads(raw)
+                user_input = message.get("content", "") if isinstance(message, dict) else raw
+            except json.JSONDecodeError:
+                user_input = raw
+            if not str(user_input).strip():
+                continue
+            state, _ = await driver.aanswer(state, str(user_input), transcript, view)
+            await asyncio.to_thread(state_store.put, state.session_id, state.to_dict())
+    except WebSocketDisconnect:
+        logger.info("Session disconnected: %s", state.session_id, extra={"event": "session_end"})
+    finally:
+        prefetcher.discard(state.session_id)
+        await asyncio.to_thread(release_session_history, state.session_id)
+
+
+async def metrics(request) -> PlainTextResponse:
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+async def health(request) -> JSONResponse:
+    return JSONResponse({
+        "status": "ok", "executor": executor.stats(), "llm": executor.pool.stats(), "backends": router.health.snapshot()
+    })
+
+
+_CLIENT_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>TalentScout Hiring Bot</title>
+<style>
+body { font-family: sans-serif; max-width: 720px; margin: 2em auto; }
+.bot, .user { padding: 10px; border-radius: 10px; margin: 5px 0; max-width: 70%; white-space: pre-wrap; }
+.bot { background: #f0f2f6; } .user { background: #d1e7dd; margin-left: auto; } .error { color: #b00020; }
+</style></head>
+<body><h1>🧠 TalentScout Hiring Bot</h1><div id="log"></div>
+<form id="form"><input id="answer" autocomplete="off" style="width: 80%" placeholder="Your answer..."><button>Send</button></form>
+<script>
+const log = document.getElementById("log"), form = document.getElementById("form"), answer = document.getElementById("answer");
+const params = new URLSearchParams({session_id: sessionStorage.getItem("session_id") || ""});
+const ws = new WebSocket(`${location.protocol === "https:" ? "wss" : "ws"}://${location.host}/ws?${params}`);
+let streaming = null;
+function add(cls, text) { const div = document.createElement("div"); div.className = cls; div.textContent = text; log.appendChild(div); return div; }
+ws.onmessage = (event) => {
+  const msg = JSON.parse(event.data);
+  if (msg.type === "session") sessionStorage.setItem("session_id", msg.session_id);
+  else if (msg.type === "message") add("bot", msg.content);
+  else if (msg.type === "error" || msg.type === "busy") add("error", msg.content);
+  else if (msg.type === "token") { streaming = streaming || add("bot", ""); streaming.textContent += msg.content; }
+  else if (msg.type === "reply") { (streaming || add("bot", "")).textContent = msg.content; streaming = null; }
+};
+form.onsubmit = (event) => { event.preventDefault(); if (!answer.value.trim()) return; add("user", answer.value); ws.send(answer.value); answer.value = ""; };
+</script></body></html>
+"""
+
+
+async def client_page(request) -> HTMLResponse:
+    return HTMLResponse(_CLIENT_PAGE)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # The model client loads while the worker already accepts connections
+    registry.warm(["tokenizer", *MODEL_RESOURCES.values()])
+    yield
+    registry.close()
+
+
+app = Starlette(routes=[
+    Route("/", client_page),
+    Route("/health", health),
+    Route("/metrics", metrics),
+    WebSocketRoute("/ws", interview_socket),
+], lifespan=lifespan)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the app modules the way ui.py does, from the `app/` directory; no Groq call is made
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "offline-tests")
+os.environ.setdefault("TRANSCRIPT_EXPORT_PATH", "")
@@ -0,0 +1,45 @@
+"""`AnswerEvaluator` records, with the scoring chain replaced."""
+from langchain_core.runnables import RunnableLambda
+
+from chains.AnswerEvaluator import AnswerEvaluator
+
+
+def _evaluator() -> AnswerEvaluator:
+    def score(inputs: dict) -> dict:
+        return {"relevance": 4, "correctness": 9, "completeness": "3", "note": inputs["answer"]}
+
+    return AnswerEvaluator(chain=RunnableLambda(score))
+
+
+def test_records_are_clamped_and_grouped_by_topic():
+    evaluator = _evaluator()
+    evaluator.submit("s1", "Python", "What is a tuple?", "An immutable sequence.")
+    evaluator.submit("s1", "Go", "What is a goroutine?", "A lightweight thread.")
+
+    records = evaluator.records("s1", wait_pending=True)
+
+    assert list(records) == ["Python", "Go"]
+    assert records["Python"] == [{
+        "topic": "Python", "question": "What is a tuple?",
+        "relevance": 4, "correctness": 5, "completeness": 3, "note": "An immutable sequence.",
+    }]
+
+
+def test_resent_answer_replaces_a_settled_record():
+    evaluator = _evaluator()
+    evaluator.submit("s1", "Python", "What is a tuple?", "first try")
+    # The scored summary settles every record before its request is made (and then refused)
+    assert "first try" in evaluator.report("s1")
+
+    evaluator.submit("s1", "Python", "What is a tuple?", "resent")
+    records = evaluator.records("s1", wait_pending=True)
+
+    assert [record["note"] for record in records["Python"]] == ["resent"]
+
+
+def test_discard_drops_the_session():
+    evaluator = _evaluator()
+    evaluator.submit("s1", "Python", "What is a tuple?", "An immutable sequence.")
+    evaluator.discard("s1")
+
+    assert evaluator.records("s1", wait_pending=True) == {}
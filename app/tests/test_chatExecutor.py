@@ -0,0 +1,109 @@
+"""`ChatExecutor` calls on a shared `ExecutorPool`: queue limit, timeouts, lanes and per-executor caps."""
+import asyncio
+import threading
+import time
+
+import pytest
+from langchain_core.runnables import RunnableGenerator, RunnableLambda
+
+from chains.ChatExecutor import ChatExecutor, ExecutorBusy, ExecutorPool
+
+
+class Backend:
+    """A runnable body that records call order and holds every call until `gate` is set."""
+
+    def __init__(self, seconds: float = 0.0):
+        self.seconds = seconds
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = []
+
+    async def __call__(self, name):
+        self.started.append(name)
+        while not self.gate.is_set():
+            await asyncio.sleep(0.005)
+        await asyncio.sleep(self.seconds)
+        return name
+
+
+def _lane(lane: str) -> dict:
+    return {"metadata": {"priority": lane}}
+
+
+def test_full_queue_refuses_new_calls():
+    backend = Backend()
+    backend.gate.clear()
+    executor = ChatExecutor(RunnableLambda(backend), pool=ExecutorPool(max_in_flight=1, max_queue=1))
+
+    running, waiting = executor.submit("running"), executor.submit("waiting")
+    with pytest.raises(ExecutorBusy):
+        executor.submit("refused")
+
+    backend.gate.set()
+    assert (running.result(), waiting.result()) == ("running", "waiting")
+    assert executor.pool.stats() == {"in_flight": 0, "queued": 0}
+
+
+def test_timeout_counts_the_wait_for_a_slot():
+    backend = Backend(seconds=0.2)
+    executor = ChatExecutor(RunnableLambda(backend), pool=ExecutorPool(max_in_flight=1, max_queue=5), timeout=0.3)
+
+    futures = [executor.submit(i) for i in range(3)]
+
+    assert futures[0].result() == 0
+    for future in futures[1:]:
+        with pytest.raises(TimeoutError):
+            future.result()
+    # The last call never got a slot: it timed out in the queue
+    assert backend.started == [0, 1]
+    assert executor.pool.stats() == {"in_flight": 0, "queued": 0}
+
+
+def test_freed_slot_goes_to_the_most_urgent_lane():
+    backend = Backend()
+    backend.gate.clear()
+    executor = ChatExecutor(RunnableLambda(backend), pool=ExecutorPool(max_in_flight=1, max_queue=10))
+
+    futures = [executor.submit("blocker", _lane("followup"))]
+    futures += [executor.submit(lane, _lane(lane)) for lane in ("prefetch", "followup", "summary", "scoring")]
+    backend.gate.set()
+    for future in futures:
+        future.result()
+
+    assert backend.started == ["blocker", "summary", "followup", "scoring", "prefetch"]
+
+
+def test_executor_cap_leaves_the_pool_to_other_executors():
+    backend = Backend()
+    backend.gate.clear()
+    pool = ExecutorPool(max_in_flight=2, max_queue=10)
+    chat = ChatExecutor(RunnableLambda(backend), pool=pool)
+    prefetch = ChatExecutor(RunnableLambda(backend), max_in_flight=1, pool=pool)
+
+    futures = [prefetch.submit(f"prefetch {i}", _lane("prefetch")) for i in range(2)]
+    futures.append(chat.submit("followup", _lane("followup")))
+    for _ in range(100):
+        if len(backend.started) == 2:
+            break
+        time.sleep(0.01)
+
+    # The second prefetch waits for its executor's slot although the pool has room
+    assert backend.started == ["prefetch 0", "followup"]
+    assert prefetch.stats() == {"in_flight": 1, "queued": 1}
+    backend.gate.set()
+    for future in futures:
+        future.result()
+    assert backend.started[-1] == "prefetch 1"
+
+
+async def _words(texts):
+    async for text in texts:
+        for word in text.split():
+            yield word
+
+
+def test_stream_yields_chunks_on_the_caller_thread():
+    executor = ChatExecutor(RunnableGenerator(_words), pool=ExecutorPool(max_in_flight=1, max_queue=1))
+
+    assert list(executor.stream("lazy generator chunks")) == ["lazy", "generator", "chunks"]
+    assert executor.pool.stats() == {"in_flight": 0, "queued": 0}
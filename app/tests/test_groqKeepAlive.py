@@ -0,0 +1,29 @@
+"""Pooled Groq connections are reused across executors (`benchmarks.fakeGroqServer` with keep-alive)."""
+import pytest
+
+from benchmarks import fakeGroqServer
+from chains.ChatExecutor import ChatExecutor
+from config import settings
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = fakeGroqServer.start(rpm=1000, latency=0.01)
+    monkeypatch.setenv("GROQ_API_BASE", server.url)
+    yield server
+    server.shutdown()
+
+
+def test_executors_share_keep_alive_connections(server):
+    # The real client: shared sync and async HTTP pools from the registry
+    model = settings._chat_model("groq", "test-model")
+    chat, scoring = ChatExecutor(model), ChatExecutor(model, max_in_flight=2)
+
+    for _ in range(3):
+        for executor in (chat, scoring):
+            assert "".join(chunk.content for chunk in executor.stream("Explain generators.")).strip()
+            assert executor.invoke("Explain generators.").content
+
+    assert server.served == 12
+    # Every call, from either executor, went over the one pooled connection
+    assert server.connections == 1
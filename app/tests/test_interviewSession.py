@@ -0,0 +1,125 @@
+"""`InterviewSession` phase and topic transitions, with a fixed question bank."""
+import pytest
+
+from chains.InterviewSession import (
+    CLOSED_MESSAGE, COLLECTING, FINISHED, GREETING, INTERVIEW, InterviewSession, InterviewState
+)
+from prompts.questionBank import normalize_tech
+
+PROFILE = ["Ada Lovelace", "ada@example.com", "9876543210", "3", "Backend", "Pune"]
+
+
+class Bank:
+    """Two questions per level for the technologies it knows."""
+
+    def __init__(self, techs=("python", "go")):
+        self.techs = set(techs)
+
+    def __contains__(self, tech):
+        return normalize_tech(tech) in self.techs
+
+    def _pick(self, tech, level, exclude, rng):
+        if tech not in self:
+            return None
+        options = [q for q in (f"{tech} {level} 1", f"{tech} {level} 2") if q not in exclude]
+        return rng.choice(options) if options else None
+
+    def opening_question(self, tech, exclude=(), rng=None):
+        return self._pick(tech, "opening", exclude, rng)
+
+    def simplified_question(self, tech, exclude=(), rng=None):
+        return self._pick(tech, "beginner", exclude, rng)
+
+
+def _run(session, state, text, reply="What else?"):
+    new_state, turn = session.advance(state, text)
+    return session.on_reply(new_state, turn, reply if turn.request else None), turn
+
+
+def _collected(session, stack="Python, Go"):
+    state, _ = session.start("s1", seed=7)
+    for text in PROFILE:
+        state, turn = _run(session, state, text)
+    return _run(session, state, stack)
+
+
+def test_profile_is_collected_before_the_interview():
+    session = InterviewSession(bank=Bank())
+    state, first = session.start("s1", seed=7)
+    assert state.phase == COLLECTING and first.messages
+
+    state, _ = _run(session, state, "Ada Lovelace")
+    state, turn = _run(session, state, "ada at example")
+    assert turn.errors and not turn.messages
+    assert state.phase == COLLECTING and state.profile["Email Address"] is None
+
+    state, turn = _collected(session)
+    assert state.phase == INTERVIEW
+    assert state.tech_stack == ["Python", "Go"]
+    # The opening question comes from the bank; nothing is asked of the LLM
+    assert turn.messages == [GREETING] and turn.request is None
+    assert state.last_question == turn.posts[0] and state.asked_questions == turn.posts
+
+
+def test_advance_leaves_the_given_state_alone():
+    session = InterviewSession(bank=Bank())
+    state, _ = _collected(session)
+    before = state.to_dict()
+
+    session.advance(state, "Tuples are immutable.")
+
+    assert state.to_dict() == before
+
+
+def test_topics_switch_after_their_threshold_and_the_last_one_finishes():
+    session = InterviewSession(bank=Bank())
+    state, _ = _collected(session)
+    lanes = []
+    while state.phase == INTERVIEW:
+        topic = state.topic
+        state, turn = _run(session, state, "An answer.")
+        assert turn.evaluate[0] == topic
+        lanes.append(turn.request.lane)
+        if turn.request.lane == "topic_switch":
+            assert turn.compact_topic == "Python"
+            assert state.topic == "Go" and state.last_question == turn.posts[0]
+
+    assert lanes.count("topic_switch") == 1
+    assert lanes[-1] == "summary" and turn.request.scored
+    assert state.phase == FINISHED
+    assert session.advance(state, "hello?")[1].messages == [CLOSED_MESSAGE]
+
+
+def test_exit_word_ends_the_interview_with_a_scored_summary():
+    session = InterviewSession(bank=Bank())
+    state, _ = _collected(session)
+
+    state, turn = session.advance(state, "  Quit ")
+
+    assert state.phase == FINISHED
+    assert (turn.request.lane, turn.request.scored) == ("summary", True)
+
+
+def test_unknown_topic_asks_the_llm_and_prefetches_later_ones():
+    session = InterviewSession(bank=Bank(techs=()), prefetched=lambda session_id, topic: None)
+
+    state, turn = _collected(session, stack="Rust, Elixir")
+
+    assert turn.request.lane == "topic_switch"
+    assert turn.request.cache_key[0] == "Rust"
+    assert turn.prefetch == ["Elixir"]
+    assert state.asked_questions == ["What else?"]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_same_seed_replays_the_same_interview(seed):
+    session = InterviewSession(bank=Bank())
+
+    def replay():
+        state, _ = session.start("s1", seed=seed)
+        for text in PROFILE + ["Python, Go", "answer", "answer", "answer"]:
+            state, _ = _run(session, state, text)
+        return state.to_dict()
+
+    assert replay() == replay()
+    assert InterviewState.from_dict(replay()).to_dict() == replay()
@@ -0,0 +1,71 @@
+"""`ModelRouter` failover, and 429s left to `RateLimitedChatModel`."""
+from typing import Any
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from utils.modelRouter import HealthTracker, ModelRouter
+from utils.rateLimiter import RateLimitedChatModel, RateLimitScheduler
+from utils.resources import ResourceRegistry
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class Backend(BaseChatModel):
+    reply: str
+    errors: list = []
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "test-backend"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        self.calls += 1
+        if self.errors:
+            raise ProviderError(self.errors.pop(0))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(self.reply))])
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    primary, fallback = Backend(reply="primary"), Backend(reply="fallback")
+    registry = ResourceRegistry()
+    registry.register("test:primary", lambda: primary)
+    registry.register("test:fallback", lambda: fallback)
+    monkeypatch.setattr("utils.modelRouter.registry", registry)
+    return primary, fallback
+
+
+def _router() -> ModelRouter:
+    return ModelRouter(
+        backends={"primary": "test:primary", "fallback": "test:fallback"},
+        routes={"followup": ["primary", "fallback"]},
+        health=HealthTracker(slow_seconds=5.0, failure_threshold=1),
+    )
+
+
+def test_server_error_fails_over(backends):
+    primary, fallback = backends
+    primary.errors = [503]
+    router = _router()
+
+    assert router.invoke([HumanMessage("hi")]).content == "fallback"
+    assert router.health.snapshot()["primary"]["available"] is False
+
+
+def test_rate_limit_is_retried_on_the_same_backend(backends):
+    primary, fallback = backends
+    primary.errors = [429, 429]
+    router = _router()
+    llm = RateLimitedChatModel(model=router, scheduler=RateLimitScheduler(6000, 1e6), base_delay=0.001)
+
+    assert llm.invoke([HumanMessage("hi")]).content == "primary"
+    assert (primary.calls, fallback.calls) == (3, 0)
+    assert router.health.snapshot()["primary"]["failures"] == 0
@@ -0,0 +1,69 @@
+"""Randomized property checks for the profile validators and `ProfileEngine` (fixed seed)."""
+import random
+import string
+
+import pytest
+
+from utils.detailsValidation import validate_email, validate_experience, validate_name, validate_phone
+from utils.profileFields import profile_engine
+
+_WORD = string.ascii_letters
+CASES = 500
+
+
+def _word(rng: random.Random, low: int = 2, high: int = 10) -> str:
+    return "".join(rng.choice(_WORD) for _ in range(rng.randint(low, high)))
+
+
+def _email(rng: random.Random) -> str:
+    return f"{_word(rng)}.{_word(rng, 1, 5)}@{_word(rng)}.{rng.choice(['com', 'io', 'in', 'co'])}"
+
+
+def _phone(rng: random.Random) -> str:
+    return "".join(rng.choice(string.digits) for _ in range(rng.randint(10, 15)))
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    return random.Random(7)
+
+
+def test_validators(rng):
+    for _ in range(CASES):
+        name = " ".join(_word(rng) for _ in range(rng.randint(1, 3)))
+        email, phone, years = _email(rng), _phone(rng), rng.randint(0, 40)
+
+        assert validate_name(name), name
+        assert not validate_name(name + str(rng.randint(0, 9))), name
+        assert validate_email(email), email
+        assert not validate_email(email.replace("@", "")), email
+        assert validate_phone(phone), phone
+        assert not validate_phone(phone[:9]), phone
+        assert not validate_phone(phone + "x"), phone
+        assert validate_experience(years) and not validate_experience(-years - 1)
+
+
+def test_engine_accepts_details_in_any_order(rng):
+    empty = {name: None for name in profile_engine.field_names}
+    for _ in range(CASES):
+        name = " ".join(_word(rng) for _ in range(rng.randint(1, 3)))
+        email, phone, years = _email(rng), _phone(rng), rng.randint(0, 40)
+        details = [name, email.upper(), phone, f"{years} years"]
+        rng.shuffle(details)
+
+        accepted, errors = profile_engine.consume(dict(empty), ", ".join(details))
+
+        assert not errors, (details, errors)
+        assert accepted["Email Address"] == email.lower(), (details, accepted)
+        assert accepted["Phone Number"] == phone, (details, accepted)
+        assert accepted["Years of Experience"] == years, (details, accepted)
+
+
+def test_full_profile_in_one_message():
+    empty = {name: None for name in profile_engine.field_names}
+    message = "Jane Doe, jane.doe@example.com, +91 98765-43210, 4 years, Backend Engineer, Pune, Python, React, SQL"
+
+    accepted, errors = profile_engine.consume(empty, message)
+
+    assert not errors
+    assert set(accepted) == set(profile_engine.field_names)
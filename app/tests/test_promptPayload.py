@@ -0,0 +1,28 @@
+"""The exact messages the chat chain sends per turn (see benchmarks.promptPayloadBench)."""
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from benchmarks.promptPayloadBench import simulate
+from utils.trimmer import trim_history
+
+
+def test_prompts_follow_the_interview():
+    # simulate() asserts every prompt: system, stored history ending on the question, answer, instruction
+    result = simulate(turns=12, switch_every=4)
+
+    assert result["new_tokens"] < result["legacy_tokens"] / 2
+    # Opening question, an answer + reply per turn, and the questions posted at the two topic switches
+    assert result["stored"] == 1 + 2 * 12 + 3
+
+
+def test_trimmer_keeps_a_leading_question():
+    history = [SystemMessage("summary"), AIMessage("What is a generator?")]
+
+    assert trim_history(history) == history
+
+
+def test_trimmer_cut_opens_on_an_answer_and_keeps_the_newest_question():
+    old = HumanMessage(" ".join(f"word{i}" for i in range(6000)))
+    history = [old, AIMessage("feedback"), HumanMessage("answer"), AIMessage("feedback"), AIMessage("next question")]
+
+    assert trim_history(history, max_tokens=50) == history[2:]
+    assert trim_history(history[:2] + history[3:], max_tokens=50) == history[4:]
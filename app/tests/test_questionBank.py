@@ -0,0 +1,41 @@
+"""Question bank records saved one technology at a time (`append_record`)."""
+import json
+import os
+
+import pytest
+
+from prompts.questionBank import QuestionBank, append_record, write_bank
+
+
+def _record(tech: str, question: str) -> dict:
+    return {"tech": tech, "beginner": [question], "intermediate": [], "advanced": []}
+
+
+def test_appended_records_are_readable_with_earlier_ones(tmp_path):
+    directory = str(tmp_path)
+    write_bank(directory, [_record("python", "What is a list?")])
+    append_record(directory, _record("go", "What is a goroutine?"))
+    append_record(directory, _record("python", "What is a tuple?"))
+
+    bank = QuestionBank(directory)
+    assert sorted(bank.index) == ["go", "python"]
+    assert bank.questions("golang")["beginner"] == ["What is a goroutine?"]
+    assert bank.questions("Python")["beginner"] == ["What is a tuple?"]
+
+
+def test_interrupted_save_keeps_the_previous_bank(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    append_record(directory, _record("python", "What is a list?"))
+
+    def crash(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        append_record(directory, _record("go", "What is a goroutine?"))
+
+    bank = QuestionBank(directory)
+    assert list(bank.index) == ["python"]
+    assert bank.questions("python")["beginner"] == ["What is a list?"]
+    with open(tmp_path / "index.json", encoding="utf-8") as f:
+        assert json.load(f) == bank.index
@@ -0,0 +1,42 @@
+"""`QuestionPrefetcher` generates next-topic questions under their own prompt and cache key."""
+import concurrent.futures
+
+from langchain_core.runnables import RunnableLambda
+
+from chains.QuestionPrefetcher import QuestionPrefetcher
+from chains.ResponseCache import ResponseCache
+from prompts.interviewPrompt import NEXT_TOPIC_QUESTION_PROMPT, OPENING_QUESTION_PROMPT
+
+
+def _prefetcher(instructions: list) -> tuple[QuestionPrefetcher, ResponseCache]:
+    def generate(inputs: dict) -> str:
+        instructions.append(inputs["instruction"])
+        return f"question {len(instructions)}"
+
+    cache = ResponseCache()
+    return QuestionPrefetcher(chain=RunnableLambda(generate), cache=cache), cache
+
+
+def test_prefetch_uses_next_topic_prompt_and_key():
+    instructions = []
+    prefetcher, cache = _prefetcher(instructions)
+    # An opening question cached for the topic must not be served after a topic switch
+    cache.put("Elixir", OPENING_QUESTION_PROMPT, "Welcome! Let's start the interview with Elixir.")
+
+    prefetcher.start("s1", ["Elixir"])
+    concurrent.futures.wait(prefetcher._pending["s1"].values())
+
+    assert instructions == [NEXT_TOPIC_QUESTION_PROMPT.format(topic="Elixir")]
+    assert prefetcher.get("s1", "Elixir") == "question 1"
+    assert cache.get("Elixir", NEXT_TOPIC_QUESTION_PROMPT) == "question 1"
+
+
+def test_prefetched_question_is_shared_between_sessions():
+    instructions = []
+    prefetcher, _ = _prefetcher(instructions)
+    prefetcher.start("s1", ["Elixir"])
+    concurrent.futures.wait(prefetcher._pending["s1"].values())
+
+    prefetcher.start("s2", ["Elixir"])
+    assert len(instructions) == 1
+    assert prefetcher.get("s2", "Elixir") == "question 1"
@@ -0,0 +1,87 @@
+"""`TokenBucket` refills, `RateLimitScheduler` lane order and which provider errors are retried."""
+import threading
+import time
+
+import pytest
+
+from utils.rateLimiter import RateLimitScheduler, TokenBucket, retryable
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APIConnectionError(Exception):
+    """Named like `groq.APIConnectionError`, which carries no status code."""
+
+
+def test_bucket_refills_at_its_per_minute_rate():
+    bucket = TokenBucket(per_minute=60)
+    now = bucket.updated
+
+    assert bucket.wait_time(60, now) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 0.5) == pytest.approx(0.5)
+    # Larger than the bucket: wait for a full one instead of forever
+    assert bucket.wait_time(600, now + 0.5) == pytest.approx(59.5)
+
+
+def test_usage_beyond_the_estimate_is_paid_back():
+    scheduler = RateLimitScheduler(requests_per_minute=60, tokens_per_minute=600)
+    now = scheduler.tokens.updated
+    scheduler.tokens.take(500)
+    scheduler.reconcile(estimated=500, actual=700)
+
+    assert scheduler.tokens.level == pytest.approx(-100, abs=1)
+    assert scheduler.tokens.wait_time(100, now) == pytest.approx(20, abs=0.2)
+
+
+def test_waiting_requests_are_admitted_by_lane_then_arrival():
+    # Empty for the next second, so every request queues before the first is admitted
+    scheduler = RateLimitScheduler(requests_per_minute=60, tokens_per_minute=1e6)
+    scheduler.requests.level = 0
+    admitted = []
+
+    def request(name, lane):
+        scheduler.acquire(10, lane)
+        admitted.append(name)
+
+    threads = []
+    for name, lane in [("prefetch", "prefetch"), ("followup 1", "followup"), ("summary", "summary"),
+                       ("followup 2", "followup"), ("scoring", "scoring")]:
+        threads.append(threading.Thread(target=request, args=(name, lane)))
+        threads[-1].start()
+        while len(scheduler._waiting) < len(threads):
+            time.sleep(0.001)
+    with scheduler._lock:
+        scheduler.requests.level = scheduler.requests.capacity
+    for thread in threads:
+        thread.join()
+
+    assert admitted == ["summary", "followup 1", "followup 2", "scoring", "prefetch"]
+
+
+def test_retry_after_pauses_every_lane():
+    scheduler = RateLimitScheduler(requests_per_minute=6000, tokens_per_minute=1e6)
+    scheduler.pause(0.2)
+    start = time.monotonic()
+
+    scheduler.acquire(10, "summary")
+
+    assert time.monotonic() - start >= 0.19
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (ProviderError(429), True),
+    (ProviderError(503), True),
+    (APIConnectionError("connection reset"), True),
+    (ConnectionResetError(), True),
+    (TimeoutError(), True),
+    (ProviderError(400), False),
+    (ValueError("bad prompt"), False),
+])
+def test_retryable(exc, expected):
+    assert retryable(exc) is expected
@@ -0,0 +1,69 @@
+"""`ResponseCache` tiers, expiry and the exported hit counters."""
+import pytest
+
+from chains.ResponseCache import ResponseCache
+from utils.metrics import counters
+
+TEMPLATE = "Ask an introductory question about {topic}."
+OTHER_TEMPLATE = "Wrap up {topic} and move on."
+
+# Stand-in embeddings: topics in the same family point the same way
+_FAMILIES = {"react": (1.0, 0.0), "reactjs": (0.99, 0.14), "python": (0.0, 1.0)}
+
+
+def _embed(text: str) -> list[float]:
+    return list(_FAMILIES[text])
+
+
+@pytest.fixture
+def cache() -> ResponseCache:
+    return ResponseCache(max_entries=2, ttl_seconds=60, embed=_embed, threshold=0.9)
+
+
+def _counted(name: str) -> float:
+    return counters().get(name, 0)
+
+
+def test_exact_tier_normalizes_topic_and_template(cache):
+    cache.put("React", TEMPLATE, "What is JSX?")
+
+    assert cache.get("  react ", TEMPLATE) == "What is JSX?"
+    assert cache.get("React", OTHER_TEMPLATE) is None
+
+
+def test_semantic_tier_matches_the_topic_only(cache):
+    cache.put("React", TEMPLATE, "What is JSX?")
+
+    assert cache.get("ReactJS", TEMPLATE) == "What is JSX?"
+    assert cache.get("Python", TEMPLATE) is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_entries_expire_and_are_evicted_lru():
+    cache = ResponseCache(max_entries=2, ttl_seconds=0)
+    cache.put("React", TEMPLATE, "What is JSX?")
+    assert cache.get("React", TEMPLATE) is None
+
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.put("React", TEMPLATE, "a")
+    cache.put("Python", TEMPLATE, "b")
+    cache.get("React", TEMPLATE)
+    cache.put("ReactJS", TEMPLATE, "c")
+    assert cache.get("Python", TEMPLATE) is None
+    assert cache.get("React", TEMPLATE) == "a"
+
+
+def test_tiers_are_exported_and_peek_is_not_counted(cache):
+    lookups, exact, semantic = (_counted(f"response_cache_{name}") for name in
+                                ("lookups_total", "exact_hits_total", "semantic_hits_total"))
+    cache.put("React", TEMPLATE, "What is JSX?")
+
+    assert cache.peek("ReactJS", TEMPLATE) == "What is JSX?"
+    cache.get("React", TEMPLATE)
+    cache.get("ReactJS", TEMPLATE)
+    cache.get("Python", TEMPLATE)
+
+    assert _counted("response_cache_lookups_total") - lookups == 3
+    assert _counted("response_cache_exact_hits_total") - exact == 1
+    assert _counted("response_cache_semantic_hits_total") - semantic == 1
+    assert cache.stats()["lookups"] == 3
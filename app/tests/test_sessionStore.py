@@ -0,0 +1,69 @@
+"""`SessionStore` LRU eviction by session count and tokens, and TTL expiry."""
+import pytest
+from langchain_core.messages import HumanMessage
+
+import memory.sessionMemory as session_memory
+from memory.sessionMemory import SessionStore, TokenCountingHistory
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_memory.time, "monotonic", clock)
+    return clock
+
+
+def _store(**limits) -> SessionStore:
+    limits = {"max_sessions": 100, "max_tokens": 10**6, "ttl_seconds": 60, **limits}
+    return SessionStore(history_factory=lambda session_id: TokenCountingHistory(), **limits)
+
+
+def test_least_recently_used_session_is_evicted(clock):
+    store = _store(max_sessions=2)
+    first = store.get("a")
+    store.get("b")
+    assert store.get("a") is first
+    store.get("c")
+
+    assert "b" not in store
+    assert ("a" in store, "c" in store) == (True, True)
+    assert store.stats() == {
+        "sessions": 2, "tokens": 0, "hits": 1, "misses": 3, "evictions": 1, "expirations": 0,
+    }
+
+
+def test_token_budget_evicts_older_sessions_but_never_the_current_one(clock):
+    store = _store(max_tokens=100)
+    store.get("a").add_message(HumanMessage(" ".join(["word"] * 60)))
+    store.get("b").add_message(HumanMessage(" ".join(["word"] * 60)))
+
+    # The budget is checked when a session is looked up
+    store.get("b")
+    assert list(store._sessions) == ["b"]
+
+    store.get("b").add_message(HumanMessage(" ".join(["word"] * 200)))
+    store.get("b")
+    assert "b" in store
+    assert store.evictions == 1
+
+
+def test_idle_sessions_expire(clock):
+    store = _store(ttl_seconds=60)
+    stale = store.get("a")
+    clock.now += 30
+    store.get("b")
+    clock.now += 45
+
+    assert store.get("b") is not None
+    assert "a" not in store
+    assert store.expirations == 1
+    # An expired session starts over with an empty history
+    assert store.get("a") is not stale
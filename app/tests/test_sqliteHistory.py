@@ -0,0 +1,76 @@
+"""`SQLiteHistoryWriter` / `SQLiteChatMessageHistory` on a temporary database."""
+import sqlite3
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from memory.sessionMemory import compact_history
+from memory.sqliteHistory import SQLiteChatMessageHistory, SQLiteHistoryWriter
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "history.db")
+
+
+@pytest.fixture
+def writer(path):
+    writer = SQLiteHistoryWriter(path, flush_interval=0.01, retry_delay=0.01)
+    yield writer
+    writer.close()
+
+
+def _rows(path: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+
+def _exchange(count: int) -> list:
+    messages = []
+    for i in range(count):
+        messages += [AIMessage(f"question {i}"), HumanMessage(f"answer {i}")]
+    return messages
+
+
+def test_history_is_read_back_after_flush(writer, path):
+    SQLiteChatMessageHistory("s1", writer).add_messages(_exchange(3))
+    SQLiteChatMessageHistory("s2", writer).add_messages([HumanMessage("other session")])
+    assert writer.flush()
+
+    reloaded = SQLiteChatMessageHistory("s1", writer, tail_messages=4)
+    assert [m.content for m in reloaded.messages] == ["question 1", "answer 1", "question 2", "answer 2"]
+    assert writer.rows_written == 7
+
+
+def test_clear_keeps_the_log(writer, path):
+    history = SQLiteChatMessageHistory("s1", writer)
+    history.add_messages(_exchange(4))
+    history.clear()
+    history.add_messages([AIMessage("fresh start")])
+    assert writer.flush()
+
+    assert _rows(path) == 9
+    assert [m.content for m in SQLiteChatMessageHistory("s1", writer).messages] == ["fresh start"]
+
+
+def test_compaction_appends_instead_of_rewriting(writer, path):
+    history = SQLiteChatMessageHistory("s1", writer)
+    history.add_messages(_exchange(5))
+    assert compact_history(history, "Python", lambda messages, topic: "covered tuples", keep_recent=2)
+    assert writer.flush()
+
+    reloaded = SQLiteChatMessageHistory("s1", writer).messages
+    assert reloaded[0].content.endswith("covered tuples")
+    assert [m.content for m in reloaded[1:]] == ["question 4", "answer 4"]
+    # The original ten rows are still on disk, followed by the compacted history
+    assert _rows(path) == 10 + len(reloaded)
+
+
+def test_failed_batch_is_dropped_and_the_writer_keeps_going(writer, path):
+    # A row with the wrong number of columns fails on every attempt
+    writer._queue.put(("append", [("s1",)]))
+    assert writer.flush()
+
+    SQLiteChatMessageHistory("s1", writer).add_messages([HumanMessage("after the failure")])
+    assert writer.flush()
+    assert [m.content for m in SQLiteChatMessageHistory("s1", writer).messages] == ["after the failure"]
@@ -0,0 +1,71 @@
+"""`utils.tokenCounter` counts, cached per message, with the estimate used when tiktoken cannot load."""
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+import utils.tokenCounter as token_counter
+from utils.resources import ResourceRegistry
+from utils.tokenCounter import (
+    MESSAGE_OVERHEAD_TOKENS, TOKEN_COUNT_KEY, count_message_tokens, count_text_tokens, message_tokens,
+)
+
+
+class CountingEncoding:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    encoding, registry = CountingEncoding(), ResourceRegistry()
+    registry.register("tokenizer", lambda: encoding)
+    monkeypatch.setattr(token_counter, "registry", registry)
+    return encoding
+
+
+@pytest.fixture
+def estimate(monkeypatch):
+    registry = ResourceRegistry()
+    registry.register("tokenizer", lambda: None)
+    monkeypatch.setattr(token_counter, "registry", registry)
+
+
+def test_estimate_counts_words_and_punctuation(estimate):
+    assert count_text_tokens("") == 0
+    assert count_text_tokens("Tuples are immutable, lists aren't.") == 9
+
+
+def test_message_count_is_cached_on_the_message(encoding):
+    message = HumanMessage("generators yield values lazily")
+
+    assert message_tokens(message) == 4 + MESSAGE_OVERHEAD_TOKENS
+    assert message_tokens(message) == 4 + MESSAGE_OVERHEAD_TOKENS
+    assert message.additional_kwargs[TOKEN_COUNT_KEY] == 4 + MESSAGE_OVERHEAD_TOKENS
+    assert encoding.calls == 1
+
+
+def test_multi_part_content_counts_text_blocks_only(encoding):
+    message = HumanMessage([{"type": "text", "text": "two words"}, {"type": "image_url", "image_url": {"url": "x"}}])
+
+    assert message_tokens(message) == 2 + MESSAGE_OVERHEAD_TOKENS
+
+
+def test_messages_are_summed(encoding):
+    messages = [AIMessage("What is a decorator?"), HumanMessage("A function wrapping a function.")]
+
+    assert count_message_tokens(messages) == 4 + 5 + 2 * MESSAGE_OVERHEAD_TOKENS
+
+
+def test_fallback_is_logged(monkeypatch, caplog):
+    import tiktoken
+
+    def unavailable(name):
+        raise OSError("vocab download failed")
+
+    monkeypatch.setattr(tiktoken, "get_encoding", unavailable)
+
+    assert token_counter._load_encoding() is None
+    assert [r.event for r in caplog.records if r.name == "talentscout.tokens"] == ["tokenizer_fallback"]
@@ -0,0 +1,73 @@
+"""`Transcript` text shared with the session history, and finished interviews exported as compressed JSON lines."""
+import pytest
+from langchain_core.messages import AIMessage
+
+import memory.transcriptExport as transcript_export
+from chains.ChatChain import _stored_reply
+from chains.InterviewSession import InterviewState
+from memory.sessionMemory import get_session_history, new_session_id
+from memory.transcript import Role, Transcript, interview_record
+from memory.transcriptExport import TranscriptExporter, read_export
+
+
+def _config(session_id: str) -> dict:
+    return {"configurable": {"session_id": session_id}}
+
+
+def test_streamed_reply_is_the_history_string():
+    session_id = new_session_id()
+    # The chain stores the aggregated chunks; the streamed text is an equal but separate string
+    get_session_history(session_id).add_messages([AIMessage("".join(["What is ", "a generator?"]))])
+    streamed = "".join(["What is a ", "generator?"])
+    transcript = Transcript()
+
+    transcript.append(Role.ASSISTANT, _stored_reply(_config(session_id), streamed))
+
+    assert transcript[-1].content is get_session_history(session_id).messages[-1].content
+
+
+def test_reply_missing_from_the_history_is_kept():
+    session_id = new_session_id()
+    get_session_history(session_id).add_messages([AIMessage("an earlier question")])
+
+    assert _stored_reply(_config(session_id), "a reply the history never stored") == "a reply the history never stored"
+
+
+def _record(session_id: str) -> dict:
+    transcript = Transcript()
+    transcript.append(Role.ASSISTANT, "What is a generator?")
+    transcript.append(Role.USER, "A function that yields values lazily — «ñ».")
+    return interview_record(InterviewState(session_id, seed=1), transcript, {"Python": "7/10"})
+
+
+@pytest.mark.parametrize("suffix", [
+    pytest.param(".jsonl.zst", marks=pytest.mark.skipif(transcript_export.zstandard is None, reason="zstandard")),
+    ".jsonl.gz",
+])
+def test_export_reads_back_while_open_and_across_reopened_streams(tmp_path, suffix):
+    exporter = TranscriptExporter(str(tmp_path / f"interviews-{{pid}}{suffix}"))
+    exporter.export(_record("s1"))
+    exporter.export(_record("s2"))
+
+    # Flushed records are readable before the stream is closed
+    assert [r["session_id"] for r in read_export(exporter.path)] == ["s1", "s2"]
+
+    exporter.close()
+    exporter.export(_record("s3"))
+    exporter.close()
+
+    records = list(read_export(exporter.path))
+    assert [r["session_id"] for r in records] == ["s1", "s2", "s3"]
+    assert records[0]["transcript"][1] == {"role": "user", "content": "A function that yields values lazily — «ñ»."}
+    assert records[0]["scores"] == {"Python": "7/10"}
+
+
+def test_zstd_path_falls_back_to_gzip_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_export, "zstandard", None)
+
+    exporter = TranscriptExporter(str(tmp_path / "interviews.jsonl.zst"))
+    exporter.export(_record("s1"))
+    exporter.close()
+
+    assert exporter.path.endswith("interviews.jsonl.gz")
+    assert [r["session_id"] for r in read_export(exporter.path)] == ["s1"]
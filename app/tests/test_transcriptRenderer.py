@@ -0,0 +1,46 @@
+"""`render_transcript` caches HTML for the visible window only."""
+from memory.transcript import Role, Transcript
+from utils.transcriptRenderer import message_html, render_transcript
+
+
+def _transcript(count: int) -> Transcript:
+    transcript = Transcript()
+    for i in range(count):
+        transcript.append(Role.ASSISTANT if i % 2 == 0 else Role.USER, f"message {i} <b>")
+    return transcript
+
+
+def test_cache_holds_the_window_only():
+    transcript, cache = _transcript(50), {}
+    html, hidden = render_transcript(transcript, cache, window=10)
+
+    assert hidden == 40
+    assert sorted(cache) == list(range(40, 50))
+    assert html == "".join(message_html(m.role.value, m.content) for m in transcript[40:])
+    assert "&lt;b&gt;" in html
+
+    transcript.append(Role.USER, "message 50")
+    render_transcript(transcript, cache, window=10)
+    assert sorted(cache) == list(range(41, 51))
+
+
+def test_show_all_renders_earlier_messages_without_caching_them():
+    transcript, cache = _transcript(20), {}
+    html, hidden = render_transcript(transcript, cache, window=5, show_all=True)
+
+    assert hidden == 0
+    assert html == "".join(message_html(m.role.value, m.content) for m in transcript)
+    assert sorted(cache) == list(range(15, 20))
+
+
+def test_resent_message_replaces_the_dropped_one():
+    transcript, cache = _transcript(4), {}
+    render_transcript(transcript, cache, window=10)
+
+    # A refused request drops the answer; the candidate resends a different one
+    transcript.truncate(3)
+    transcript.append(Role.USER, "resent answer")
+    html, _ = render_transcript(transcript, cache, window=10)
+
+    assert html.endswith(message_html("user", "resent answer"))
+    assert "message 3" not in html
@@ -0,0 +1,116 @@
+"""`TurnDriver` turns that are not served, with the LLM calls replaced."""
+import pytest
+
+import chains.TurnDriver as turn_driver
+from chains.ChatExecutor import ExecutorBusy
+from chains.InterviewSession import INTERVIEW, InterviewSession
+from chains.TurnDriver import TurnDriver, TurnView
+from memory.transcript import Transcript
+
+PROFILE = ["Ada Lovelace", "ada@example.com", "9876543210", "3", "Backend", "Pune", "Python, Go"]
+
+
+class RateLimitError(Exception):
+    """Shaped like `groq.RateLimitError` once `RateLimitedChatModel` has used up its retries."""
+    status_code = 429
+
+
+class RecordingEvaluator:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, session_id, topic, question, answer):
+        self.submitted.append(answer)
+
+    def report(self, session_id):
+        return ""
+
+    def records(self, session_id, wait_pending=False):
+        return {}
+
+
+class NoPrefetch:
+    def start(self, session_id, topics):
+        pass
+
+
+class RecordingView(TurnView):
+    def __init__(self):
+        self.events = []
+
+    def reply(self, text):
+        self.events.append(("reply", text))
+
+    def refused(self):
+        self.events.append(("refused", None))
+
+
+@pytest.fixture
+def driver():
+    return TurnDriver(InterviewSession(), evaluator=RecordingEvaluator(), prefetcher=NoPrefetch(), exporter=None)
+
+
+def _interviewing(driver: TurnDriver):
+    state, first = driver.interview.start("test-session", seed=1)
+    transcript = Transcript()
+    for text in PROFILE:
+        state, served = driver.answer(state, text, transcript)
+        assert served
+    assert state.phase == INTERVIEW
+    return state, transcript
+
+
+def _failing(exc):
+    def stream_reply(inputs, config, on_token=None):
+        raise exc
+    return stream_reply
+
+
+@pytest.mark.parametrize("exc", [RateLimitError("rate limited"), ExecutorBusy("full"), TimeoutError()])
+def test_unserved_request_keeps_state_and_transcript(driver, monkeypatch, exc):
+    state, transcript = _interviewing(driver)
+    shown = len(transcript)
+    monkeypatch.setattr(turn_driver, "stream_reply", _failing(exc))
+    view = RecordingView()
+
+    new_state, served = driver.answer(state, "Tuples are immutable.", transcript, view)
+
+    assert not served
+    assert new_state is state
+    assert len(transcript) == shown
+    assert view.events == [("refused", None)]
+
+
+def test_other_errors_are_raised(driver, monkeypatch):
+    state, transcript = _interviewing(driver)
+    monkeypatch.setattr(turn_driver, "stream_reply", _failing(ValueError("bad prompt")))
+
+    with pytest.raises(ValueError):
+        driver.answer(state, "Tuples are immutable.", transcript)
+
+
+def test_refused_turn_is_not_scored(driver, monkeypatch):
+    state, transcript = _interviewing(driver)
+    monkeypatch.setattr(turn_driver, "stream_reply", _failing(ExecutorBusy("full")))
+
+    driver.answer(state, "Tuples are immutable.", transcript)
+
+    assert driver.evaluator.submitted == []
+
+
+def test_answer_is_scored_once_the_reply_starts(driver, monkeypatch):
+    state, transcript = _interviewing(driver)
+    scored_before_reply = []
+
+    def stream_reply(inputs, config, on_token=None):
+        scored_before_reply.append(list(driver.evaluator.submitted))
+        for text in ("Right.", "Right. Why?"):
+            on_token(text)
+        return "Right. Why?"
+
+    monkeypatch.setattr(turn_driver, "stream_reply", stream_reply)
+    state, served = driver.answer(state, "Tuples are immutable.", transcript)
+
+    assert served
+    assert scored_before_reply == [[]]
+    assert driver.evaluator.submitted == ["Tuples are immutable."]
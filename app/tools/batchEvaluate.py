@@ -0,0 +1,129 @@
+"""
+Offline re-scoring of stored interview transcripts.
+
+Runs the end-of-interview evaluation prompt over every transcript in a JSONL
+file through `trimmed_chain` with bounded concurrency, appending one result
+line per transcript to the output file as soon as it finishes. The output
+file doubles as the checkpoint: transcripts already scored with the same
+instruction are skipped, so an interrupted run resumes where it stopped.
+
+Input lines: {"id": "...", "messages": [{"role": "user" | "assistant", "content": "..."}, ...]}
+(the role/content dicts of `memory.transcript.Transcript.to_records()`). Interview exports
+written by `memory.transcriptExport` (`.jsonl.zst` / `.jsonl.gz`) are read directly.
+
+Run from the `app/` directory:
+    python -m tools.batchEvaluate transcripts.jsonl evaluations.jsonl --concurrency 8
+    python -m tools.batchEvaluate interviews-12345.jsonl.zst evaluations.jsonl
+    python -m tools.batchEvaluate transcripts.jsonl evaluations.jsonl --instruction-file rubric_v2.txt
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+from langchain_core.messages import convert_to_messages
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
+from chains.ChatChain import trimmed_chain
+from memory.transcriptExport import read_export
+from prompts.interviewPrompt import FINAL_SUMMARY_PROMPT
+from utils.metrics import Histogram
+
+evaluation_chain = trimmed_chain | StrOutputParser()
+
+
+def instruction_hash(instruction: str) -> str:
+    """Short fingerprint of the evaluation instruction, stored with each result."""
+    return hashlib.sha256(instruction.encode("utf-8")).hexdigest()[:12]
+
+
+def load_transcripts(path: str) -> list[dict]:
+    if path.endswith((".zst", ".gz")):
+        return [{"id": record["session_id"], "messages": record["transcript"]} for record in read_export(path)]
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_checkpoint(path: str, rubric: str) -> set[str]:
+    """Return the ids already evaluated with the instruction fingerprinted as `rubric`."""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if record.get("rubric") == rubric:
+                done.add(record["id"])
+    return done
+
+
+def _timed_evaluation(inputs: dict, config) -> tuple[str, float]:
+    start = time.perf_counter()
+    summary = evaluation_chain.invoke(inputs, config=config)
+    return summary, time.perf_counter() - start
+
+
+def evaluate(source: str, output: str, instruction: str, concurrency: int) -> dict:
+    rubric = instruction_hash(instruction)
+    done = load_checkpoint(output, rubric)
+    todo = [t for t in load_transcripts(source) if str(t["id"]) not in done]
+    print(f"{len(done)} already evaluated, {len(todo)} to go (rubric {rubric})")
+
+    inputs = [
+        {"history": convert_to_messages(t["messages"]), "input": [], "instruction": instruction}
+        for t in todo
+    ]
+    config = {"max_concurrency": concurrency, "metadata": {"priority": "evaluation"}}
+    latencies = Histogram(window=max(1, len(todo)))
+    failed = 0
+    start = time.perf_counter()
+    with open(output, "a", encoding="utf-8") as out:
+        timed = RunnableLambda(_timed_evaluation, name="timed_evaluation")
+        for i, result in timed.batch_as_completed(inputs, config=config, return_exceptions=True):
+            transcript_id = str(todo[i]["id"])
+            if isinstance(result, Exception):
+                # Not checkpointed, so the next run retries it
+                failed += 1
+                print(f"  {transcript_id}: failed ({result!r})")
+                continue
+            summary, latency = result
+            latencies.observe(latency)
+            out.write(json.dumps({
+                "id": transcript_id, "rubric": rubric, "summary": summary, "latency_seconds": round(latency, 3)
+            }, ensure_ascii=False) + "\n")
+            out.flush()
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "evaluated": latencies.count,
+        "failed": failed,
+        "skipped": len(done),
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": latencies.count / elapsed if elapsed else 0.0,
+        "p50_seconds": latencies.percentile(50),
+        "p95_seconds": latencies.percentile(95),
+    }
+    print(
+        f"Evaluated {report['evaluated']} ({failed} failed) in {elapsed:.1f}s: "
+        f"{report['throughput_per_second']:.2f}/s, p50 {report['p50_seconds']:.2f}s, p95 {report['p95_seconds']:.2f}s"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", help="JSONL file of transcripts")
+    parser.add_argument("output", help="JSONL file results are appended to (also the checkpoint)")
+    parser.add_argument("--instruction-file", help="evaluation instruction to use instead of the interview's final summary prompt")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    instruction = FINAL_SUMMARY_PROMPT
+    if args.instruction_file:
+        with open(args.instruction_file, encoding="utf-8") as f:
+            instruction = f.read().strip()
+    evaluate(args.source, args.output, instruction, args.concurrency)
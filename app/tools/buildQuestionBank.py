@@ -0,0 +1,70 @@
+"""
+Offline builder for the graded question bank.
+
+Generates beginner/intermediate/advanced questions for each technology with
+the configured LLM and writes `questions.jsonl` + `index.json` to
+QUESTION_BANK_DIR. Each technology is saved as soon as it is generated, so
+an interrupted run resumes with the technologies still missing. Existing
+entries are kept unless --refresh is given.
+
+Run from the `app/` directory:
+    python -m tools.buildQuestionBank Python React "Node.js" --count 5
+    python -m tools.buildQuestionBank --from-file techs.txt --concurrency 4
+"""
+import argparse
+
+from langchain_core.output_parsers import JsonOutputParser
+from config.settings import QUESTION_BANK_DIR, TOPICS, llm
+from prompts.interviewPrompt import make_question_bank_template
+from prompts.questionBank import LEVELS, QuestionBank, append_record, normalize_tech, write_bank
+
+
+def _clean(record: dict, tech: str) -> dict:
+    cleaned = {"tech": tech}
+    for level in LEVELS:
+        questions = [q.strip() for q in record.get(level, []) if isinstance(q, str) and q.strip()]
+        cleaned[level] = list(dict.fromkeys(questions))
+    return cleaned
+
+
+def build(techs: list[str], directory: str, count: int, concurrency: int, refresh: bool) -> None:
+    bank = QuestionBank(directory)
+    wanted = sorted({normalize_tech(t) for t in techs if t.strip()})
+    todo = [tech for tech in wanted if refresh or tech not in bank]
+
+    chain = make_question_bank_template() | llm | JsonOutputParser()
+    inputs = [{"tech": tech, "count": count} for tech in todo]
+    config = {"max_concurrency": concurrency, "metadata": {"priority": "evaluation"}}
+    saved = 0
+    for i, result in chain.batch_as_completed(inputs, config=config, return_exceptions=True):
+        tech = todo[i]
+        if isinstance(result, Exception):
+            print(f"  {tech}: failed ({result!r})")
+            continue
+        record = _clean(result, tech)
+        append_record(directory, record)
+        saved += 1
+        print(f"  {tech}: " + ", ".join(f"{len(record[level])} {level}" for level in LEVELS))
+
+    if refresh and saved:
+        # Drop the lines of replaced records
+        bank = QuestionBank(directory)
+        write_bank(directory, [bank.questions(tech) for tech in bank.index])
+    print(f"Wrote {saved} of {len(todo)} technologies to {directory}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("techs", nargs="*", help="technologies to generate (TOPICS are always included)")
+    parser.add_argument("--from-file", help="file with one technology per line")
+    parser.add_argument("--dir", default=QUESTION_BANK_DIR)
+    parser.add_argument("--count", type=int, default=5, help="questions per level")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--refresh", action="store_true", help="regenerate technologies already in the bank")
+    args = parser.parse_args()
+
+    techs = list(TOPICS) + args.techs
+    if args.from_file:
+        with open(args.from_file, encoding="utf-8") as f:
+            techs += [line.strip() for line in f]
+    build(techs, args.dir, args.count, args.concurrency, args.refresh)
@@ -4,6 +4,9 @@ from datetime import datetime
 # Predefined departments list
 DEPARTMENTS = ["Full Stack", "Frontend", "Backend", "UI/UX", "Data Scientist"]
 
+# Patterns are compiled once at import instead of on every call
+EMAIL_PATTERN = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+
 def validate_name(name: str) -> bool:
     """
     Validate Full Name:
@@ -19,8 +22,7 @@ def validate_email(email: str) -> bool:
     Validate Email Address:
     - Must match a standard email regex
     """
-    email_pattern = r"^[\w\.-]+@[\w\.-]+\.\w+$"
-    return bool(re.match(email_pattern, email))
+    return bool(EMAIL_PATTERN.match(email))
 
 def validate_phone(phone: str) -> bool:
     """
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Number of recent observations kept per histogram for percentiles
+WINDOW_SIZE = 1024
+
+# Upper bounds of the cumulative buckets exported for Prometheus
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNT_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+class Histogram:
+    """Running count/sum, cumulative buckets, plus a sliding window of recent values for percentiles."""
+
+    def __init__(self, window: int = WINDOW_SIZE, buckets: tuple = SECONDS_BUCKETS):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += value
+            self._recent.append(value)
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                self.bucket_counts[index] += 1
+
+    def percentile(self, q: float) -> float:
+        with self._lock:
+            values = sorted(self._recent)
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+_histograms: dict[str, Histogram] = {}
+_counters: dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def histogram(name: str, buckets: tuple | None = None) -> Histogram:
+    """Return the process-wide histogram registered under `name`; `buckets` only applies on first use."""
+    with _lock:
+        if name not in _histograms:
+            default = SECONDS_BUCKETS if name.endswith("_seconds") else COUNT_BUCKETS
+            _histograms[name] = Histogram(buckets=buckets or default)
+        return _histograms[name]
+
+
+def observe(name: str, value: float) -> None:
+    histogram(name).observe(value)
+
+
+def increment(name: str, amount: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def snapshot() -> dict[str, dict]:
+    with _lock:
+        names = list(_histograms)
+    return {name: histogram(name).snapshot() for name in names}
+
+
+def counters() -> dict[str, float]:
+    with _lock:
+        return dict(_counters)
+
+
+def render_prometheus() -> str:
+    """All histograms and counters in the Prometheus text exposition format."""
+    with _lock:
+        histograms = dict(_histograms)
+        totals = dict(_counters)
+    lines = []
+    for name, hist in sorted(histograms.items()):
+        with hist._lock:
+            bucket_counts, count, total = list(hist.bucket_counts), hist.count, hist.total
+        lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, bucket_count in zip(hist.buckets, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{name}_sum {total}")
+        lines.append(f"{name}_count {count}")
+    for name, value in sorted(totals.items()):
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass  # scrapes every few seconds would flood stderr
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve `render_prometheus()` on http://host:port/metrics from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
+
+
+def dump_metrics(path: str, extra: dict | None = None) -> None:
+    """Write histogram snapshots and counters as JSON, replacing `path` atomically."""
+    data = {"time": time.time(), "histograms": snapshot(), "counters": counters(), **(extra or {})}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def start_metrics_dump(path: str, interval: float, extra=None) -> threading.Thread:
+    """Call `dump_metrics` every `interval` seconds from a daemon thread; `extra()` adds more fields."""
+    def run() -> None:
+        while True:
+            time.sleep(interval)
+            dump_metrics(path, extra() if extra else None)
+
+    thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+    thread.start()
+    return thread
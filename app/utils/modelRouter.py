@@ -0,0 +1,228 @@
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from utils.metrics import increment, observe
+from utils.rateLimiter import DEFAULT_LANE, status_code
+from utils.resources import registry
+
+# Weight of the newest call in a backend's moving latency average
+LATENCY_SMOOTHING = 0.3
+
+
+def parse_backends(spec: str) -> dict[str, tuple[str, str]]:
+    """Parse "name=provider:model,..." into {name: (provider, model)}."""
+    backends = {}
+    for item in spec.split(","):
+        name, _, target = item.partition("=")
+        provider, _, model = target.partition(":")
+        if name.strip() and provider.strip():
+            backends[name.strip()] = (provider.strip(), model.strip())
+    return backends
+
+
+def parse_routes(spec: str) -> dict[str, list[str]]:
+    """Parse "lane=first|second,..." into {lane: [backend names in order of preference]}."""
+    routes = {}
+    for item in spec.split(","):
+        lane, _, names = item.partition("=")
+        order = [name.strip() for name in names.split("|") if name.strip()]
+        if lane.strip() and order:
+            routes[lane.strip()] = order
+    return routes
+
+
+class BackendHealth:
+    __slots__ = ("latency", "calls", "last_call", "failures", "open_until")
+
+    def __init__(self):
+        self.latency = 0.0
+        self.last_call = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.open_until = 0.0
+
+
+class HealthTracker:
+    """
+    Per-backend health for routing:
+    - `latency` is a moving average of time to first token (streams) or to the full reply
+    - `failure_threshold` consecutive errors take a backend out for `cooldown` seconds;
+      after that one call is let through again and a success restores it
+    - A backend averaging over `slow_seconds` is only used when no faster one is available,
+      until it has not been called for `cooldown` seconds and gets another chance
+    """
+
+    def __init__(self, slow_seconds: float, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.slow_seconds = slow_seconds
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._backends: dict[str, BackendHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> BackendHealth:
+        health = self._backends.get(name)
+        if health is None:
+            health = self._backends[name] = BackendHealth()
+        return health
+
+    def record_success(self, name: str, seconds: float) -> None:
+        with self._lock:
+            health = self._get(name)
+            health.latency = seconds if not health.calls else (
+                LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * health.latency
+            )
+            health.calls += 1
+            health.last_call = time.monotonic()
+            health.failures = 0
+            health.open_until = 0.0
+        observe(f"llm_backend_{name}_seconds", seconds)
+
+    def record_failure(self, name: str) -> None:
+        with self._lock:
+            health = self._get(name)
+            health.failures += 1
+            if health.failures >= self.failure_threshold:
+                health.open_until = time.monotonic() + self.cooldown
+        increment(f"llm_backend_{name}_errors_total")
+
+    def order(self, names: list[str]) -> list[str]:
+        """`names` reordered for the next call: healthy and fast first, then slow, then those cooling down."""
+        now = time.monotonic()
+        with self._lock:
+            health = {name: self._get(name) for name in names}
+        available = [name for name in names if health[name].open_until <= now]
+        fast = [
+            name for name in available
+            if health[name].latency <= self.slow_seconds or now - health[name].last_call > self.cooldown
+        ]
+        slow = [name for name in available if name not in fast]
+        # Even a backend that is cooling down is better than no reply at all
+        return fast + slow + [name for name in names if name not in available]
+
+    def snapshot(self) -> dict[str, dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "latency": round(health.latency, 3),
+                    "calls": health.calls,
+                    "failures": health.failures,
+                    "available": health.open_until <= now,
+                }
+                for name, health in self._backends.items()
+            }
+
+
+class ModelRouter(BaseChatModel):
+    """
+    Chat model that picks a backend per request, with the interface the chains already use:
+    - The request type is the rate-limit lane in `metadata["priority"]` (see utils.rateLimiter.PRIORITY_LANES)
+    - `routes[lane]` lists the backends to try in order of preference; `default` covers other lanes
+    - Backends are `registry` resources, so each model client is built on first use
+    - A failed call moves on to the next backend, unless a stream already produced tokens
+    - A 429 is not a backend failure: it goes back to `RateLimitedChatModel`, which waits out
+      Retry-After for every lane and retries, instead of spreading the overload to the next backend
+    """
+
+    backends: dict[str, str]
+    routes: dict[str, list[str]]
+    health: Any
+    default: str = DEFAULT_LANE
+
+    @property
+    def _llm_type(self) -> str:
+        return "model-router"
+
+    @staticmethod
+    def _lane(run_manager) -> str:
+        metadata = getattr(run_manager, "metadata", None) or {}
+        return metadata.get("priority", DEFAULT_LANE)
+
+    def _order(self, run_manager) -> list[str]:
+        names = self.routes.get(self._lane(run_manager)) or self.routes.get(self.default) or list(self.backends)
+        return self.health.order(names)
+
+    @staticmethod
+    def _rate_limited(exc: BaseException) -> bool:
+        return status_code(exc) == 429
+
+    def _failed(self, name: str, remaining: bool) -> None:
+        self.health.record_failure(name)
+        if remaining:
+            increment("llm_failovers_total")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        order = self._order(run_manager)
+        for i, name in enumerate(order):
+            start = time.perf_counter()
+            try:
+                result = registry.get(self.backends[name])._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                if self._rate_limited(exc):
+                    raise
+                self._failed(name, i < len(order) - 1)
+                if i == len(order) - 1:
+                    raise
+                continue
+            self.health.record_success(name, time.perf_counter() - start)
+            return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        order = self._order(run_manager)
+        for i, name in enumerate(order):
+            start = time.perf_counter()
+            try:
+                model = registry.get(self.backends[name])
+                result = await model._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                if self._rate_limited(exc):
+                    raise
+                self._failed(name, i < len(order) - 1)
+                if i == len(order) - 1:
+                    raise
+                continue
+            self.health.record_success(name, time.perf_counter() - start)
+            return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        order = self._order(run_manager)
+        for i, name in enumerate(order):
+            start = time.perf_counter()
+            started = False
+            try:
+                for chunk in registry.get(self.backends[name])._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    if not started:
+                        started = True
+                        self.health.record_success(name, time.perf_counter() - start)
+                    yield chunk
+                return
+            except Exception as exc:
+                if self._rate_limited(exc):
+                    raise
+                # Tokens already shown to the candidate cannot be taken back
+                self._failed(name, not started and i < len(order) - 1)
+                if started or i == len(order) - 1:
+                    raise
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        order = self._order(run_manager)
+        for i, name in enumerate(order):
+            start = time.perf_counter()
+            started = False
+            try:
+                model = registry.get(self.backends[name])
+                async for chunk in model._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    if not started:
+                        started = True
+                        self.health.record_success(name, time.perf_counter() - start)
+                    yield chunk
+                return
+            except Exception as exc:
+                if self._rate_limited(exc):
+                    raise
+                self._failed(name, not started and i < len(order) - 1)
+                if started or i == len(order) - 1:
+                    raise
@@ -0,0 +1,162 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Pattern
+
+from utils.detailsValidation import (
+    EMAIL_PATTERN, validate_email, validate_experience, validate_name, validate_phone,
+    validate_programming_languages
+)
+
+# Separators between several details given in one message
+_SEGMENT_SPLIT = re.compile(r"\s*[,;\n]\s*")
+_PHONE_PATTERN = re.compile(r"^\+?[\d\s\-()]{10,20}$")
+_PHONE_NOISE = re.compile(r"[\s\-()+]")
+_EXPERIENCE_PATTERN = re.compile(r"^(\d{1,2}(?:\.\d+)?)\s*(?:\+\s*)?(?:years?|yrs?)?(?:\s+of\s+experience)?$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One profile field:
+    - `parse` turns raw text into a value (raising ValueError on bad input)
+    - `normalize` cleans the parsed value before validation
+    - `validate` is the check from utils.detailsValidation
+    - `detect` recognizes the field inside a multi-detail message, if it has a distinctive shape
+    - `greedy` fields (comma-separated lists) take every remaining unrecognized segment
+    """
+
+    name: str
+    error: str
+    validate: Callable[[Any], bool] = bool
+    parse: Callable[[str], Any] = str.strip
+    normalize: Callable[[Any], Any] = lambda value: value
+    detect: Pattern | None = None
+    greedy: bool = False
+
+
+def _parse_experience(text: str) -> float:
+    match = _EXPERIENCE_PATTERN.match(text.strip())
+    return float(match.group(1) if match else text)
+
+
+def _parse_tech_stack(text: str) -> list[str]:
+    return [tech.strip() for tech in text.split(",") if tech.strip()]
+
+
+PROFILE_SCHEMA = [
+    FieldSpec(
+        "Full Name",
+        "Invalid Full Name. Please enter a valid name using alphabetic characters only "
+        "and ensure it is at least 2 characters long.",
+        validate_name,
+        normalize=lambda name: " ".join(name.split()),
+    ),
+    FieldSpec(
+        "Email Address",
+        "Invalid Email Address. Please enter a valid email address.",
+        validate_email,
+        normalize=str.lower,
+        detect=EMAIL_PATTERN,
+    ),
+    FieldSpec(
+        "Phone Number",
+        "Invalid Phone Number. Please enter a valid phone number containing only digits "
+        "and between 10 and 15 characters.",
+        validate_phone,
+        normalize=lambda phone: _PHONE_NOISE.sub("", phone),
+        detect=_PHONE_PATTERN,
+    ),
+    FieldSpec(
+        "Years of Experience",
+        "Invalid Years of Experience. Please enter a valid, non-negative number.",
+        validate_experience,
+        parse=_parse_experience,
+        detect=_EXPERIENCE_PATTERN,
+    ),
+    FieldSpec("Desired Position(s)", "Please enter the position(s) you are applying for."),
+    FieldSpec("Current Location", "Please enter your current location."),
+    FieldSpec(
+        "Tech Stack",
+        "Invalid Tech Stack. Please enter one or more valid programming languages or technologies.",
+        validate_programming_languages,
+        parse=_parse_tech_stack,
+        greedy=True,
+    ),
+]
+
+
+class ProfileEngine:
+    """Fills a profile from free-text messages according to a list of `FieldSpec`s."""
+
+    def __init__(self, schema: list[FieldSpec] = PROFILE_SCHEMA):
+        self.schema = schema
+
+    @property
+    def field_names(self) -> list[str]:
+        return [spec.name for spec in self.schema]
+
+    def next_field(self, profile: dict) -> str | None:
+        """Return the first field still missing from `profile`, or None when it is complete."""
+        return next((spec.name for spec in self.schema if profile.get(spec.name) is None), None)
+
+    def _assign(self, pending: list[FieldSpec], text: str) -> dict[str, str]:
+        """Map the segments of one message to pending fields."""
+        segments = [s for s in _SEGMENT_SPLIT.split(text.strip()) if s]
+        detected = [spec for spec in pending if spec.detect and any(spec.detect.match(s) for s in segments)]
+        # Nothing distinctive (e.g. "Senior Engineer, Backend"): the whole message answers the current field
+        if not detected:
+            return {pending[0].name: text.strip()}
+        # A single distinctive detail, such as an email typed at the name prompt
+        if len(segments) == 1:
+            return {detected[0].name: segments[0]}
+
+        # First pass: segments with a distinctive shape go to their own field
+        assigned: dict[str, str] = {}
+        leftovers = []
+        for segment in segments:
+            spec = next((s for s in pending if s.detect and s.name not in assigned and s.detect.match(segment)), None)
+            if spec is None:
+                leftovers.append(segment)
+            else:
+                assigned[spec.name] = segment
+
+        # Second pass: everything else fills the current field, then free-text fields in the order they are asked
+        remaining = iter(
+            spec for i, spec in enumerate(pending)
+            if spec.name not in assigned and (i == 0 or spec.detect is None)
+        )
+        for i, segment in enumerate(leftovers):
+            spec = next(remaining, None)
+            if spec is None:
+                break
+            if spec.greedy:
+                assigned[spec.name] = ", ".join(leftovers[i:])
+                break
+            assigned[spec.name] = segment
+        return assigned
+
+    def consume(self, profile: dict, text: str) -> tuple[dict, list[tuple[str, str]]]:
+        """
+        Parse, normalize and validate every detail found in `text` in one pass.
+        Returns (accepted field values, [(field, error message), ...]); `profile` is not modified.
+        """
+        pending = [spec for spec in self.schema if profile.get(spec.name) is None]
+        if not pending or not text.strip():
+            return {}, []
+        specs = {spec.name: spec for spec in pending}
+        accepted, errors = {}, []
+        for name, raw in self._assign(pending, text).items():
+            spec = specs[name]
+            try:
+                value = spec.normalize(spec.parse(raw))
+                valid = spec.validate(value)
+            except (TypeError, ValueError):
+                valid = False
+            if valid:
+                accepted[name] = value
+            else:
+                errors.append((name, spec.error))
+        return accepted, errors
+
+
+profile_engine = ProfileEngine()
@@ -0,0 +1,263 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from utils.metrics import observe
+from utils.tokenCounter import count_message_tokens
+
+# Scheduling lanes, most urgent first; a request picks its lane via config metadata {"priority": ...}
+# ("scoring" runs beside a follow-up the candidate is reading, "prefetch" is speculative work nobody waits for yet)
+PRIORITY_LANES = {"summary": 0, "evaluation": 1, "topic_switch": 2, "followup": 3, "scoring": 4, "prefetch": 5}
+DEFAULT_LANE = "followup"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# How often a queued request re-checks whether it may proceed
+_POLL_SECONDS = 0.05
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute / 60` units per second."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` units are available (requests larger than the bucket wait for a full one)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        # May go negative when actual usage exceeds the estimate; later requests pay it back
+        self.level -= amount
+
+
+class RateLimitScheduler:
+    """
+    Client-side admission control for one provider account:
+    - Token buckets for requests/min and tokens/min
+    - Waiting requests are served strictly by lane, then arrival order
+    - A Retry-After from the provider pauses every lane until it expires
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self._waiting: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _enqueue(self, lane: str) -> tuple[int, int]:
+        ticket = (PRIORITY_LANES.get(lane, PRIORITY_LANES[DEFAULT_LANE]), next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _try_admit(self, ticket: tuple[int, int], tokens: int) -> float:
+        """Admit `ticket` and return 0, or return how long to wait before trying again."""
+        with self._lock:
+            if self._waiting[0] != ticket:
+                return _POLL_SECONDS
+            now = time.monotonic()
+            wait = max(self.paused_until - now, self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+            if wait > 0:
+                return min(wait, _POLL_SECONDS * 10)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            heapq.heappop(self._waiting)
+            return 0.0
+
+    def _cancel(self, ticket: tuple[int, int]) -> None:
+        with self._lock:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+
+    def acquire(self, tokens: int, lane: str = DEFAULT_LANE) -> None:
+        start = time.perf_counter()
+        ticket = self._enqueue(lane)
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                time.sleep(wait)
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        observe(f"ratelimit_{lane}_wait_seconds", time.perf_counter() - start)
+
+    async def aacquire(self, tokens: int, lane: str = DEFAULT_LANE) -> None:
+        start = time.perf_counter()
+        ticket = self._enqueue(lane)
+        try:
+            while (wait := self._try_admit(ticket, tokens)) > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        observe(f"ratelimit_{lane}_wait_seconds", time.perf_counter() - start)
+
+    def reconcile(self, estimated: int, actual: int) -> None:
+        """Charge the difference between the estimated and reported token usage."""
+        with self._lock:
+            self.tokens.take(actual - estimated)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def status_code(exc: BaseException):
+    """The HTTP status of a provider error (`status_code` or `response.status_code`), or None."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status
+
+
+def retryable(exc: BaseException) -> bool:
+    """A rate limit, a transient server error or a connection failure: worth trying again later."""
+    transient = isinstance(exc, (ConnectionError, TimeoutError)) or type(exc).__name__ in (
+        "APIConnectionError", "APITimeoutError"
+    )
+    return transient or status_code(exc) in RETRYABLE_STATUS
+
+
+def _retry_after(exc: BaseException):
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return float(headers[header]) * scale
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Chat model wrapper that schedules every call through a `RateLimitScheduler`:
+    - Prompt tokens are estimated from the cached per-message counts
+    - 429s and transient errors are retried with jittered exponential backoff,
+      honouring Retry-After when the provider sends it
+    """
+
+    model: BaseChatModel
+    scheduler: Any
+    max_retries: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    completion_tokens: int = 256
+
+    @property
+    def _llm_type(self) -> str:
+        return f"rate-limited-{self.model._llm_type}"
+
+    def _estimate(self, messages: list[BaseMessage]) -> int:
+        return count_message_tokens(messages) + self.completion_tokens
+
+    @staticmethod
+    def _lane(run_manager) -> str:
+        metadata = getattr(run_manager, "metadata", None) or {}
+        return metadata.get("priority", DEFAULT_LANE)
+
+    def _backoff(self, exc: BaseException, attempt: int):
+        """Return the delay before the next attempt, or None if `exc` should not be retried."""
+        if attempt >= self.max_retries or not retryable(exc):
+            return None
+        observe("llm_retries", attempt + 1)
+        retry_after = _retry_after(exc)
+        if retry_after is not None:
+            if status_code(exc) == 429:
+                self.scheduler.pause(retry_after)
+            return retry_after
+        # Full jitter keeps retries from many sessions from arriving in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _record_usage(self, estimated: int, message) -> None:
+        usage = getattr(message, "usage_metadata", None)
+        if usage:
+            self.scheduler.reconcile(estimated, usage.get("total_tokens", estimated))
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        estimated = self._estimate(messages)
+        lane = self._lane(run_manager)
+        for attempt in itertools.count():
+            self.scheduler.acquire(estimated, lane)
+            try:
+                result = self.model._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                delay = self._backoff(exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._record_usage(estimated, result.generations[0].message)
+            return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        estimated = self._estimate(messages)
+        lane = self._lane(run_manager)
+        for attempt in itertools.count():
+            await self.scheduler.aacquire(estimated, lane)
+            try:
+                result = await self.model._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                delay = self._backoff(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._record_usage(estimated, result.generations[0].message)
+            return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        estimated = self._estimate(messages)
+        lane = self._lane(run_manager)
+        for attempt in itertools.count():
+            self.scheduler.acquire(estimated, lane)
+            started = False
+            try:
+                for chunk in self.model._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    self._record_usage(estimated, chunk.message)
+                    yield chunk
+                return
+            except Exception as exc:
+                # Tokens already shown to the candidate cannot be taken back
+                delay = None if started else self._backoff(exc, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        estimated = self._estimate(messages)
+        lane = self._lane(run_manager)
+        for attempt in itertools.count():
+            await self.scheduler.aacquire(estimated, lane)
+            started = False
+            try:
+                async for chunk in self.model._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    started = True
+                    self._record_usage(estimated, chunk.message)
+                    yield chunk
+                return
+            except Exception as exc:
+                delay = None if started else self._backoff(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
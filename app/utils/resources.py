@@ -0,0 +1,59 @@
+import threading
+from typing import Any, Callable
+
+
+class ResourceRegistry:
+    """
+    Process-wide objects (model clients, HTTP pools, tokenizers) built on first use:
+    - `register(name, factory, close)` only records how to build the resource
+    - `get(name)` builds it once, under a lock, and returns the same object afterwards
+    - `warm(names)` builds resources on a background thread so the first request does not pay for it
+    Modules are imported once per process, so Streamlit reruns and server workers share one instance.
+    """
+
+    def __init__(self):
+        self._factories: dict[str, tuple[Callable[[], Any], Callable[[Any], None] | None]] = {}
+        self._values: dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any] | None = None, close: Callable[[Any], None] | None = None):
+        """Register `factory` under `name`; usable as a decorator when `factory` is omitted."""
+        def decorator(fn: Callable[[], Any]) -> Callable[[], Any]:
+            with self._lock:
+                self._factories[name] = (fn, close)
+            return fn
+
+        return decorator if factory is None else decorator(factory)
+
+    def get(self, name: str) -> Any:
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._values:
+                factory, _ = self._factories[name]
+                self._values[name] = factory()
+            return self._values[name]
+
+    def warm(self, names) -> threading.Thread:
+        def run() -> None:
+            for name in names:
+                self.get(name)
+
+        thread = threading.Thread(target=run, name="resource-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        """Close every built resource that registered a `close` callback."""
+        with self._lock:
+            values, self._values = self._values, {}
+            for name, value in values.items():
+                _, close = self._factories.get(name, (None, None))
+                if close is not None:
+                    close(value)
+
+
+registry = ResourceRegistry()
+
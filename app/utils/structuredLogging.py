@@ -0,0 +1,144 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config.settings import (
+    LOG_BACKUP_COUNT, LOG_CONSOLE, LOG_LEVEL, LOG_MAX_BYTES, LOG_MAX_FIELD_CHARS, LOG_PATH, LOG_SAMPLE_RATES
+)
+
+# Parent logger of the app's modules (e.g. "talentscout.ui"); libraries keep their own handlers
+APP_LOGGER = "talentscout"
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def parse_sample_rates(spec: str) -> dict[str, float]:
+    """Parse "event=rate,..." into {event: rate}."""
+    rates = {}
+    for item in spec.split(","):
+        event, _, rate = item.partition("=")
+        if event.strip() and rate.strip():
+            rates[event.strip()] = float(rate)
+    return rates
+
+
+def _truncate(value, max_chars: int):
+    if isinstance(value, str) and len(value) > max_chars:
+        return f"{value[:max_chars]}… [{len(value) - max_chars} more chars]"
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, event, message and any `extra` fields, truncated."""
+
+    def __init__(self, max_chars: int = LOG_MAX_FIELD_CHARS):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _truncate(record.getMessage(), self.max_chars),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                data[key] = _truncate(value, self.max_chars)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records tagged with `extra={"event": ...}`:
+    - `rates` maps an event name to the share of its records kept (0..1)
+    - Untagged records, unknown events and warnings or worse are always kept
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(getattr(record, "event", None))
+        if rate is None or record.levelno >= logging.WARNING:
+            return True
+        return random.random() < rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Puts records on the queue unformatted, so message formatting and JSON
+    encoding happen on the listener thread instead of the request thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks hold frames; render them now so the record can be released
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listeners: dict[str, tuple[QueueListener, QueueHandler]] = {}
+_lock = threading.Lock()
+
+
+def setup_logging(name: str = APP_LOGGER, path: str = LOG_PATH, level: str = LOG_LEVEL,
+                  console: bool = LOG_CONSOLE, max_bytes: int = LOG_MAX_BYTES,
+                  backup_count: int = LOG_BACKUP_COUNT, max_chars: int = LOG_MAX_FIELD_CHARS,
+                  sample_rates: str = LOG_SAMPLE_RATES) -> logging.Logger:
+    """
+    Install non-blocking JSON logging on logger `name`, once per process:
+    - The caller only samples the record and puts it on a queue
+    - A background listener formats it and writes to a size-rotated file (and the console)
+    Later calls (e.g. Streamlit reruns) return the already configured logger.
+    """
+    logger = logging.getLogger(name)
+    with _lock:
+        if name in _listeners:
+            return logger
+        formatter = JsonFormatter(max_chars)
+        file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        handlers = [file_handler]
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(records)
+        queue_handler.addFilter(SamplingFilter(parse_sample_rates(sample_rates)))
+        logger.addHandler(queue_handler)
+        logger.setLevel(level)
+        logger.propagate = False
+
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners[name] = (listener, queue_handler)
+        return logger
+
+
+def stop_logging(name: str = APP_LOGGER) -> None:
+    """Write out every queued record of logger `name` and stop its background writer."""
+    with _lock:
+        installed = _listeners.pop(name, None)
+    if installed is not None:
+        listener, queue_handler = installed
+        logging.getLogger(name).removeHandler(queue_handler)
+        listener.stop()
+
+
+@atexit.register
+def _stop_all() -> None:
+    # Drain what is still queued when the process exits
+    for name in list(_listeners):
+        stop_logging(name)
@@ -0,0 +1,68 @@
+import logging
+import re
+from typing import Iterable
+
+from langchain_core.messages import BaseMessage
+from utils.resources import registry
+
+logger = logging.getLogger("talentscout.tokens")
+
+# Key under which a message's token count is cached in `additional_kwargs`
+TOKEN_COUNT_KEY = "token_count"
+
+# Fixed per-message overhead (role markers, separators) added by chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@registry.register("tokenizer")
+def _load_encoding():
+    # Loaded on first count: reading (or downloading) the vocab would otherwise slow every cold start
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:  # tiktoken missing or its vocab cannot be downloaded
+        logger.warning("tiktoken unavailable (%r); token counts are estimated from words and punctuation", exc,
+                       extra={"event": "tokenizer_fallback"})
+        return None
+
+
+# Fallback tokenizer: words and individual punctuation marks
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def count_text_tokens(text: str) -> int:
+    """Return the number of tokens in a string using the local tokenizer."""
+    if not text:
+        return 0
+    encoding = registry.get("tokenizer")
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def _message_text(message: BaseMessage) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    # Multi-part content: only text blocks contribute tokens
+    return " ".join(
+        part if isinstance(part, str) else str(part.get("text", ""))
+        for part in message.content
+    )
+
+
+def message_tokens(message: BaseMessage) -> int:
+    """
+    Return the token count of a message:
+    - Counted once and cached on the message
+    - Later calls read the cached value without re-tokenizing
+    """
+    cached = message.additional_kwargs.get(TOKEN_COUNT_KEY)
+    if cached is None:
+        cached = count_text_tokens(_message_text(message)) + MESSAGE_OVERHEAD_TOKENS
+        message.additional_kwargs[TOKEN_COUNT_KEY] = cached
+    return cached
+
+
+def count_message_tokens(messages: Iterable[BaseMessage]) -> int:
+    """Return the total token count of messages, usable as a `token_counter`."""
+    return sum(message_tokens(message) for message in messages)
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from config.settings import MAX_SESSIONS
+from utils.metrics import increment, observe
+from utils.tokenCounter import count_message_tokens, count_text_tokens
+
+# Runs worth timing on their own, by run name -> stage label
+STAGES = {
+    "load_history": "history_load",
+    "trimmer": "trim",
+    "ChatPromptTemplate": "prompt",
+}
+
+
+class TurnTracer(BaseCallbackHandler):
+    """
+    LangChain callback handler that turns chain runs into metrics:
+    - `stage_<stage>_seconds` for history loading, trimming, prompt formatting and the LLM call
+    - `llm_time_to_first_token_seconds` per model call and `chain_seconds` per top-level call
+    - prompt/completion token counts (provider usage when reported, else counted locally)
+    - `trimmed_messages`, the history messages the trimmer dropped
+    Per-session totals (turns, tokens, trimmed messages, cache hits) are kept for the
+    `max_sessions` most recent sessions. The session comes from `metadata["session_id"]`.
+    """
+
+    # Called on the thread that runs the chain, so timings are not skewed by a thread pool hop
+    run_inline = True
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        # run id -> (session id, start time, stage, input size: history messages or prompt tokens)
+        self._runs: dict[UUID, tuple[str | None, float, str, int]] = {}
+        self._first_token: set[UUID] = set()
+        self._sessions: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _totals(self, session_id: str | None) -> dict | None:
+        """Return the running totals of `session_id`, creating them if needed (caller holds the lock)."""
+        if session_id is None:
+            return None
+        totals = self._sessions.pop(session_id, None) or {
+            "turns": 0, "prompt_tokens": 0, "completion_tokens": 0, "trimmed_messages": 0, "cache_hits": 0
+        }
+        self._sessions[session_id] = totals
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return totals
+
+    def _add(self, session_id: str | None, key: str, amount: int) -> None:
+        with self._lock:
+            totals = self._totals(session_id)
+            if totals is not None:
+                totals[key] += amount
+
+    def _start(self, run_id: UUID, stage: str, metadata: dict | None, size: int = 0) -> None:
+        session_id = (metadata or {}).get("session_id")
+        with self._lock:
+            self._runs[run_id] = (session_id, time.perf_counter(), stage, size)
+
+    def _end(self, run_id: UUID):
+        with self._lock:
+            return self._runs.pop(run_id, None)
+
+    # --- chains ---
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name")
+        if parent_run_id is None:
+            self._start(run_id, "chain", metadata)
+        elif name in STAGES:
+            self._start(run_id, STAGES[name], metadata, len(inputs) if isinstance(inputs, list) else 0)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs) -> None:
+        run = self._end(run_id)
+        if run is None:
+            return
+        session_id, start, stage, size = run
+        elapsed = time.perf_counter() - start
+        if stage == "chain":
+            observe("chain_seconds", elapsed)
+            self._add(session_id, "turns", 1)
+        else:
+            observe(f"stage_{stage}_seconds", elapsed)
+            # Streamed runs only know their input at the end
+            inputs = kwargs.get("inputs")
+            if stage == "trim" and isinstance(outputs, list):
+                trimmed = (len(inputs) if isinstance(inputs, list) else size) - len(outputs)
+                observe("trimmed_messages", trimmed)
+                self._add(session_id, "trimmed_messages", trimmed)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        if self._end(run_id) is not None:
+            increment("chain_errors_total")
+
+    # --- model ---
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        prompt_tokens = count_message_tokens(messages[0]) if messages else 0
+        self._start(run_id, "llm", metadata, prompt_tokens)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs) -> None:
+        if run_id in self._first_token or not token:
+            return
+        self._first_token.add(run_id)
+        with self._lock:
+            run = self._runs.get(run_id)
+        if run is not None:
+            observe("llm_time_to_first_token_seconds", time.perf_counter() - run[1])
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        run = self._end(run_id)
+        self._first_token.discard(run_id)
+        if run is None:
+            return
+        session_id, start, _, prompt_tokens = run
+        observe("stage_llm_seconds", time.perf_counter() - start)
+
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        prompt_tokens = usage.get("input_tokens") or prompt_tokens
+        completion_tokens = usage.get("output_tokens") or (count_text_tokens(generation.text) if generation else 0)
+        observe("prompt_tokens", prompt_tokens)
+        observe("completion_tokens", completion_tokens)
+        increment("prompt_tokens_total", prompt_tokens)
+        increment("completion_tokens_total", completion_tokens)
+        with self._lock:
+            totals = self._totals(session_id)
+            if totals is not None:
+                totals["prompt_tokens"] += prompt_tokens
+                totals["completion_tokens"] += completion_tokens
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id)
+        self._first_token.discard(run_id)
+        increment("llm_errors_total")
+
+    # --- outside the chain ---
+
+    def record_cache(self, session_id: str | None, hit: bool) -> None:
+        increment("response_cache_hits_total" if hit else "response_cache_misses_total")
+        if hit:
+            self._add(session_id, "cache_hits", 1)
+
+    def session(self, session_id: str) -> dict:
+        with self._lock:
+            return dict(self._sessions.get(session_id, {}))
+
+    def sessions(self) -> dict[str, dict]:
+        with self._lock:
+            return {session_id: dict(totals) for session_id, totals in self._sessions.items()}
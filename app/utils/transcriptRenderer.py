@@ -0,0 +1,42 @@
+import html
+
+from memory.transcript import Transcript
+
+# CSS wrapper/bubble classes per role, matching the styles injected by ui.py
+_ROLE_CLASSES = {
+    "assistant": ("bot-wrapper", "bot-message"),
+    "user": ("user-wrapper", "user-message"),
+}
+
+
+def message_html(role: str, content: str) -> str:
+    """Return the chat bubble HTML for one message, with its content escaped."""
+    wrapper, bubble = _ROLE_CLASSES.get(role, _ROLE_CLASSES["assistant"])
+    text = html.escape(str(content)).replace("\n", "<br>")
+    return f'<div class="{wrapper}"><div class="{bubble}">{text}</div></div>'
+
+
+def render_transcript(messages: Transcript, cache: dict, window: int, show_all: bool = False):
+    """
+    Build the transcript HTML for one rerun:
+    - `cache` maps message index -> (message, HTML) for the visible window only; messages that
+      scroll out of it are dropped, so a long interview never holds a second copy of every text
+    - Earlier messages shown with `show_all` are rendered on each rerun instead of being cached
+    - Returns (html for the visible messages, number of earlier messages hidden)
+    Everything visible is joined into one block, so a rerun emits a single element.
+    """
+    start = max(0, len(messages) - window)
+    for index in [i for i in cache if i < start]:
+        del cache[index]
+    visible = []
+    for index in range(start, len(messages)):
+        message = messages[index]
+        cached = cache.get(index)
+        # A refused request drops messages, so an index can come back holding another message
+        if cached is None or cached[0] is not message:
+            cached = cache[index] = (message, message_html(message.role.value, message.content))
+        visible.append(cached[1])
+    for index in [i for i in cache if i >= len(messages)]:
+        del cache[index]
+    earlier = [message_html(m.role.value, m.content) for m in messages[:start]] if show_all else []
+    return "".join(earlier + visible), 0 if show_all else start
@@ -1,11 +1,38 @@
-from langchain_core.messages import trim_messages
-from config.settings import llm
-
-trimmer = trim_messages(
-    max_tokens=4500,
-    strategy="last",
-    token_counter=llm,
-    include_system=True,
-    allow_partial=False,
-    start_on="human"
-)
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, convert_to_messages
+from langchain_core.runnables import RunnableLambda
+from config.settings import MAX_HISTORY_TOKENS
+from utils.tokenCounter import message_tokens
+
+
+def trim_history(messages, max_tokens: int = MAX_HISTORY_TOKENS) -> list[BaseMessage]:
+    """
+    Keep the most recent messages that fit in `max_tokens`:
+    - Leading system messages are always kept
+    - A history that fits is kept whole, including a leading assistant question (opening and
+      posted questions are stored without a human turn before them)
+    - When older turns are cut, the window opens on a human message, but the newest message
+      (the question the candidate is answering) is never dropped
+    - Token counts are read from the per-message cache, nothing is re-tokenized
+    """
+    messages = convert_to_messages(messages)
+
+    head = 0
+    while head < len(messages) and isinstance(messages[head], SystemMessage):
+        head += 1
+    budget = max_tokens - sum(message_tokens(m) for m in messages[:head])
+
+    # Walk backwards from the newest message until the budget is spent
+    cut = len(messages)
+    while cut > head and message_tokens(messages[cut - 1]) <= budget:
+        cut -= 1
+        budget -= message_tokens(messages[cut])
+
+    # Only a window the budget cut can open mid-exchange; drop its leading assistant/system turns
+    if cut > head:
+        while cut < len(messages) - 1 and not isinstance(messages[cut], HumanMessage):
+            cut += 1
+
+    return messages[:head] + messages[cut:]
+
+
+trimmer = RunnableLambda(trim_history, name="trimmer")